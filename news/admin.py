@@ -1,3 +1,15 @@
 from django.contrib import admin
+from news.models import SlowQuery
 
-# Register your models here.
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ['captured_at', 'duration', 'view', 'database', 'sql']
+    list_filter = ['view', 'database']
+    search_fields = ['sql', 'view']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
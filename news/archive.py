@@ -0,0 +1,81 @@
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from news.models import ArchivedNews, News
+from news.suggest import index as suggestions
+
+ARCHIVE_FIELDS = [
+    'id',
+    'title',
+    'content',
+    'content_html',
+    'content_version',
+    'author_id',
+    'created_at',
+    'image',
+    'image_width',
+    'image_height',
+    'image_bytes',
+    'image_color',
+]
+
+# Set while a batch is deleted, so the change feed records `archive`
+# instead of a `delete` tombstone.
+archiving = ContextVar('archiving', default=False)
+
+
+def archive_batch(cutoff, batch_size):
+    """Move up to `batch_size` News created before `cutoff` to the archive
+    in one transaction; returns how many moved."""
+    with transaction.atomic():
+        batch = list(
+            News.objects.filter(created_at__lt=cutoff)
+            .order_by('created_at', 'id')
+            .prefetch_related('categories')[:batch_size]
+        )
+        if not batch:
+            return 0
+        ArchivedNews.objects.bulk_create(
+            ArchivedNews(**{
+                field: getattr(news, field) for field in ARCHIVE_FIELDS
+            })
+            for news in batch
+        )
+        Membership = ArchivedNews.categories.through
+        Membership.objects.bulk_create(
+            Membership(archivednews_id=news.id, category_id=category.id)
+            for news in batch
+            for category in news.categories.all()
+        )
+        # A regular delete, so the home feed, caches and the derived tables
+        # drop the rows as for any other removal.
+        token = archiving.set(True)
+        try:
+            News.objects.filter(id__in=[news.id for news in batch]).delete()
+        finally:
+            archiving.reset(token)
+    # Deleting took the titles out of the suggestions; they stay findable.
+    for news in batch:
+        suggestions.put(news.id, news.title)
+    return len(batch)
+
+
+def archive_old_news(days=None, batch_size=None):
+    days = settings.ARCHIVE_AFTER_DAYS if days is None else days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    cutoff = timezone.localdate() - timedelta(days=days)
+    moved = 0
+    while count := archive_batch(cutoff, batch_size):
+        moved += count
+    return moved
+
+
+def find_news(news_id):
+    """The News or, failing that, the archived article with `news_id`."""
+    news = News.objects.filter(id=news_id).first()
+    if news is None:
+        news = ArchivedNews.objects.get(id=news_id)
+    return news
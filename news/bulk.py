@@ -0,0 +1,331 @@
+import csv
+import json
+import uuid
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from news.caching import bump_cache_version
+from news.duplicates import minhash, save_signatures, stored_index
+from news.feed import refresh_feed
+from news.markup import render_into
+from news.models import Category, Change, News, User
+from news.tasks import queue_related_refresh
+from news.upsert import upsert
+
+FIELDS = ['id', 'title', 'content', 'author', 'categories', 'created_at',
+          'image']
+UPSERT_FIELDS = [
+    'title',
+    'content',
+    'content_html',
+    'content_version',
+    'author',
+    'created_at',
+    'image',
+]
+
+Item = namedtuple('Item', 'line row news category_ids signature')
+# A JSONL line that does not parse; rejected like any invalid row.
+InvalidRow = namedtuple('InvalidRow', 'text error')
+
+
+def read_rows(file, fmt):
+    if fmt == 'csv':
+        for row in csv.DictReader(file):
+            categories = row.get('categories') or ''
+            row['categories'] = [
+                name.strip() for name in categories.split(';') if name.strip()
+            ]
+            yield row
+        return
+    for line in file:
+        if line.strip():
+            yield parse_line(line)
+
+
+def parse_line(line):
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        return InvalidRow(line.rstrip('\n'), f'JSON inválido: {exc}')
+
+
+def shape_errors(row):
+    if isinstance(row, InvalidRow):
+        return [row.error]
+    if not isinstance(row, dict):
+        return ['A linha não é um objeto JSON.']
+    return []
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Resolver:
+    """Name -> id maps loaded once per import instead of a query per row."""
+
+    def __init__(self):
+        self.authors = dict(User.objects.values_list('name', 'id'))
+        self.author_ids = set(self.authors.values())
+        self.categories = dict(Category.objects.values_list('name', 'id'))
+
+    def author_id(self, value):
+        if isinstance(value, int) or str(value).isdigit():
+            value = int(value)
+            return value if value in self.author_ids else None
+        return self.authors.get(value)
+
+    def category_ids(self, values):
+        if isinstance(values, str):
+            values = [values]
+        return [self.categories.get(name) for name in values]
+
+
+def parse_id(value):
+    if value in (None, ''):
+        return None, []
+    if isinstance(value, int) or str(value).isdigit():
+        return int(value), []
+    return None, [f'id inválido: {value}']
+
+
+def clean_errors(news):
+    try:
+        news.full_clean(exclude=['author'], validate_unique=False)
+    except ValidationError as exc:
+        return [
+            f'{field}: {" ".join(messages)}'
+            for field, messages in exc.message_dict.items()
+        ]
+    return []
+
+
+def build_news(row, resolver):
+    news_id, errors = parse_id(row.get('id'))
+    author_id = resolver.author_id(row.get('author'))
+    if author_id is None:
+        errors.append(f'Autor desconhecido: {row.get("author")}')
+    category_ids = resolver.category_ids(row.get('categories') or [])
+    if None in category_ids:
+        errors.append(f'Categoria desconhecida: {row.get("categories")}')
+
+    news = News(
+        id=news_id,
+        title=row.get('title') or '',
+        content=row.get('content') or '',
+        author_id=author_id,
+        created_at=row.get('created_at'),
+        image=row.get('image') or None,
+    )
+    errors.extend(clean_errors(news))
+    # bulk_create skips pre_save, where the HTML is normally rendered.
+    render_into(news)
+    return news, category_ids, errors
+
+
+def insert_news(news_list):
+    with_id = [news for news in news_list if news.id is not None]
+    without_id = [news for news in news_list if news.id is None]
+    if with_id:
+        upsert(
+            News, with_id, update_fields=UPSERT_FIELDS, unique_fields=['id']
+        )
+    if without_id:
+        insert_without_ids(without_id)
+
+
+def insert_without_ids(news_list):
+    if connection.features.can_return_rows_from_bulk_insert:
+        News.objects.bulk_create(news_list)
+        return
+    # MySQL does not report the ids of a multi-row insert, so the batch is
+    # tagged and read back. Auto-increment ids ascend in insert order, so
+    # sorting by id lines them up with the list.
+    marker = uuid.uuid4()
+    for news in news_list:
+        news.import_batch = marker
+    News.objects.bulk_create(news_list)
+    ids = News.objects.filter(import_batch=marker).order_by('id')
+    for news, news_id in zip(news_list, ids.values_list('id', flat=True)):
+        news.id = news_id
+
+
+def upsert_batch(items):
+    """Insert or update a batch in one transaction; returns how many rows
+    already existed."""
+    news_list = [item.news for item in items]
+    ids = [news.id for news in news_list if news.id is not None]
+    through = News.categories.through
+    with transaction.atomic():
+        existing = set(
+            News.objects.filter(id__in=ids).values_list('id', flat=True)
+        )
+        insert_news(news_list)
+        through.objects.filter(news_id__in=existing).delete()
+        through.objects.bulk_create(
+            through(news_id=item.news.id, category_id=category_id)
+            for item in items
+            for category_id in item.category_ids
+        )
+        # bulk_create skips post_save, so the change feed and the home feed
+        # are fed here.
+        Change.objects.bulk_create(
+            Change(
+                model='news',
+                object_id=news.id,
+                action=Change.UPDATE if news.id in existing else Change.INSERT,
+            )
+            for news in news_list
+        )
+        refresh_feed(news.id for news in news_list)
+        save_signatures({item.news.id: item.signature for item in items})
+    bump_cache_version()
+    queue_related_refresh()
+    return len(existing)
+
+
+def validate_batch(batch, resolver):
+    valid, rejects = [], []
+    for line, row in batch:
+        errors = shape_errors(row)
+        if errors:
+            text = row.text if isinstance(row, InvalidRow) else row
+            rejects.append((line, text, errors))
+            continue
+        news, category_ids, errors = build_news(row, resolver)
+        if errors:
+            rejects.append((line, row, errors))
+        else:
+            signature = minhash(news.title, news.content)
+            valid.append(Item(line, row, news, category_ids, signature))
+    return valid, rejects
+
+
+def split_duplicates(items):
+    """Set aside rows that nearly match a stored News or an earlier row of
+    the batch, with one query for the whole batch."""
+    index = stored_index(
+        [item.signature for item in items if item.signature is not None]
+    )
+    kept, rejects = [], []
+    for item in items:
+        if item.signature is None:
+            kept.append(item)
+            continue
+        original = index.match(item.signature, exclude=item.news.id)
+        if original is not None:
+            # Stored rows are keyed by id, rows of this batch by line.
+            label = original if isinstance(original, str) else (
+                f'notícia #{original}'
+            )
+            rejects.append((item.line, item.row, [f'Duplicata de {label}']))
+            continue
+        kept.append(item)
+        index.add(item.news.id or f'linha {item.line}', item.signature)
+    return kept, rejects
+
+
+_worker_resolver = None
+
+
+def init_worker(resolver):
+    global _worker_resolver
+    _worker_resolver = resolver
+    if not apps.ready:
+        # Spawned (not forked) workers start without Django configured.
+        django.setup()
+
+
+def validate_in_worker(batch):
+    return validate_batch(batch, _worker_resolver)
+
+
+def validate_in_pool(batches, resolver, processes):
+    # Workers only run Python validation and never touch the database.
+    with ProcessPoolExecutor(
+        processes, initializer=init_worker, initargs=(resolver,)
+    ) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(validate_in_worker, batch))
+            if len(pending) > processes * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def validated_batches(batches, resolver, processes):
+    """Validate batches in a process pool while the caller inserts the
+    previous ones; at most two batches per process are in flight, so the
+    input is never read far ahead."""
+    if processes:
+        return validate_in_pool(batches, resolver, processes)
+    return (validate_batch(batch, resolver) for batch in batches)
+
+
+def import_news(rows, batch_size=500, on_reject=None, processes=0):
+    """Stream rows into News; returns (created, updated, rejected)."""
+    resolver = Resolver()
+    created = updated = rejected = 0
+    numbered = batches(enumerate(rows, start=1), batch_size)
+    for valid, rejects in validated_batches(numbered, resolver, processes):
+        valid, duplicates = split_duplicates(valid)
+        rejects += duplicates
+        rejected += len(rejects)
+        if on_reject is not None:
+            for reject in rejects:
+                on_reject(*reject)
+        if valid:
+            existing = upsert_batch(valid)
+            created += len(valid) - existing
+            updated += existing
+    return created, updated, rejected
+
+
+def write_reject(file):
+    def on_reject(line, row, errors):
+        record = {'line': line, 'errors': errors, 'row': row}
+        file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+    return on_reject
+
+
+def export_rows(chunk_size=1000):
+    queryset = (
+        News.objects.select_related('author')
+        .prefetch_related('categories')
+        .order_by('id')
+    )
+    for news in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            'id': news.id,
+            'title': news.title,
+            'content': news.content,
+            'author': news.author.name,
+            'categories': [
+                category.name for category in news.categories.all()
+            ],
+            'created_at': news.created_at.isoformat(),
+            'image': news.image.name or '',
+        }
+
+
+def write_rows(rows, file, fmt):
+    if fmt == 'csv':
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            categories = ';'.join(row['categories'])
+            writer.writerow({**row, 'categories': categories})
+            yield row
+        return
+    for row in rows:
+        file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        yield row
@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.cache import CacheMiddleware
+from django.utils.decorators import decorator_from_middleware_with_args
+from news.metrics import observe_cache
+
+VERSION_KEY = 'pages:version'
+# Version read when the current request arrived; see pinned_version.
+request_version = ContextVar('request_version', default=None)
+
+
+def cache_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_cache_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 1, None)
+
+
+@contextmanager
+def pinned_version(request):
+    # The version is read once per request: a response rendered before a
+    # write must not be stored under the version that write bumped to.
+    if not hasattr(request, '_cache_version'):
+        request._cache_version = cache_version()
+    token = request_version.set(request._cache_version)
+    try:
+        yield
+    finally:
+        request_version.reset(token)
+
+
+class VersionedCacheMiddleware(CacheMiddleware):
+    """CacheMiddleware whose keys carry a version that every News, User or
+    Category change bumps, so cached pages never outlive the data."""
+
+    @property
+    def key_prefix(self):
+        version = request_version.get()
+        if version is None:
+            version = cache_version()
+        return f'{self._key_prefix}:{version}'
+
+    @key_prefix.setter
+    def key_prefix(self, value):
+        self._key_prefix = value
+
+    @property
+    def page_timeout(self):
+        return settings.PAGE_CACHE_TIMEOUT
+
+    @page_timeout.setter
+    def page_timeout(self, value):
+        pass
+
+    def process_request(self, request):
+        if self.page_timeout == 0:
+            request._cache_update_cache = False
+            return None
+        with pinned_version(request):
+            response = super().process_request(request)
+        if request.method in ('GET', 'HEAD'):
+            observe_cache('pages', response is not None)
+        return response
+
+    def process_response(self, request, response):
+        with pinned_version(request):
+            return super().process_response(request, response)
+
+
+cached_page = decorator_from_middleware_with_args(VersionedCacheMiddleware)
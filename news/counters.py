@@ -0,0 +1,135 @@
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+from functools import wraps
+from time import monotonic
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Case,
+    F,
+    FloatField,
+    PositiveBigIntegerField,
+    Value,
+    When,
+)
+from django.utils import timezone
+from news.models import ArchivedNews, News, ViewCount
+from news.trending import add_views
+
+logger = logging.getLogger('news.counters')
+
+
+def by_news(values, output_field):
+    return Case(
+        *[
+            When(news_id=news_id, then=Value(value))
+            for news_id, value in values.items()
+        ],
+        default=Value(0),
+        output_field=output_field,
+    )
+
+
+def write_counts(counts, chunk_size=500):
+    """Add `counts` ({news_id: views}) to ViewCount and fold them into the
+    trending scores, one UPDATE per chunk. Ids are sorted so concurrent
+    flushes lock rows in the same order."""
+    # Archived articles keep their ViewCount and are still counted.
+    ids = sorted(
+        News.objects.filter(id__in=counts).values_list('id', flat=True)
+        .union(
+            ArchivedNews.objects.filter(id__in=counts)
+            .values_list('id', flat=True)
+        )
+    )
+    now = timezone.now()
+    with transaction.atomic():
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            ViewCount.objects.bulk_create(
+                [ViewCount(news_id=news_id) for news_id in chunk],
+                ignore_conflicts=True,
+            )
+            stored = ViewCount.objects.select_for_update().filter(
+                news_id__in=chunk
+            ).order_by('news_id').values_list('news_id', 'trending')
+            trending = {
+                news_id: add_views(score, counts[news_id], now)
+                for news_id, score in stored
+            }
+            ViewCount.objects.filter(news_id__in=chunk).update(
+                count=F('count') + by_news(
+                    {news_id: counts[news_id] for news_id in chunk},
+                    PositiveBigIntegerField(),
+                ),
+                trending=by_news(trending, FloatField()),
+                updated_at=now,
+            )
+
+
+class ViewBuffer:
+    """Per-process view counts, written to the database every
+    VIEW_COUNTER_FLUSH_INTERVAL seconds or VIEW_COUNTER_MAX_PENDING views,
+    whichever comes first; a crash loses at most that much."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.pending = Counter()
+        self.pending_views = 0
+        self.flushed_at = monotonic()
+
+    def record(self, news_id):
+        with self.lock:
+            if self.pid != os.getpid():
+                # Forked worker: the parent's views are not ours.
+                self.reset()
+            self.pending[news_id] += 1
+            self.pending_views += 1
+            due = (
+                self.pending_views >= settings.VIEW_COUNTER_MAX_PENDING
+                or monotonic() - self.flushed_at
+                >= settings.VIEW_COUNTER_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+            self.pending_views = 0
+            self.flushed_at = monotonic()
+        if not pending:
+            return
+        try:
+            write_counts(pending)
+        except Exception:
+            logger.exception('Falha ao gravar contadores de visualização.')
+            with self.lock:
+                self.pending.update(pending)
+                self.pending_views += sum(pending.values())
+
+
+buffer = ViewBuffer()
+atexit.register(buffer.flush)
+
+
+def count_views(view):
+    """Count successful hits; applied outside the page cache so cached
+    responses are counted too."""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if request.method == 'GET' and response.status_code == 200:
+            buffer.record(kwargs['id'])
+        return response
+
+    return wrapper
@@ -0,0 +1,199 @@
+from collections import defaultdict
+from hashlib import blake2b
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from news.models import News, NewsBand, NewsSignature
+from news.related import tokens
+from news.upsert import upsert
+
+PERMUTATIONS = 64
+BANDS = 16
+ROWS = PERMUTATIONS // BANDS
+PRIME = (1 << 61) - 1
+# Fixed so signatures stay comparable across processes and releases.
+_random = np.random.RandomState(20230808)
+COEFFICIENTS = _random.randint(1, 1 << 29, PERMUTATIONS, dtype=np.uint64)
+OFFSETS = _random.randint(0, 1 << 32, PERMUTATIONS, dtype=np.uint64)
+
+
+def minhash(title, content):
+    """MinHash of the word bigrams of title and content, or None when the
+    text is too short for the estimate to mean anything."""
+    words = tokens(f'{title} {content}')
+    if len(words) < settings.NEAR_DUPLICATE_MIN_WORDS:
+        return None
+    digests = b''.join(
+        blake2b(f'{first} {second}'.encode(), digest_size=4).digest()
+        for first, second in set(zip(words, words[1:]))
+    )
+    shingles = np.frombuffer(digests, dtype='>u4').astype(np.uint64)
+    # (a * x + b) mod p with x < 2**32 and a < 2**29 never overflows.
+    hashed = (np.outer(shingles, COEFFICIENTS) + OFFSETS) % np.uint64(PRIME)
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def buckets(signature):
+    """LSH buckets: articles agreeing on every row of some band become
+    candidates, which for Jaccard s happens with 1 - (1 - s**ROWS)**BANDS."""
+    return [
+        int.from_bytes(
+            blake2b(
+                signature[band * ROWS:(band + 1) * ROWS].tobytes(),
+                digest_size=8,
+            ).digest(),
+            'big',
+            signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def similarity(first, second):
+    return float(np.mean(first == second))
+
+
+def is_near(first, second):
+    return similarity(first, second) >= settings.NEAR_DUPLICATE_THRESHOLD
+
+
+def decode(stored):
+    return np.frombuffer(bytes(stored), dtype=np.uint32)
+
+
+def candidates(signatures):
+    """Stored signatures sharing a bucket with any of `signatures`; one
+    IN list per band keeps the query small for whole batches."""
+    by_band = defaultdict(set)
+    for signature in signatures:
+        for band, bucket in enumerate(buckets(signature)):
+            by_band[band].add(bucket)
+    query = Q()
+    for band, band_buckets in by_band.items():
+        query |= Q(band=band, bucket__in=band_buckets)
+    return NewsSignature.objects.filter(
+        news_id__in=NewsBand.objects.filter(query).values('news_id')
+    )
+
+
+def match_stored(signature, exclude_id=None):
+    stored_candidates = (
+        candidates([signature])
+        .exclude(news_id=exclude_id)
+        .order_by('news_id')
+        .values_list('news_id', 'minhash')
+    )
+    for news_id, stored in stored_candidates:
+        if is_near(signature, decode(stored)):
+            return news_id
+    return None
+
+
+def find_duplicate(title, content, exclude_id=None):
+    """Id of an existing News that is a near duplicate, or None."""
+    signature = minhash(title, content)
+    if signature is None:
+        return None
+    return match_stored(signature, exclude_id)
+
+
+def duplicate_error(title, content, exclude_id=None):
+    original = find_duplicate(title, content, exclude_id)
+    if original is None:
+        return None
+    return f'Esta notícia é quase idêntica à notícia #{original}.'
+
+
+def save_signatures(signatures):
+    """Store {news_id: signature}; None drops the news from the index."""
+    news_ids = list(signatures)
+    stored = {
+        news_id: signature
+        for news_id, signature in signatures.items()
+        if signature is not None
+    }
+    with transaction.atomic():
+        NewsSignature.objects.filter(news_id__in=news_ids).exclude(
+            news_id__in=stored
+        ).delete()
+        upsert(
+            NewsSignature,
+            [
+                NewsSignature(news_id=news_id, minhash=signature.tobytes())
+                for news_id, signature in stored.items()
+            ],
+            update_fields=['minhash'],
+            unique_fields=['news'],
+        )
+        NewsBand.objects.filter(news_id__in=news_ids).delete()
+        NewsBand.objects.bulk_create(
+            NewsBand(news_id=news_id, band=band, bucket=bucket)
+            for news_id, signature in stored.items()
+            for band, bucket in enumerate(buckets(signature))
+        )
+    return len(stored)
+
+
+def backfill_signatures(chunk_size=1000):
+    missing = (
+        News.objects.filter(signature__isnull=True)
+        .order_by('id')
+        .values_list('id', 'title', 'content')
+    )
+    count, batch = 0, {}
+    for news_id, title, content in missing.iterator(chunk_size):
+        batch[news_id] = minhash(title, content)
+        if len(batch) == chunk_size:
+            count += save_signatures(batch)
+            batch = {}
+    return count + save_signatures(batch)
+
+
+class BandIndex:
+    """In-memory LSH buckets, for checks that the table cannot answer yet
+    (rows of the same import batch) or would answer one row at a time."""
+
+    def __init__(self):
+        self.buckets = defaultdict(list)
+
+    def add(self, key, signature):
+        for band, bucket in enumerate(buckets(signature)):
+            self.buckets[band, bucket].append((key, signature))
+
+    def match(self, signature, exclude=None):
+        for band, bucket in enumerate(buckets(signature)):
+            for key, other in self.buckets[band, bucket]:
+                if key != exclude and is_near(signature, other):
+                    return key
+        return None
+
+
+def stored_index(signatures):
+    """BandIndex of the stored candidates of a whole batch, fetched in one
+    query."""
+    index = BandIndex()
+    if signatures:
+        stored_candidates = candidates(signatures).values_list(
+            'news_id', 'minhash'
+        )
+        for news_id, stored in stored_candidates:
+            index.add(news_id, decode(stored))
+    return index
+
+
+def duplicate_pairs():
+    """(duplicate_id, original_id) for every News whose text nearly matches
+    an older one, keeping the oldest of each group."""
+    index = BandIndex()
+    signatures = NewsSignature.objects.order_by('news_id').values_list(
+        'news_id', 'minhash'
+    )
+    for news_id, stored in signatures.iterator():
+        signature = decode(stored)
+        original = index.match(signature)
+        if original is None:
+            index.add(news_id, signature)
+        else:
+            yield news_id, original
@@ -0,0 +1,69 @@
+from django.db import transaction
+from news.models import FeedEntry, News
+from news.upsert import upsert
+
+FEED_FIELDS = [
+    'title',
+    'created_at',
+    'image',
+    'image_width',
+    'image_height',
+    'image_color',
+    'author_name',
+    'category_names',
+]
+
+
+def feed_source():
+    return News.objects.select_related('author').prefetch_related(
+        'categories'
+    )
+
+
+def entry_for(news):
+    return FeedEntry(
+        news_id=news.id,
+        title=news.title,
+        created_at=news.created_at,
+        image=news.image.name or None,
+        image_width=news.image_width,
+        image_height=news.image_height,
+        image_color=news.image_color,
+        author_name=news.author.name,
+        category_names=[category.name for category in news.categories.all()],
+    )
+
+
+def refresh_feed(news_ids):
+    """Rewrite the feed rows of the given News; ids that no longer exist
+    lose their row."""
+    news_ids = set(news_ids)
+    if not news_ids:
+        return
+    entries = [
+        entry_for(news) for news in feed_source().filter(id__in=news_ids)
+    ]
+    with transaction.atomic():
+        FeedEntry.objects.filter(news_id__in=news_ids).exclude(
+            news_id__in=[entry.news_id for entry in entries]
+        ).delete()
+        upsert(
+            FeedEntry,
+            entries,
+            update_fields=FEED_FIELDS,
+            unique_fields=['news'],
+        )
+
+
+def rebuild_feed(chunk_size=1000):
+    count = 0
+    with transaction.atomic():
+        FeedEntry.objects.all().delete()
+        batch = []
+        for news in feed_source().order_by('id').iterator(chunk_size):
+            batch.append(entry_for(news))
+            if len(batch) == chunk_size:
+                count += len(FeedEntry.objects.bulk_create(batch))
+                batch = []
+        count += len(FeedEntry.objects.bulk_create(batch))
+    return count
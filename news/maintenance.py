@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from news import feed, markup, related
+from news.caching import bump_cache_version
+from news.duplicates import backfill_signatures
+from news.models import Change, Checkpoint, News, NewsSignature
+from news.tasks import enqueue
+
+# Highest seq removed by prune_changes; readers behind it must resync.
+PRUNED_CHECKPOINT = 'changes-pruned'
+
+rebuilders = {}
+
+
+def rebuilder(func):
+    rebuilders[func.__name__.replace('rebuild_', '')] = func
+    return func
+
+
+@rebuilder
+def rebuild_cache():
+    bump_cache_version()
+    return 1
+
+
+@rebuilder
+def rebuild_feed():
+    return feed.rebuild_feed()
+
+
+@rebuilder
+def rebuild_related():
+    Checkpoint.objects.filter(name=related.CHECKPOINT).delete()
+    return related.refresh_from_changes()
+
+
+@rebuilder
+def rebuild_signatures():
+    NewsSignature.objects.all().delete()
+    return backfill_signatures()
+
+
+@rebuilder
+def rebuild_content():
+    return markup.rerender()
+
+
+@rebuilder
+def rebuild_images():
+    ids = News.objects.exclude(image='').exclude(image=None).values_list(
+        'id', flat=True
+    )
+    for news_id in ids.iterator():
+        enqueue(
+            'process_news_image', news_id, dedup_key=f'news-image:{news_id}'
+        )
+    return len(ids)
+
+
+def prune_changes(days):
+    cutoff = timezone.now() - timedelta(days=days)
+    old = Change.objects.filter(changed_at__lt=cutoff)
+    with transaction.atomic():
+        last = old.aggregate(last=Max('seq'))['last']
+        deleted, _ = old.delete()
+        if last is not None:
+            Checkpoint.objects.update_or_create(
+                name=PRUNED_CHECKPOINT, defaults={'seq': last}
+            )
+    return deleted
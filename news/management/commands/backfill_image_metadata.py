@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from news.models import News
+from news.tasks import process_news_image
+
+
+class Command(BaseCommand):
+    help = (
+        'Preenche dimensões, tamanho e cor das imagens de notícias que '
+        'ainda não os têm.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=500)
+
+    def handle(self, *args, **options):
+        missing = (
+            News.objects.exclude(image='').exclude(image=None)
+            .filter(image_width__isnull=True)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        done = failed = 0
+        last_id = 0
+        while True:
+            # Keyset pages: rows that fail keep a null width and are skipped.
+            ids = list(missing.filter(id__gt=last_id)[:options['batch']])
+            if not ids:
+                break
+            for news_id in ids:
+                if self.process(news_id):
+                    done += 1
+                else:
+                    failed += 1
+            last_id = ids[-1]
+        self.stdout.write(self.style.SUCCESS(
+            f'{done} imagens atualizadas, {failed} com erro.'
+        ))
+
+    def process(self, news_id):
+        try:
+            process_news_image(news_id)
+        except (OSError, ValueError) as error:
+            self.stderr.write(f'#{news_id}: {error}')
+            return False
+        return True
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from news.duplicates import backfill_signatures, duplicate_pairs
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = (
+        'Encontra notícias quase idênticas a outras mais antigas e, com '
+        '--delete, apaga as cópias.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete',
+            action='store_true',
+            help='Apaga as cópias (por padrão só as lista).',
+        )
+        parser.add_argument('--batch', type=int, default=500)
+
+    def handle(self, *args, **options):
+        indexed = backfill_signatures()
+        if indexed:
+            self.stdout.write(f'{indexed} assinaturas calculadas.')
+
+        pairs = list(duplicate_pairs())
+        for duplicate_id, original_id in pairs:
+            self.stdout.write(f'#{duplicate_id} duplica #{original_id}')
+
+        if options['delete']:
+            ids = [duplicate_id for duplicate_id, _ in pairs]
+            self.delete(ids, options['batch'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{len(ids)} duplicatas apagadas.'
+            ))
+        else:
+            self.stdout.write(f'{len(pairs)} duplicatas encontradas.')
+
+    def delete(self, ids, batch):
+        for start in range(0, len(ids), batch):
+            # Queryset deletes still send post_delete per row, so the change
+            # log, feed and caches follow.
+            News.objects.filter(id__in=ids[start:start + batch]).delete()
@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand
+from news.models import SlowQuery
+
+
+class Command(BaseCommand):
+    help = 'Exporta o registro de consultas lentas em JSON Lines.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100)
+        parser.add_argument('--view', help='Filtra pela view de origem.')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Apaga o registro depois de exportá-lo.',
+        )
+
+    def handle(self, *args, **options):
+        queries = SlowQuery.objects.all()
+        if options['view']:
+            queries = queries.filter(view=options['view'])
+
+        for query in queries[:options['limit']]:
+            self.stdout.write(json.dumps({
+                'captured_at': query.captured_at.isoformat(),
+                'database': query.database,
+                'view': query.view,
+                'duration_ms': round(query.duration * 1000, 2),
+                'sql': query.sql,
+                'params': query.params,
+                'stack': query.stack.splitlines(),
+                'plan': query.plan,
+            }, ensure_ascii=False))
+
+        if options['clear']:
+            queries.delete()
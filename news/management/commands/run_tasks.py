@@ -0,0 +1,57 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from news.tasks import claim, requeue_stale, run_task
+
+
+class Command(BaseCommand):
+    help = 'Executa a fila de tarefas em segundo plano.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=settings.TASK_WORKER_PROCESSES,
+            help='Tamanho do pool de processos (0 executa no próprio '
+                 'processo).',
+        )
+        parser.add_argument('--batch', type=int, default=None)
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Sai quando a fila estiver vazia.',
+        )
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        batch = options['batch'] or max(processes, 1) * 4
+        idle_sleep = (
+            0 if options['once'] else settings.TASK_WORKER_POLL_INTERVAL
+        )
+        pool = ProcessPoolExecutor(processes) if processes else None
+        try:
+            while self.run_batch(pool, batch, idle_sleep) or idle_sleep:
+                pass
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def run_batch(self, pool, batch, idle_sleep):
+        requeue_stale()
+        ids = claim(batch)
+        if not ids:
+            time.sleep(idle_sleep)
+            return False
+        for task_id, status in zip(ids, self.run(pool, ids)):
+            self.stdout.write(f'Tarefa {task_id}: {status}')
+        return True
+
+    def run(self, pool, ids):
+        if pool is None:
+            return [run_task(task_id) for task_id in ids]
+        # Forked workers must not share the parent's database socket.
+        connections.close_all()
+        return list(pool.map(run_task, ids))
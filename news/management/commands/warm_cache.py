@@ -0,0 +1,101 @@
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from news.models import Category, News
+
+ACCESS_LOG_RE = re.compile(
+    r'"GET (?P<path>\S+) HTTP/[\d.]+" (?P<status>\d{3})'
+)
+
+
+def top_paths(access_log, limit):
+    counts = Counter()
+    with open(access_log, encoding='utf-8', errors='replace') as file:
+        for line in file:
+            match = ACCESS_LOG_RE.search(line)
+            if match and match['status'] == '200':
+                counts[match['path']] += 1
+    return [path for path, _ in counts.most_common(limit)]
+
+
+def default_paths(newest):
+    paths = [reverse('home-page'), reverse('news-list'), '/api/categories/']
+    news_ids = News.objects.order_by('-created_at', '-id').values_list(
+        'id', flat=True
+    )[:newest]
+    for news_id in news_ids:
+        paths.append(reverse('news-details-page', args=[news_id]))
+        paths.append(reverse('news-detail', args=[news_id]))
+    for category_id in Category.objects.values_list('id', flat=True):
+        paths.append(reverse('category-detail', args=[category_id]))
+    return paths
+
+
+class Command(BaseCommand):
+    help = (
+        'Pré-aquece o cache de páginas e da API requisitando as URLs mais '
+        'acessadas em um servidor em execução.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            default='http://127.0.0.1:8000',
+            help='Endereço do servidor (o cache é por host).',
+        )
+        parser.add_argument('--newest', type=int, default=50)
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument(
+            '--access-log',
+            help='Reproduz as URLs mais acessadas deste log de acesso.',
+        )
+        parser.add_argument('--top', type=int, default=100)
+        parser.add_argument(
+            '--accept-encoding',
+            default='gzip, br',
+            help='Variante de compressão a aquecer.',
+        )
+
+    def handle(self, *args, **options):
+        paths = default_paths(options['newest'])
+        if options['access_log']:
+            paths += top_paths(options['access_log'], options['top'])
+        paths = list(dict.fromkeys(paths))
+
+        base_url = options['base_url'].rstrip('/')
+        headers = {'Accept-Encoding': options['accept_encoding']}
+        total, failures = len(paths), 0
+
+        with ThreadPoolExecutor(options['workers']) as pool:
+            results = pool.map(
+                lambda path: self.fetch(base_url + path, headers), paths
+            )
+            for done, (path, (status, elapsed)) in enumerate(
+                zip(paths, results), start=1
+            ):
+                failures += status != 200
+                self.stdout.write(
+                    f'[{done}/{total}] {status} {path} {elapsed:.0f}ms'
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{total - failures} de {total} URLs aquecidas.'
+        ))
+
+    def fetch(self, url, headers):
+        started = time.perf_counter()
+        try:
+            with urlopen(Request(url, headers=headers), timeout=30) as resp:
+                resp.read()
+                status = resp.status
+        except HTTPError as exc:
+            status = exc.code
+        except URLError:
+            status = 'erro'
+        return status, (time.perf_counter() - started) * 1000
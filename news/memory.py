@@ -0,0 +1,172 @@
+import os
+import socket
+import sysconfig
+import threading
+import tracemalloc
+from pathlib import Path
+from time import monotonic
+
+from django.conf import settings
+from django.core.cache import cache
+
+from news.models import MemoryReport
+
+STATE_KEY = 'memory-diagnostics:state'
+DEFAULT_STATE = {'enabled': False, 'requests': 100, 'top': 20}
+LIBRARY_DIRS = [
+    sysconfig.get_paths()['purelib'],
+    sysconfig.get_paths()['stdlib'],
+]
+
+
+def get_state():
+    return {**DEFAULT_STATE, **cache.get(STATE_KEY, {})}
+
+
+def set_state(**changes):
+    state = {**get_state(), **changes}
+    cache.set(STATE_KEY, state, None)
+    return state
+
+
+def state_changes(data):
+    changes = {}
+    if 'enabled' in data:
+        changes['enabled'] = data['enabled'] == '1'
+    for name in ('requests', 'top'):
+        if data.get(name, '').isdigit():
+            changes[name] = max(int(data[name]), 1)
+    return changes
+
+
+def worker_name():
+    # Pids repeat across hosts, so the host is part of the worker key.
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def get_reports():
+    return {
+        report.worker: {
+            'requests': report.requests,
+            'traced_memory': report.traced_memory,
+            'top': report.top,
+            'reported_at': report.reported_at.isoformat(),
+        }
+        for report in MemoryReport.objects.order_by('-reported_at')
+    }
+
+
+def module_for(filename):
+    path = Path(filename)
+    if 'django/template' in path.as_posix() or path.suffix == '.html':
+        return 'templates'
+    for base in [str(settings.BASE_DIR), *LIBRARY_DIRS]:
+        if filename.startswith(base + os.sep):
+            relative = Path(filename[len(base) + 1:]).with_suffix('')
+            parts = [part for part in relative.parts if part != '__init__']
+            if base in LIBRARY_DIRS:
+                # Libraries are grouped by package, e.g. "django.db".
+                parts = parts[:2]
+            return '.'.join(parts)
+    return path.name
+
+
+def is_project_file(filename):
+    return (
+        filename.startswith(str(settings.BASE_DIR))
+        and not any(filename.startswith(base) for base in LIBRARY_DIRS)
+    )
+
+
+def allocation_site(traceback):
+    # Credit the most recent project frame (e.g. news.views building a
+    # queryset) rather than the Django internals that allocated.
+    for frame in reversed(traceback):
+        module = module_for(frame.filename)
+        if module == 'templates' or is_project_file(frame.filename):
+            return module
+    return module_for(traceback[-1].filename)
+
+
+def take_snapshot():
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+
+
+def diff_by_module(before, after, top):
+    modules = {}
+    for stat in after.compare_to(before, 'traceback'):
+        module = allocation_site(stat.traceback)
+        size, count = modules.get(module, (0, 0))
+        modules[module] = (size + stat.size_diff, count + stat.count_diff)
+    ranked = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)
+    return [
+        {'module': module, 'size_diff': size, 'count_diff': count}
+        for module, (size, count) in ranked[:top]
+    ]
+
+
+class Tracker:
+    """Per-process tracemalloc session.
+
+    Every worker polls the flag in the shared cache, so it can be switched
+    on and off without restarting them, and writes its report to its own
+    MemoryReport row, so the view sees every worker and concurrent reports
+    never overwrite each other."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked_at = None
+        self.state = DEFAULT_STATE
+        self.baseline = None
+        self.requests = 0
+
+    def refresh(self):
+        now = monotonic()
+        interval = settings.MEMORY_DIAGNOSTICS_POLL_INTERVAL
+        if self.checked_at is None or now - self.checked_at >= interval:
+            self.checked_at = now
+            self.state = get_state()
+        return self.state
+
+    def request_finished(self):
+        state = self.refresh()
+        with self.lock:
+            if not state['enabled']:
+                self.stop()
+                return
+            if self.baseline is None:
+                self.start()
+                return
+            self.requests += 1
+            if self.requests >= state['requests']:
+                self.report(state['top'])
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(settings.MEMORY_DIAGNOSTICS_FRAMES)
+        self.baseline = take_snapshot()
+        self.requests = 0
+
+    def stop(self):
+        if self.baseline is not None and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.baseline = None
+
+    def report(self, top):
+        snapshot = take_snapshot()
+        MemoryReport.objects.update_or_create(
+            worker=worker_name(),
+            defaults={
+                'requests': self.requests,
+                'traced_memory': tracemalloc.get_traced_memory()[0],
+                'top': diff_by_module(self.baseline, snapshot, top),
+            },
+        )
+        self.baseline = snapshot
+        self.requests = 0
+
+
+tracker = Tracker()
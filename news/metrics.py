@@ -0,0 +1,187 @@
+import fcntl
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from time import monotonic
+
+from django.conf import settings
+
+METRICS = {
+    'spotnews_request_duration_seconds': (
+        'histogram', 'Tempo de resposta por rota.'
+    ),
+    'spotnews_requests_total': ('counter', 'Requisições por rota e status.'),
+    'spotnews_request_errors_total': (
+        'counter', 'Requisições com erro (5xx ou exceção) por rota.'
+    ),
+    'spotnews_db_queries_total': ('counter', 'Consultas SQL por rota.'),
+    'spotnews_db_query_seconds_total': (
+        'counter', 'Tempo gasto em SQL por rota.'
+    ),
+    'spotnews_cache_requests_total': (
+        'counter', 'Consultas ao cache por cache e resultado.'
+    ),
+}
+# Totals of exited workers, folded in so their files can be removed.
+DEAD_FILE = 'dead.json'
+
+
+class Collector:
+    """Per-process samples, written to METRICS_DIR so /metrics can sum
+    the files of every worker."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        # Unique per process, so a recycled pid never overwrites (and
+        # lowers) the totals left by the dead worker that had it.
+        self.name = f'{self.pid}-{uuid.uuid4().hex[:8]}'
+        self.samples = {}
+        self.flushed_at = monotonic()
+
+    def inc(self, name, labels, value=1.0):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            if self.pid != os.getpid():
+                # Forked worker: the parent's samples are not ours.
+                self.reset()
+            self.samples[key] = self.samples.get(key, 0.0) + value
+        if monotonic() - self.flushed_at >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def observe(self, name, labels, value):
+        for bound in settings.METRICS_BUCKETS:
+            if value <= bound:
+                self.inc(f'{name}_bucket', {**labels, 'le': str(bound)})
+        self.inc(f'{name}_bucket', {**labels, 'le': '+Inf'})
+        self.inc(f'{name}_sum', labels, value)
+        self.inc(f'{name}_count', labels)
+
+    def flush(self):
+        directory = Path(settings.METRICS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            self.flushed_at = monotonic()
+            write_samples(directory / f'{self.name}.json', self.samples)
+
+
+collector = Collector()
+
+
+def observe_request(view, status, duration, db_queries, db_time, error):
+    labels = {'view': view}
+    collector.observe('spotnews_request_duration_seconds', labels, duration)
+    collector.inc('spotnews_requests_total', {**labels, 'status': status})
+    collector.inc('spotnews_db_queries_total', labels, db_queries)
+    collector.inc('spotnews_db_query_seconds_total', labels, db_time)
+    if error:
+        collector.inc('spotnews_request_errors_total', labels)
+
+
+def observe_cache(cache_name, hit):
+    collector.inc(
+        'spotnews_cache_requests_total',
+        {'cache': cache_name, 'result': 'hit' if hit else 'miss'},
+    )
+
+
+def write_samples(path, samples):
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps([
+        [name, dict(labels), value]
+        for (name, labels), value in samples.items()
+    ]))
+    os.replace(tmp_path, path)
+
+
+def add_samples(totals, path):
+    try:
+        samples = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return
+    for name, labels, value in samples:
+        key = (name, tuple(sorted(labels.items())))
+        totals[key] = totals.get(key, 0.0) + value
+
+
+def is_dead(path):
+    pid = path.stem.partition('-')[0]
+    if not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def fold_dead_workers(directory):
+    """Merge the files of exited workers into DEAD_FILE and remove them,
+    as prometheus_client's mark_process_dead does: counters keep their
+    totals and files do not pile up. Pids are only meaningful locally, so
+    METRICS_DIR must not be shared between hosts."""
+    with (directory / 'dead.lock').open('w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        dead = [path for path in directory.glob('*.json') if is_dead(path)]
+        if not dead:
+            return
+        totals = {}
+        for path in [directory / DEAD_FILE, *dead]:
+            add_samples(totals, path)
+        write_samples(directory / DEAD_FILE, totals)
+        for path in dead:
+            path.unlink()
+
+
+def aggregate():
+    directory = Path(settings.METRICS_DIR)
+    fold_dead_workers(directory)
+    totals = {}
+    for path in directory.glob('*.json'):
+        add_samples(totals, path)
+    return totals
+
+
+def metric_family(sample_name):
+    for suffix in ('_bucket', '_sum', '_count'):
+        if sample_name.endswith(suffix):
+            family = sample_name[:-len(suffix)]
+            if family in METRICS:
+                return family
+    return sample_name
+
+
+def sample_order(item):
+    (name, labels), value = item
+    labels = dict(labels)
+    bound = labels.pop('le', None)
+    bound = float('inf') if bound in (None, '+Inf') else float(bound)
+    return (name, sorted(labels.items()), bound)
+
+
+def exposition():
+    collector.flush()
+    families = {}
+    samples = sorted(aggregate().items(), key=sample_order)
+    for (name, labels), value in samples:
+        families.setdefault(metric_family(name), []).append(
+            (name, labels, value)
+        )
+
+    lines = []
+    for family, (kind, description) in METRICS.items():
+        lines.append(f'# HELP {family} {description}')
+        lines.append(f'# TYPE {family} {kind}')
+        for name, labels, value in families.get(family, []):
+            label_text = ','.join(
+                f'{key}="{label}"' for key, label in labels
+            )
+            lines.append(f'{name}{{{label_text}}} {value}')
+    return '\n'.join(lines) + '\n'
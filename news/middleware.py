@@ -0,0 +1,339 @@
+import hashlib
+import logging
+import threading
+import zlib
+from time import perf_counter, time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.utils.cache import has_vary_header, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+from news.memory import tracker
+from news.metrics import observe_cache, observe_request
+from news.profiling import Sampler, is_requested, is_sampled, save_profile
+from news.slow_queries import persist
+from news.timing import timing_scope
+
+try:
+    import brotli
+except ModuleNotFoundError:
+    brotli = None
+
+timing_logger = logging.getLogger('news.timing')
+
+
+def accepted_encodings(header):
+    encodings = {}
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def choose_encoding(header):
+    encodings = accepted_encodings(header)
+    supported = ['br', 'gzip'] if brotli is not None else ['gzip']
+    candidates = [
+        name for name in supported
+        if encodings.get(name, encodings.get('*', 0)) > 0
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda name: encodings.get(name, 0))
+
+
+def compressor_for(encoding):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=5)
+        return compressor.process, compressor.finish
+    # wbits=31 writes a gzip header and trailer around the deflate stream.
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+def compress_stream(chunks, encoding):
+    compress, finish = compressor_for(encoding)
+    for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def compress_async_stream(chunks, encoding):
+    compress, finish = compressor_for(encoding)
+    async for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def compress_body(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=5)
+    return compress_string(content)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    max_random_bytes = 100
+
+    def process_response(self, request, response):
+        if not self.should_compress(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            self.compress_streaming(response, encoding)
+        elif not self.compress_content(response, encoding):
+            return response
+
+        self.mark_encoded(response, encoding)
+        return response
+
+    def mark_encoded(self, response, encoding):
+        # A strong ETag no longer matches the transformed body.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+
+    def should_compress(self, response):
+        # Byte ranges index the identity body, so partial responses are left
+        # alone, as are media types that are compressed already.
+        if response.status_code == 206 or response.has_header('Content-Range'):
+            return False
+        if response.has_header('Content-Encoding'):
+            return False
+        if not self.is_compressible(response.get('Content-Type', '')):
+            return False
+        return (
+            response.streaming
+            or len(response.content) >= settings.COMPRESSION_MIN_SIZE
+        )
+
+    def is_compressible(self, content_type):
+        media_type = content_type.partition(';')[0].strip().lower()
+        return media_type.startswith(settings.COMPRESSION_CONTENT_TYPES)
+
+    def compress_streaming(self, response, encoding):
+        if response.is_async:
+            response.streaming_content = compress_async_stream(
+                response.streaming_content, encoding
+            )
+        else:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding
+            )
+        del response.headers['Content-Length']
+
+    def compress_content(self, response, encoding):
+        compressed = self.compressed_content(response, encoding)
+        if len(compressed) >= len(response.content):
+            return False
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        return True
+
+    def compressed_content(self, response, encoding):
+        # Per-user pages (CSRF tokens, sessions) get random gzip padding
+        # against BREACH and are never shared through the cache.
+        if has_vary_header(response, 'Cookie'):
+            if encoding == 'gzip':
+                return compress_string(
+                    response.content, max_random_bytes=self.max_random_bytes
+                )
+            return compress_body(response.content, encoding)
+
+        digest = hashlib.sha1(response.content).hexdigest()
+        key = f'compressed:{encoding}:{digest}'
+        compressed = cache.get(key)
+        observe_cache('compression', compressed is not None)
+        if compressed is None:
+            compressed = compress_body(response.content, encoding)
+            cache.set(key, compressed, settings.COMPRESSION_CACHE_TIMEOUT)
+        return compressed
+
+
+class ServerTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SERVER_TIMING_ENABLED:
+            return self.get_response(request)
+
+        with timing_scope() as timing:
+            response = self.get_response(request)
+
+        response.headers['Server-Timing'] = timing.header()
+        self.log(request, response, timing)
+        return response
+
+    def log(self, request, response, timing):
+        metrics = timing.metrics()
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'db_queries': timing.db_queries,
+            **{f'{name}_ms': value for name, value in metrics.items()},
+        }
+        timing_logger.info(
+            ' '.join(f'{key}={value}' for key, value in fields.items()),
+            extra={'timing': fields},
+        )
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = perf_counter()
+        with timing_scope() as timing:
+            db_queries, db_time = timing.db_queries, timing.db_time
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        observe_request(
+            view=(match.url_name or match.view_name) if match else 'unmatched',
+            status=str(response.status_code),
+            duration=perf_counter() - started,
+            db_queries=timing.db_queries - db_queries,
+            db_time=timing.db_time - db_time,
+            error=response.status_code >= 500,
+        )
+        return response
+
+
+class SlowQueryMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.SLOW_QUERY_THRESHOLD_MS is None:
+            return self.get_response(request)
+
+        with timing_scope() as timing:
+            response = self.get_response(request)
+            captures = list(timing.slow_queries)
+            timing.slow_queries.clear()
+
+        # Recorded once the scope is closed, so EXPLAIN, the insert and the
+        # trim are not counted in Server-Timing or the request metrics. This
+        # holds only while this middleware is listed before the metrics and
+        # Server-Timing middlewares, whose scopes nest inside this one.
+        if captures:
+            match = request.resolver_match
+            persist(captures, match.view_name if match else request.path)
+        return response
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        sampler = getattr(request, '_profiling_sampler', None)
+        if sampler is not None:
+            stacks = sampler.stop()
+            match = request.resolver_match
+            name = save_profile(stacks, match.view_name if match else 'none')
+            response.headers['X-Profile-Id'] = name
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if is_requested(request) or is_sampled(request):
+            request._profiling_sampler = Sampler(
+                threading.get_ident(), settings.PROFILING_INTERVAL
+            ).start()
+
+
+class MemoryDiagnosticsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        tracker.request_finished()
+        return response
+
+
+class AdmissionControlMiddleware:
+    """Caps in-flight requests to DB-heavy views across all workers and
+    sheds the excess with 503 instead of queueing them on MySQL.
+
+    A request is counted in the key of the ADMISSION_CONTROL_TIMEOUT-long
+    slot it started in and released from that same key; the in-flight
+    total is the current slot plus the previous one. Keys expire two slots
+    after they start, which frees counts leaked by a crashed worker without
+    ever resetting a counter that running requests still hold."""
+
+    prefix = 'admission:in-flight'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        key = getattr(request, '_admission_key', None)
+        if key is not None:
+            self.release(key)
+        return response
+
+    @classmethod
+    def slot_key(cls, slot):
+        return f'{cls.prefix}:{slot}'
+
+    def release(self, key):
+        try:
+            cache.decr(key)
+        except ValueError:
+            # The request outlived its slot key.
+            pass
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if match.url_name not in settings.ADMISSION_CONTROL_VIEWS:
+            return None
+
+        window = settings.ADMISSION_CONTROL_TIMEOUT
+        slot = int(time() // window)
+        key = self.slot_key(slot)
+        cache.add(key, 0, 2 * window)
+        try:
+            in_flight = cache.incr(key)
+        except ValueError:
+            return None
+        in_flight += cache.get(self.slot_key(slot - 1), 0)
+        if in_flight > settings.ADMISSION_CONTROL_LIMIT:
+            self.release(key)
+            return self.overloaded()
+        request._admission_key = key
+        return None
+
+    def overloaded(self):
+        response = JsonResponse(
+            {'detail': 'Servidor sobrecarregado, tente novamente.'},
+            status=503,
+        )
+        response.headers['Retry-After'] = str(
+            settings.ADMISSION_CONTROL_RETRY_AFTER
+        )
+        return response
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0005_change"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("database", models.CharField(max_length=50)),
+                ("view", models.CharField(blank=True, max_length=200)),
+                ("sql", models.TextField()),
+                ("params", models.TextField(blank=True)),
+                ("duration", models.FloatField()),
+                ("stack", models.TextField(blank=True)),
+                ("plan", models.TextField(blank=True)),
+                ("captured_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-id"],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_feed(apps, schema_editor):
+    News = apps.get_model("news", "News")
+    FeedEntry = apps.get_model("news", "FeedEntry")
+    queryset = News.objects.select_related("author").prefetch_related(
+        "categories"
+    )
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(
+                news_id=news.id,
+                title=news.title,
+                created_at=news.created_at,
+                image=news.image.name or None,
+                author_name=news.author.name,
+                category_names=[c.name for c in news.categories.all()],
+            )
+            for news in queryset.iterator(chunk_size=1000)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0007_task"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedEntry",
+            fields=[
+                (
+                    "news",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="feed_entry",
+                        serialize=False,
+                        to="news.news",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200)),
+                ("created_at", models.DateField()),
+                (
+                    "image",
+                    models.ImageField(blank=True, null=True, upload_to="img/"),
+                ),
+                ("author_name", models.CharField(max_length=200)),
+                ("category_names", models.JSONField(default=list)),
+            ],
+            options={
+                "ordering": ["news_id"],
+            },
+        ),
+        migrations.RunPython(populate_feed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0008_feedentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedNews",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                (
+                    "news",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_links",
+                        to="news.news",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="news.news",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["news", "rank"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="relatednews",
+            constraint=models.UniqueConstraint(
+                fields=("news", "rank"), name="unique_related_news_rank"
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0009_relatednews"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ViewCount",
+            fields=[
+                (
+                    "news",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="view_count",
+                        serialize=False,
+                        to="news.news",
+                    ),
+                ),
+                ("count", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
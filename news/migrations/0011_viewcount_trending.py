@@ -0,0 +1,17 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0010_viewcount"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="viewcount",
+            name="trending",
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0012_newssignature"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="category",
+            name="name",
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="name",
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0014_upload"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="feedentry",
+            name="image_color",
+            field=models.CharField(blank=True, default="", max_length=7),
+        ),
+        migrations.AddField(
+            model_name="feedentry",
+            name="image_height",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="feedentry",
+            name="image_width",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="news",
+            name="image_bytes",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="news",
+            name="image_color",
+            field=models.CharField(blank=True, default="", max_length=7),
+        ),
+        migrations.AddField(
+            model_name="news",
+            name="image_height",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="news",
+            name="image_width",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
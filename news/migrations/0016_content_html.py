@@ -0,0 +1,40 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:43
+
+from django.db import migrations, models
+
+
+def render_existing(apps, schema_editor):
+    from news.markup import RENDERER_VERSION, render
+
+    News = apps.get_model("news", "News")
+    batch = []
+    for news in News.objects.only("id", "content").iterator(chunk_size=500):
+        news.content_html = render(news.content)
+        news.content_version = RENDERER_VERSION
+        batch.append(news)
+        if len(batch) == 500:
+            News.objects.bulk_update(
+                batch, ["content_html", "content_version"]
+            )
+            batch = []
+    News.objects.bulk_update(batch, ["content_html", "content_version"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0015_image_metadata"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="news",
+            name="content_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="news",
+            name="content_version",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(render_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0016_content_html"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="news",
+            name="created_at",
+            field=models.DateField(db_index=True),
+        ),
+        migrations.CreateModel(
+            name="ArchivedNews",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("title", models.CharField(max_length=200)),
+                ("content", models.TextField()),
+                ("content_html", models.TextField(blank=True, default="")),
+                (
+                    "content_version",
+                    models.PositiveSmallIntegerField(default=0),
+                ),
+                ("created_at", models.DateField(db_index=True)),
+                (
+                    "image",
+                    models.ImageField(blank=True, null=True, upload_to="img/"),
+                ),
+                (
+                    "image_width",
+                    models.PositiveIntegerField(blank=True, null=True),
+                ),
+                (
+                    "image_height",
+                    models.PositiveIntegerField(blank=True, null=True),
+                ),
+                (
+                    "image_bytes",
+                    models.PositiveBigIntegerField(blank=True, null=True),
+                ),
+                (
+                    "image_color",
+                    models.CharField(blank=True, default="", max_length=7),
+                ),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_news",
+                        to="news.user",
+                    ),
+                ),
+                (
+                    "categories",
+                    models.ManyToManyField(
+                        related_name="archived_news", to="news.category"
+                    ),
+                ),
+            ],
+        ),
+    ]
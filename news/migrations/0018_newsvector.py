@@ -0,0 +1,42 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0017_archivednews"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Checkpoint",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        max_length=50, primary_key=True, serialize=False
+                    ),
+                ),
+                ("seq", models.BigIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="NewsVector",
+            fields=[
+                (
+                    "news",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="vector",
+                        serialize=False,
+                        to="news.news",
+                    ),
+                ),
+                ("features", models.BinaryField()),
+                ("weights", models.BinaryField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0018_newsvector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MemoryReport",
+            fields=[
+                (
+                    "worker",
+                    models.CharField(
+                        max_length=100, primary_key=True, serialize=False
+                    ),
+                ),
+                ("requests", models.PositiveIntegerField()),
+                ("traced_memory", models.BigIntegerField()),
+                ("top", models.JSONField()),
+                ("reported_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
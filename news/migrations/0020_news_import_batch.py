@@ -0,0 +1,19 @@
+# Generated by Django 4.2.3 on 2026-10-19 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0019_memoryreport"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="news",
+            name="import_batch",
+            field=models.UUIDField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.3 on 2026-10-19 20:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0020_news_import_batch"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="change",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("insert", "insert"),
+                    ("update", "update"),
+                    ("delete", "delete"),
+                    ("archive", "archive"),
+                ],
+                max_length=10,
+            ),
+        ),
+    ]
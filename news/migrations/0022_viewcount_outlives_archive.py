@@ -0,0 +1,25 @@
+# Generated by Django 4.2.3 on 2026-10-19 20:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0021_change_archive_action"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="viewcount",
+            name="news",
+            field=models.OneToOneField(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                primary_key=True,
+                related_name="view_count",
+                serialize=False,
+                to="news.news",
+            ),
+        ),
+    ]
@@ -1,17 +1,28 @@
+import uuid
+from datetime import timedelta
+
 from django import forms
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from news.validators import validate_title
+from news.widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 
 class Category(models.Model):
-    name = models.CharField(max_length=200, blank=False, null=False)
+    # Indexed for the prefix search of the autocomplete endpoint.
+    name = models.CharField(
+        max_length=200, blank=False, null=False, db_index=True
+    )
 
     def __str__(self):
         return self.name
 
 
 class User(models.Model):
-    name = models.CharField(max_length=200, blank=False, null=False)
+    name = models.CharField(
+        max_length=200, blank=False, null=False, db_index=True
+    )
     role = models.CharField(max_length=200, blank=False, null=False)
     email = models.EmailField(max_length=200, blank=False, null=False)
     password = models.CharField(max_length=200, blank=False, null=False)
@@ -28,15 +39,311 @@ class News(models.Model):
         validators=[validate_title]
         )
     content = models.TextField(blank=False, null=False)
+    # `content` is Markdown; its HTML is rendered on save (news.markup).
+    content_html = models.TextField(blank=True, default='', editable=False)
+    content_version = models.PositiveSmallIntegerField(
+        default=0, editable=False
+    )
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     categories = models.ManyToManyField(Category)
+    # Indexed so the archiver finds old rows without a full scan.
+    created_at = models.DateField(db_index=True)
+    image = models.ImageField(upload_to='img/', blank=True, null=True)
+    # Filled in by the image task so pages never open the file to size it.
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    image_bytes = models.PositiveBigIntegerField(null=True, blank=True)
+    image_color = models.CharField(max_length=7, blank=True, default='')
+    # Tags the rows of one bulk insert so MySQL can read their ids back.
+    import_batch = models.UUIDField(
+        null=True, blank=True, editable=False, db_index=True
+    )
+
+    def __str__(self):
+        return self.title
+
+
+class Change(models.Model):
+    INSERT = 'insert'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    # Moved to ArchivedNews: gone from the lists, still served by id.
+    ARCHIVE = 'archive'
+    ACTION_CHOICES = [
+        (INSERT, 'insert'),
+        (UPDATE, 'update'),
+        (DELETE, 'delete'),
+        (ARCHIVE, 'archive'),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=50, blank=False, null=False)
+    object_id = models.BigIntegerField(blank=False, null=False)
+    action = models.CharField(
+        max_length=10,
+        choices=ACTION_CHOICES,
+        blank=False,
+        null=False
+        )
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['seq']
+
+    def __str__(self):
+        return f'{self.seq} {self.action} {self.model}:{self.object_id}'
+
+    @classmethod
+    def settled(cls):
+        """Changes old enough that every lower seq has committed.
+
+        Seqs are allocated at insert but become visible at commit, so a
+        reader following ``seq > cursor`` would skip a lower seq that
+        commits after a higher one. Entries younger than
+        CHANGES_SETTLE_SECONDS are held back until that window passes."""
+        horizon = timezone.now() - timedelta(
+            seconds=settings.CHANGES_SETTLE_SECONDS
+        )
+        return cls.objects.filter(changed_at__lte=horizon)
+
+
+class SlowQuery(models.Model):
+    database = models.CharField(max_length=50)
+    view = models.CharField(max_length=200, blank=True)
+    sql = models.TextField()
+    params = models.TextField(blank=True)
+    duration = models.FloatField()
+    stack = models.TextField(blank=True)
+    plan = models.TextField(blank=True)
+    captured_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-id']
+
+    def __str__(self):
+        return f'{self.duration * 1000:.1f}ms {self.sql[:80]}'
+
+
+class Task(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'queued'),
+        (RUNNING, 'running'),
+        (DONE, 'done'),
+        (FAILED, 'failed'),
+    ]
+
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list)
+    priority = models.IntegerField(default=0)
+    dedup_key = models.CharField(max_length=200, blank=True, null=True)
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=QUEUED
+        )
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'priority', 'run_after']),
+            models.Index(fields=['dedup_key', 'status']),
+        ]
+
+    def __str__(self):
+        return f'{self.name}{tuple(self.args)} [{self.status}]'
+
+
+class FeedEntry(models.Model):
+    news = models.OneToOneField(
+        News,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry'
+        )
+    title = models.CharField(max_length=200)
     created_at = models.DateField()
     image = models.ImageField(upload_to='img/', blank=True, null=True)
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    image_color = models.CharField(max_length=7, blank=True, default='')
+    author_name = models.CharField(max_length=200)
+    category_names = models.JSONField(default=list)
+
+    class Meta:
+        ordering = ['news_id']
+
+    def __str__(self):
+        return self.title
+
+
+class NewsVector(models.Model):
+    """Hashed term frequencies of a News (see news.related), kept so a
+    refresh only reads the text of the articles that changed."""
+
+    news = models.OneToOneField(
+        News,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='vector'
+        )
+    # uint32 feature indices and their float32 log(1 + tf) weights.
+    features = models.BinaryField()
+    weights = models.BinaryField()
+
+    def __str__(self):
+        return f'{self.news_id}: {len(self.features) // 4} termos'
+
+
+class Checkpoint(models.Model):
+    """Last change feed seq a background job has processed."""
+
+    name = models.CharField(max_length=50, primary_key=True)
+    seq = models.BigIntegerField()
+
+    def __str__(self):
+        return f'{self.name}: {self.seq}'
+
+
+class MemoryReport(models.Model):
+    """Latest tracemalloc report of one worker, keyed by host and pid."""
+
+    worker = models.CharField(max_length=100, primary_key=True)
+    requests = models.PositiveIntegerField()
+    traced_memory = models.BigIntegerField()
+    top = models.JSONField()
+    reported_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.worker
+
+
+class RelatedNews(models.Model):
+    news = models.ForeignKey(
+        News,
+        on_delete=models.CASCADE,
+        related_name='related_links'
+        )
+    related = models.ForeignKey(
+        News,
+        on_delete=models.CASCADE,
+        related_name='+'
+        )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['news', 'rank']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['news', 'rank'], name='unique_related_news_rank'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.news_id} -> {self.related_id} ({self.score:.3f})'
+
+
+class ViewCount(models.Model):
+    # No constraint, so the row outlives the News when it is archived;
+    # news.signals removes it when an article is really deleted.
+    news = models.OneToOneField(
+        News,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        primary_key=True,
+        related_name='view_count'
+        )
+    count = models.PositiveBigIntegerField(default=0)
+    trending = models.FloatField(blank=True, null=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.news_id}: {self.count}'
+
+
+class NewsSignature(models.Model):
+    news = models.OneToOneField(
+        News,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='signature'
+        )
+    minhash = models.BinaryField()
+
+    def __str__(self):
+        return f'{self.news_id}: {bytes(self.minhash[:8]).hex()}...'
+
+
+class NewsBand(models.Model):
+    news = models.ForeignKey(
+        News,
+        on_delete=models.CASCADE,
+        related_name='bands'
+        )
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=['band', 'bucket'])]
+
+    def __str__(self):
+        return f'{self.news_id}: {self.band}/{self.bucket}'
+
+
+class ArchivedNews(models.Model):
+    """News older than ARCHIVE_AFTER_DAYS, moved out of the hot table by
+    news.archive; ids are kept, so links and API lookups still resolve."""
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    content = models.TextField()
+    content_html = models.TextField(blank=True, default='')
+    content_version = models.PositiveSmallIntegerField(default=0)
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_news'
+        )
+    categories = models.ManyToManyField(
+        Category,
+        related_name='archived_news'
+        )
+    created_at = models.DateField(db_index=True)
+    image = models.ImageField(upload_to='img/', blank=True, null=True)
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    image_bytes = models.PositiveBigIntegerField(null=True, blank=True)
+    image_color = models.CharField(max_length=7, blank=True, default='')
+    archived_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.title
 
 
+class Upload(models.Model):
+    """An image sent in chunks; its bytes live in UPLOAD_DIR until they
+    are attached to a News."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    filename = models.CharField(max_length=200)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.id}: {self.received}/{self.size}'
+
+
 class CategoryForm(forms.ModelForm):
     class Meta:
         model = Category
@@ -54,3 +361,21 @@ class NewsForm(forms.ModelForm):
             'created_at',
             'image'
             ]
+        widgets = {
+            'author': AutocompleteSelect('user-autocomplete'),
+            'categories': AutocompleteSelectMultiple('category-autocomplete'),
+        }
+
+    def clean(self):
+        # Imported here: news.duplicates depends on this module.
+        from news.duplicates import duplicate_error
+
+        cleaned_data = super().clean()
+        error = duplicate_error(
+            cleaned_data.get('title', ''),
+            cleaned_data.get('content', ''),
+            self.instance.pk,
+        )
+        if error:
+            raise forms.ValidationError(error)
+        return cleaned_data
@@ -0,0 +1,70 @@
+import codecs
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.settings import api_settings
+from news.renderers import FastJSONRenderer, MessagePackRenderer
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+try:
+    import msgpack
+except ModuleNotFoundError:
+    msgpack = None
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+def binary_to_upload(field, content):
+    try:
+        extension = Image.open(BytesIO(content)).format.lower()
+    except (OSError, AttributeError):
+        extension = 'bin'
+    return SimpleUploadedFile(f'{field}.{extension}', content)
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            data = msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
+
+        # Binary values are file uploads, e.g. the raw bytes of News.image.
+        if isinstance(data, dict):
+            data = {
+                key: binary_to_upload(key, value)
+                if isinstance(value, bytes) else value
+                for key, value in data.items()
+            }
+        return data
+
+
+def api_parser_classes():
+    parser_classes = list(api_settings.DEFAULT_PARSER_CLASSES)
+    if msgpack is not None:
+        parser_classes.append(MessagePackParser)
+    return parser_classes
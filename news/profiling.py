@@ -0,0 +1,108 @@
+import random
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+
+TOKEN_SALT = 'news.profiling'
+
+
+class Sampler:
+    """Samples one thread's stack at a fixed interval and keeps the
+    counts in the folded format read by flamegraph.pl and speedscope."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        return self.stacks
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[fold(frame)] += 1
+
+
+def fold(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{frame.f_globals.get("__name__")}:{code.co_name}')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def make_token():
+    return signing.dumps('profile', salt=TOKEN_SALT)
+
+
+def has_valid_token(request):
+    token = request.GET.get('profile')
+    if not token:
+        return False
+    try:
+        signing.loads(
+            token, salt=TOKEN_SALT, max_age=settings.PROFILING_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def is_requested(request):
+    if request.headers.get('X-Profile') == '1':
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            return True
+    return has_valid_token(request)
+
+
+def is_sampled(request):
+    match = request.resolver_match
+    return (
+        match is not None
+        and match.url_name in settings.PROFILING_SAMPLE_VIEWS
+        and random.random() < settings.PROFILING_SAMPLE_RATE
+    )
+
+
+def profiles_dir():
+    directory = Path(settings.PROFILING_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def save_profile(stacks, view):
+    name = '{}-{}-{}.folded'.format(
+        datetime.now().strftime('%Y%m%d%H%M%S'),
+        view.replace(':', '_'),
+        uuid.uuid4().hex[:8],
+    )
+    profiles_dir().joinpath(name).write_text(''.join(
+        f'{stack} {count}\n' for stack, count in stacks.most_common()
+    ))
+
+    for stale in list_profiles()[settings.PROFILING_MAX_FILES:]:
+        stale.unlink(missing_ok=True)
+    return name
+
+
+def list_profiles():
+    # Names start with a timestamp, so this is newest first.
+    return sorted(profiles_dir().glob('*.folded'), reverse=True)
@@ -0,0 +1,258 @@
+import re
+import unicodedata
+import zlib
+from itertools import islice
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from news.caching import bump_cache_version
+from news.models import Change, Checkpoint, News, NewsVector, RelatedNews
+from news.upsert import upsert
+
+CHECKPOINT = 'related-news'
+TOKEN_RE = re.compile(r'[a-z0-9]{3,}')
+STOPWORDS = frozenset(
+    'que para com uma por como mais mas foi sao seu sua ele ela dos das '
+    'nos nas entre sobre tem ser esta este essa esse isso pelo pela '
+    'apos quando tambem ja ao aos ou ha nao muito'.split()
+)
+
+
+def fold(text):
+    """Lowercase `text` and strip its accents: 'Ação' becomes 'acao'."""
+    folded = unicodedata.normalize('NFKD', text.lower())
+    return folded.encode('ascii', 'ignore').decode()
+
+
+def tokens(text):
+    return [
+        token for token in TOKEN_RE.findall(fold(text))
+        if token not in STOPWORDS
+    ]
+
+
+def feature_indices(news, features):
+    # The title counts twice: it summarizes the article.
+    words = tokens(news.title) * 2 + tokens(news.content)
+    return [zlib.crc32(word.encode()) % features for word in words]
+
+
+def term_vector(news, features):
+    indices, counts = np.unique(
+        feature_indices(news, features), return_counts=True
+    )
+    return NewsVector(
+        news_id=news.id,
+        features=indices.astype(np.uint32).tobytes(),
+        weights=np.log1p(counts).astype(np.float32).tobytes(),
+    )
+
+
+def vectorize(news_ids=None, chunk_size=500):
+    """Store the term vectors of the given News, or of all of them; this is
+    the only place article text is read."""
+    queryset = News.objects.only('id', 'title', 'content').order_by('id')
+    if news_ids is not None:
+        queryset = queryset.filter(id__in=news_ids)
+    features = settings.RELATED_NEWS_FEATURES
+    count = 0
+    rows = queryset.iterator(chunk_size)
+    while batch := list(islice(rows, chunk_size)):
+        upsert(
+            NewsVector,
+            [term_vector(news, features) for news in batch],
+            update_fields=['features', 'weights'],
+            unique_fields=['news'],
+        )
+        count += len(batch)
+    return count
+
+
+def category_matrix(rows):
+    memberships = [
+        (rows[news_id], category_id)
+        for news_id, category_id in News.categories.through.objects
+        .values_list('news_id', 'category_id').iterator()
+        if news_id in rows
+    ]
+    columns = {
+        category_id: column
+        for column, category_id in enumerate(
+            sorted({category_id for _, category_id in memberships})
+        )
+    }
+    categories = np.zeros((len(rows), len(columns)), dtype=np.float32)
+    for row, category_id in memberships:
+        categories[row, columns[category_id]] = 1
+    return normalize(categories)
+
+
+class Corpus:
+    """The stored term vectors of every News as sparse rows weighted by
+    TF-IDF, plus category incidence. Scores are computed a block of
+    articles at a time, so memory grows with the number of stored terms,
+    not with articles times RELATED_NEWS_FEATURES."""
+
+    block_size = 2048
+
+    def __init__(self):
+        self.features = settings.RELATED_NEWS_FEATURES
+        ids, indices, weights = [], [], []
+        stored = NewsVector.objects.order_by('news_id').values_list(
+            'news_id', 'features', 'weights'
+        )
+        for news_id, features, weights_ in stored.iterator():
+            ids.append(news_id)
+            indices.append(np.frombuffer(bytes(features), dtype=np.uint32))
+            weights.append(np.frombuffer(bytes(weights_), dtype=np.float32))
+        self.ids = np.array(ids, dtype=np.int64)
+        self.rows = {news_id: row for row, news_id in enumerate(ids)}
+        lengths = np.array([len(row) for row in indices], dtype=np.int64)
+        self.indptr = np.concatenate([[0], np.cumsum(lengths)])
+        self.indices = np.concatenate(indices or [np.zeros(0, np.uint32)])
+        self.row_of = np.repeat(np.arange(len(ids)), lengths)
+        self.data = self.tf_idf(np.concatenate(
+            weights or [np.zeros(0, np.float32)]
+        ))
+        self.categories = category_matrix(self.rows)
+
+    def tf_idf(self, data):
+        count = len(self.ids)
+        document_frequency = np.bincount(self.indices, minlength=self.features)
+        idf = np.log((1 + count) / (1 + document_frequency)) + 1
+        data = data * idf[self.indices]
+        norms = np.sqrt(
+            np.bincount(self.row_of, weights=data ** 2, minlength=count)
+        )
+        return (data / np.where(norms == 0, 1, norms)[self.row_of]).astype(
+            np.float32
+        )
+
+    def dense(self, rows):
+        matrix = np.zeros((len(rows), self.features), dtype=np.float32)
+        for position, row in enumerate(rows):
+            span = slice(self.indptr[row], self.indptr[row + 1])
+            matrix[position, self.indices[span]] = self.data[span]
+        return matrix
+
+    def dense_range(self, start, stop):
+        span = slice(self.indptr[start], self.indptr[stop])
+        matrix = np.zeros((stop - start, self.features), dtype=np.float32)
+        matrix[self.row_of[span] - start, self.indices[span]] = self.data[span]
+        return matrix
+
+    def similarity(self, rows):
+        weight = settings.RELATED_NEWS_CATEGORY_WEIGHT
+        queries = self.dense(rows)
+        scores = np.empty((len(rows), len(self.ids)), dtype=np.float32)
+        for start in range(0, len(self.ids), self.block_size):
+            stop = min(start + self.block_size, len(self.ids))
+            scores[:, start:stop] = queries @ self.dense_range(start, stop).T
+        scores *= 1 - weight
+        scores += weight * (self.categories[rows] @ self.categories.T)
+        scores[np.arange(len(rows)), rows] = -1
+        return scores
+
+    def neighbours(self, rows, count):
+        scores = self.similarity(rows)
+        count = min(count, max(len(self.ids) - 1, 0))
+        if count == 0:
+            return [[] for _ in rows]
+        top = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+        result = []
+        for row_scores, candidates in zip(scores, top):
+            ordered = candidates[np.argsort(-row_scores[candidates])]
+            result.append([
+                (int(self.ids[column]), float(row_scores[column]))
+                for column in ordered
+                if row_scores[column] > 0
+            ])
+        return result
+
+
+def normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def store(corpus, news_ids, chunk_size=64):
+    news_ids = [news_id for news_id in news_ids if news_id in corpus.rows]
+    count = settings.RELATED_NEWS_COUNT
+    with transaction.atomic():
+        for start in range(0, len(news_ids), chunk_size):
+            chunk = news_ids[start:start + chunk_size]
+            rows = np.array([corpus.rows[news_id] for news_id in chunk])
+            RelatedNews.objects.filter(news_id__in=chunk).delete()
+            RelatedNews.objects.bulk_create(
+                RelatedNews(
+                    news_id=news_id,
+                    related_id=related_id,
+                    rank=rank,
+                    score=score,
+                )
+                for news_id, neighbours in zip(
+                    chunk, corpus.neighbours(rows, count)
+                )
+                for rank, (related_id, score) in enumerate(neighbours)
+            )
+    bump_cache_version()
+    return len(news_ids)
+
+
+def build_related():
+    vectorize()
+    corpus = Corpus()
+    with transaction.atomic():
+        RelatedNews.objects.all().delete()
+        return store(corpus, corpus.ids.tolist())
+
+
+def refresh_related(news_ids):
+    """Re-vectorize the given articles, then recompute their neighbours,
+    those of the articles that list them and those of their new
+    neighbours, scoring against the stored vectors of everything else.
+    Other lists may drift slightly as IDF weights move; `build_related`
+    recomputes everything."""
+    vectorize(news_ids)
+    corpus = Corpus()
+    changed = [news_id for news_id in news_ids if news_id in corpus.rows]
+    affected = set(news_ids)
+    affected.update(
+        RelatedNews.objects.filter(related_id__in=news_ids).values_list(
+            'news_id', flat=True
+        )
+    )
+    if changed:
+        rows = np.array([corpus.rows[news_id] for news_id in changed])
+        count = settings.RELATED_NEWS_COUNT
+        for neighbours in corpus.neighbours(rows, count):
+            affected.update(related_id for related_id, _ in neighbours)
+    return store(corpus, sorted(affected))
+
+
+def refresh_from_changes():
+    """Refresh the articles changed since the last run, read from the
+    change feed; without a checkpoint the whole index is rebuilt."""
+    checkpoint = Checkpoint.objects.filter(name=CHECKPOINT).first()
+    last = Change.settled().aggregate(last=Max('seq'))['last'] or 0
+    if checkpoint is None:
+        count = build_related()
+    else:
+        news_ids = Change.objects.filter(
+            model='news', seq__gt=checkpoint.seq, seq__lte=last
+        ).values_list('object_id', flat=True)
+        count = refresh_related(set(news_ids))
+    Checkpoint.objects.update_or_create(
+        name=CHECKPOINT, defaults={'seq': last}
+    )
+    return count
+
+
+def has_pending_changes():
+    """Whether news changes past the checkpoint are left, i.e. edits that
+    were not settled yet when refresh_from_changes ran."""
+    checkpoint = Checkpoint.objects.filter(name=CHECKPOINT).first()
+    seq = checkpoint.seq if checkpoint is not None else 0
+    return Change.objects.filter(model='news', seq__gt=seq).exists()
@@ -0,0 +1,92 @@
+from rest_framework import serializers
+from rest_framework.utils import encoders
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+try:
+    import msgpack
+except ModuleNotFoundError:
+    msgpack = None
+
+
+# Fields whose values may be floats; a method field may return anything.
+FLOAT_FIELDS = (serializers.FloatField, serializers.SerializerMethodField)
+
+
+def may_hold_floats(data):
+    serializer = getattr(data, 'serializer', None)
+    serializer = getattr(serializer, 'child', serializer)
+    fields = getattr(serializer, 'fields', {})
+    return any(isinstance(field, FLOAT_FIELDS) for field in fields.values())
+
+
+class FastJSONRenderer(JSONRenderer):
+    # Dates, decimals and lazy strings go through DRF's encoder so the
+    # output matches JSONRenderer byte for byte. Floats are the exception:
+    # orjson spells those below 1e-4 or from 1e16 up differently (0.00001
+    # for 1e-05, 1e16 for 1e+16) and writes NaN as null. Serializer output
+    # with float fields is therefore left to JSONRenderer, decided from the
+    # fields rather than the values; floats in hand-built data keep the
+    # orjson spelling, which parses to the same numbers.
+    options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if orjson is not None else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context)
+            or may_hold_floats(data)
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+
+        # Keep the output a strict JavaScript subset, as JSONRenderer does.
+        return (
+            ret.replace('\u2028'.encode(), b'\\u2028')
+            .replace('\u2029'.encode(), b'\\u2029')
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder_class = encoders.JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Dates, decimals and UUIDs become the same strings JSON clients see.
+        return msgpack.packb(
+            data, default=self.encoder_class().default, use_bin_type=True
+        )
+
+
+def api_renderer_classes():
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES)
+    if msgpack is not None:
+        renderer_classes.append(MessagePackRenderer)
+    return renderer_classes
@@ -0,0 +1,52 @@
+from io import BytesIO
+from timeit import timeit
+
+from news.parsers import FastJSONParser
+from news.renderers import FastJSONRenderer
+from news.scripts.data import news
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+
+def build_payload(size):
+    payload = []
+    for index in range(size):
+        new = news[index % len(news)]
+        payload.append({
+            "id": index + 1,
+            "title": new["title"],
+            "content": new["content"],
+            "author": index % 10 + 1,
+            "categories": [index % 8 + 1],
+            "created_at": new["created_at"],
+            "image": f"http://testserver/img/{new['image']}",
+        })
+    return payload
+
+
+def throughput(func, size, repeat):
+    return size * repeat / timeit(func, number=repeat)
+
+
+def run(*args):
+    size = int(args[0]) if args else 1000
+    repeat = int(args[1]) if len(args) > 1 else 50
+    payload = build_payload(size)
+    body = JSONRenderer().render(payload)
+
+    print(f"Payload: {size} news, {len(body)} bytes, {repeat} repetitions")
+    for label, renderer in (
+        ("JSONRenderer", JSONRenderer()),
+        ("FastJSONRenderer", FastJSONRenderer()),
+    ):
+        rate = throughput(lambda: renderer.render(payload), size, repeat)
+        print(f"{label:>18}: {rate:,.0f} news/s rendered")
+
+    for label, parser in (
+        ("JSONParser", JSONParser()),
+        ("FastJSONParser", FastJSONParser()),
+    ):
+        rate = throughput(
+            lambda: parser.parse(BytesIO(body)), size, repeat
+        )
+        print(f"{label:>18}: {rate:,.0f} news/s parsed")
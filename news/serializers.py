@@ -1,21 +1,50 @@
+from pathlib import Path
+
+from django.conf import settings
 from rest_framework import serializers
-from .models import News, User, Category
+from .models import (
+    Change,
+    News,
+    RelatedNews,
+    User,
+    Category,
+    Upload,
+    ViewCount,
+)
+from .duplicates import duplicate_error
+from .timing import timed
+from .trending import decayed
+from .uploads import EXTENSIONS
+
+
+class TimedSerializerMixin:
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
+
 
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    pass
 
-class CategorySerializer(serializers.ModelSerializer):
+
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
+        list_serializer_class = TimedListSerializer
         model = Category
         fields = ['id', 'name']
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
+        list_serializer_class = TimedListSerializer
         model = User
         fields = ['id', 'name', 'role', 'email']
 
 
-class NewsSerializer(serializers.ModelSerializer):
+class NewsSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
+        list_serializer_class = TimedListSerializer
         model = News
         fields = [
             'id',
@@ -26,3 +55,76 @@ class NewsSerializer(serializers.ModelSerializer):
             'created_at',
             'image'
         ]
+
+    def validate(self, attrs):
+        instance = self.instance
+        error = duplicate_error(
+            attrs.get('title', getattr(instance, 'title', '')),
+            attrs.get('content', getattr(instance, 'content', '')),
+            getattr(instance, 'pk', None),
+        )
+        if error:
+            raise serializers.ValidationError(error)
+        return attrs
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Change
+        fields = ['seq', 'model', 'object_id', 'action', 'changed_at']
+
+
+class RelatedNewsSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='related.id')
+    title = serializers.CharField(source='related.title')
+    created_at = serializers.DateField(source='related.created_at')
+
+    class Meta:
+        model = RelatedNews
+        fields = ['id', 'title', 'created_at', 'score']
+
+
+class ViewCountSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ViewCount
+        fields = ['news', 'count', 'updated_at']
+
+
+class TrendingNewsSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='news.id')
+    title = serializers.CharField(source='news.title')
+    created_at = serializers.DateField(source='news.created_at')
+    score = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ViewCount
+        fields = ['id', 'title', 'created_at', 'score']
+
+    def get_score(self, view_count):
+        return decayed(view_count.trending, self.context.get('now'))
+
+
+class UploadSerializer(serializers.ModelSerializer):
+    offset = serializers.IntegerField(source='received', read_only=True)
+
+    class Meta:
+        model = Upload
+        fields = ['id', 'filename', 'size', 'offset', 'completed_at']
+        read_only_fields = ['completed_at']
+
+    def validate_filename(self, filename):
+        filename = Path(filename).name
+        if Path(filename).suffix.lower() not in EXTENSIONS:
+            raise serializers.ValidationError('Formato de imagem inválido.')
+        return filename
+
+    def validate_size(self, size):
+        if not 0 < size <= settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'Envie até {settings.UPLOAD_MAX_SIZE} bytes.'
+            )
+        return size
+
+
+class AttachUploadSerializer(serializers.Serializer):
+    news = serializers.PrimaryKeyRelatedField(queryset=News.objects.all())
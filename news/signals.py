@@ -0,0 +1,205 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from news.archive import archiving
+from news.caching import bump_cache_version
+from news.duplicates import minhash, save_signatures
+from news.feed import refresh_feed
+from news.markup import render_into
+from news.models import (
+    ArchivedNews,
+    Category,
+    Change,
+    FeedEntry,
+    News,
+    User,
+    ViewCount,
+)
+from news.suggest import index as suggestions
+from news.tasks import enqueue, queue_related_refresh
+
+
+@receiver(pre_save, sender=News)
+def render_content(sender, instance, **kwargs):
+    # Also for raw saves: fixtures carry Markdown, not its HTML.
+    render_into(instance)
+
+
+def record_change(model_name, object_id, action):
+    Change.objects.create(model=model_name, object_id=object_id, action=action)
+    bump_cache_version()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=News)
+def track_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    action = Change.INSERT if created else Change.UPDATE
+    record_change(sender._meta.model_name, instance.pk, action)
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=News)
+def track_delete(sender, instance, **kwargs):
+    archived = sender is News and archiving.get()
+    action = Change.ARCHIVE if archived else Change.DELETE
+    record_change(sender._meta.model_name, instance.pk, action)
+
+
+@receiver(post_delete, sender=News)
+@receiver(post_delete, sender=ArchivedNews)
+def delete_view_count(sender, instance, **kwargs):
+    # ViewCount has no foreign key, so archiving leaves it in place.
+    if sender is News and archiving.get():
+        return
+    ViewCount.objects.filter(news_id=instance.pk).delete()
+
+
+@receiver(m2m_changed, sender=News.categories.through)
+def track_news_categories(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        record_change('news', instance.pk, Change.UPDATE)
+        return
+    # Changing a category's news set touches the other side of the relation.
+    # post_clear carries no pk_set, so those rows are captured in pre_clear.
+    record_news_updates(pk_set or getattr(instance, '_cleared_news_ids', []))
+
+
+def record_news_updates(news_ids):
+    Change.objects.bulk_create(
+        Change(model='news', object_id=news_id, action=Change.UPDATE)
+        for news_id in sorted(news_ids)
+    )
+    bump_cache_version()
+
+
+@receiver(m2m_changed, sender=News.categories.through)
+def remember_cleared_news(sender, instance, action, reverse, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._cleared_news_ids = list(
+            instance.news_set.values_list('id', flat=True)
+        )
+
+
+def image_changed(instance, update_fields):
+    if instance.pk is None:
+        return True
+    if update_fields is not None and 'image' not in update_fields:
+        return False
+    stored = News.objects.filter(pk=instance.pk).values_list(
+        'image', flat=True
+    ).first()
+    return stored != instance.image.name
+
+
+@receiver(pre_save, sender=News)
+def detect_image_change(sender, instance, raw=False, update_fields=None,
+                        **kwargs):
+    # Only a new file, or one never measured, is worth processing again.
+    instance._process_image = (
+        not raw
+        and bool(instance.image)
+        and (
+            instance.image_width is None
+            or image_changed(instance, update_fields)
+        )
+    )
+
+
+@receiver(post_save, sender=News)
+def queue_image_processing(sender, instance, raw=False, **kwargs):
+    if raw or not getattr(instance, '_process_image', False):
+        return
+    enqueue(
+        'process_news_image',
+        instance.pk,
+        dedup_key=f'news-image:{instance.pk}',
+    )
+
+
+@receiver(post_save, sender=News)
+def refresh_news_feed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_feed([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def refresh_author_feed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        FeedEntry.objects.filter(news__author=instance).update(
+            author_name=instance.name
+        )
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_feed(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        refresh_feed(instance.news_set.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_news(sender, instance, **kwargs):
+    # The through rows are gone by post_delete, without m2m_changed.
+    instance._feed_news_ids = list(
+        instance.news_set.values_list('id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Category)
+def refresh_deleted_category_feed(sender, instance, **kwargs):
+    news_ids = getattr(instance, '_feed_news_ids', [])
+    record_news_updates(news_ids)
+    refresh_feed(news_ids)
+
+
+@receiver(m2m_changed, sender=News.categories.through)
+def refresh_categories_feed(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        refresh_feed([instance.pk])
+    else:
+        refresh_feed(pk_set or getattr(instance, '_cleared_news_ids', []))
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+def refresh_related_on_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        queue_related_refresh()
+
+
+@receiver(m2m_changed, sender=News.categories.through)
+def refresh_related_on_categories(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        queue_related_refresh()
+
+
+@receiver(post_save, sender=News)
+def index_signature(sender, instance, raw=False, **kwargs):
+    if not raw:
+        save_signatures(
+            {instance.pk: minhash(instance.title, instance.content)}
+        )
+
+
+@receiver(post_save, sender=News)
+def index_title(sender, instance, raw=False, **kwargs):
+    if not raw:
+        suggestions.put(instance.pk, instance.title)
+
+
+@receiver(post_delete, sender=News)
+def unindex_title(sender, instance, **kwargs):
+    suggestions.discard(instance.pk)
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import DatabaseError, connections
+from news.models import SlowQuery
+
+
+def explain(capture):
+    if not capture['sql'].lstrip().upper().startswith('SELECT'):
+        return ''
+    connection = connections[capture['database']]
+    prefix = connection.ops.explain_query_prefix()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {capture["sql"]}', capture['params'])
+            return '\n'.join(
+                '\t'.join(str(column) for column in row)
+                for row in cursor.fetchall()
+            )
+    except DatabaseError as exc:
+        return f'EXPLAIN falhou: {exc}'
+
+
+def persist(captures, view=''):
+    SlowQuery.objects.bulk_create(
+        SlowQuery(
+            database=capture['database'],
+            view=view,
+            sql=capture['sql'],
+            params=repr(capture['params']),
+            duration=capture['duration'],
+            stack='\n'.join(capture['stack']),
+            plan=explain(capture) if settings.SLOW_QUERY_EXPLAIN else '',
+        )
+        for capture in captures
+    )
+
+    # Keep only the newest SLOW_QUERY_LOG_SIZE entries (ring buffer).
+    stale = SlowQuery.objects.values_list('id', flat=True)[
+        settings.SLOW_QUERY_LOG_SIZE:settings.SLOW_QUERY_LOG_SIZE + 1
+    ]
+    if stale:
+        SlowQuery.objects.filter(id__lte=stale[0]).delete()
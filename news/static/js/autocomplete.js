@@ -0,0 +1,30 @@
+// Adds a search box above every <select data-autocomplete="url"> and
+// replaces its unselected options with the matches fetched from `url`.
+document.querySelectorAll('select[data-autocomplete]').forEach((select) => {
+  const search = document.createElement('input');
+  search.type = 'search';
+  search.placeholder = 'Buscar...';
+  select.before(search);
+
+  let timer;
+  search.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(async () => {
+      const url = new URL(select.dataset.autocomplete, window.location);
+      url.searchParams.set('q', search.value.trim());
+      const response = await fetch(url, {
+        headers: { Accept: 'application/json' },
+      });
+      if (!response.ok) return;
+      const items = await response.json();
+      const kept = new Set();
+      Array.from(select.options).forEach((option) => {
+        if (option.selected || option.value === '') kept.add(option.value);
+        else option.remove();
+      });
+      items.forEach(({ id, name }) => {
+        if (!kept.has(String(id))) select.add(new Option(name, id));
+      });
+    }, 200);
+  });
+});
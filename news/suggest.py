@@ -0,0 +1,169 @@
+import logging
+import re
+import threading
+from bisect import bisect_left
+from time import monotonic
+
+from django.conf import settings
+from django.db.models import Max
+from news.models import ArchivedNews, Change, News
+from news.related import fold
+
+logger = logging.getLogger('news.suggest')
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+# Keys are cut here to bound memory; longer queries are checked against
+# the whole title.
+KEY_LENGTH = 24
+
+
+def normalize(text):
+    return ' '.join(WORD_RE.findall(fold(text)))
+
+
+def keys_for(title):
+    """One key per word of the normalized title, from that word on, so
+    'Seleção vence a Copa' is found by 'sel', 'vence a' or 'copa'."""
+    words = normalize(title).split()
+    return sorted({
+        ' '.join(words[start:])[:KEY_LENGTH] for start in range(len(words))
+    })
+
+
+def current_titles(news_ids):
+    # Archiving deletes from News; those ids are still searchable.
+    titles = dict(
+        ArchivedNews.objects.filter(id__in=news_ids).values_list(
+            'id', 'title'
+        )
+    )
+    titles.update(
+        News.objects.filter(id__in=news_ids).values_list('id', 'title')
+    )
+    return titles
+
+
+class TitleIndex:
+    """Sorted array of title keys held by each worker. Saves and deletes in
+    this process are applied by signals; those of other processes (and of
+    bulk imports) are read from the change feed at most every
+    SUGGEST_SYNC_INTERVAL seconds."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.keys = []
+        self.ids = []
+        self.titles = {}
+        self.cursor = None
+        self.synced_at = monotonic()
+
+    def load(self):
+        cursor = Change.settled().aggregate(last=Max('seq'))['last'] or 0
+        titles = dict(
+            ArchivedNews.objects.values_list('id', 'title').iterator()
+        )
+        titles.update(News.objects.values_list('id', 'title').iterator())
+        entries = sorted(
+            (key, news_id)
+            for news_id, title in titles.items()
+            for key in keys_for(title)
+        )
+        with self.lock:
+            self.keys = [key for key, _ in entries]
+            self.ids = [news_id for _, news_id in entries]
+            self.titles = titles
+            self.cursor = cursor
+            self.synced_at = monotonic()
+        return len(titles)
+
+    def _remove(self, news_id):
+        title = self.titles.pop(news_id, None)
+        if title is None:
+            return
+        for key in keys_for(title):
+            position = bisect_left(self.keys, key)
+            while self.ids[position] != news_id:
+                position += 1
+            del self.keys[position]
+            del self.ids[position]
+
+    def _insert(self, news_id, title):
+        self.titles[news_id] = title
+        for key in keys_for(title):
+            position = bisect_left(self.keys, key)
+            self.keys.insert(position, key)
+            self.ids.insert(position, news_id)
+
+    def put(self, news_id, title):
+        with self.lock:
+            if self.cursor is None or self.titles.get(news_id) == title:
+                return
+            self._remove(news_id)
+            self._insert(news_id, title)
+
+    def discard(self, news_id):
+        with self.lock:
+            if self.cursor is not None:
+                self._remove(news_id)
+
+    def sync(self):
+        changes = list(
+            Change.settled().filter(model='news', seq__gt=self.cursor)
+            .values_list('seq', 'object_id')
+        )
+        self.synced_at = monotonic()
+        if not changes:
+            return
+        news_ids = {object_id for _, object_id in changes}
+        titles = current_titles(news_ids)
+        for news_id in news_ids:
+            if news_id in titles:
+                self.put(news_id, titles[news_id])
+            else:
+                self.discard(news_id)
+        self.cursor = max(seq for seq, _ in changes)
+
+    def refresh(self):
+        if self.cursor is None:
+            self.load()
+        elif monotonic() - self.synced_at >= settings.SUGGEST_SYNC_INTERVAL:
+            self.sync()
+
+    def search(self, query, limit):
+        """(id, title) of up to `limit` News with a word starting with
+        `query`, ignoring case and accents, in key order."""
+        query = normalize(query)
+        if not query:
+            return []
+        self.refresh()
+        prefix = query[:KEY_LENGTH]
+        found = {}
+        with self.lock:
+            position = bisect_left(self.keys, prefix)
+            while len(found) < limit and position < len(self.keys):
+                if not self.keys[position].startswith(prefix):
+                    break
+                news_id = self.ids[position]
+                if news_id not in found and self._matches(news_id, query):
+                    found[news_id] = self.titles[news_id]
+                position += 1
+        return list(found.items())
+
+    def _matches(self, news_id, query):
+        if len(query) <= KEY_LENGTH:
+            return True
+        return f' {query}' in f' {normalize(self.titles[news_id])}'
+
+
+index = TitleIndex()
+
+
+def warm():
+    """Build the index before the first request; on failure the first
+    search builds it instead."""
+    try:
+        count = index.load()
+    except Exception:
+        logger.exception('Falha ao carregar o índice de sugestões.')
+    else:
+        logger.info('Índice de sugestões carregado: %d notícias.', count)
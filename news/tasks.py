@@ -0,0 +1,156 @@
+import traceback
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import ExifTags, Image, ImageOps
+from news.caching import bump_cache_version
+from news.feed import refresh_feed
+from news.models import Change, News, Task
+from news.related import has_pending_changes, refresh_from_changes
+
+registry = {}
+
+
+def task(func):
+    registry[func.__name__] = func
+    return func
+
+
+def enqueue(name, *args, priority=0, dedup_key=None, delay=0):
+    if name not in registry:
+        raise KeyError(f'Tarefa desconhecida: {name}')
+    if dedup_key is not None:
+        pending = Task.objects.filter(
+            dedup_key=dedup_key, status=Task.QUEUED
+        ).first()
+        if pending is not None:
+            return pending
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        priority=priority,
+        dedup_key=dedup_key,
+        max_attempts=settings.TASK_MAX_ATTEMPTS,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim(limit):
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=Task.QUEUED, run_after__lte=now)
+            .order_by('-priority', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        Task.objects.filter(id__in=ids).update(
+            status=Task.RUNNING, started_at=now
+        )
+    return ids
+
+
+def requeue_stale():
+    # Tasks left running by a worker that died go back to the queue.
+    timeout = timedelta(seconds=settings.TASK_RUNNING_TIMEOUT)
+    return Task.objects.filter(
+        status=Task.RUNNING, started_at__lt=timezone.now() - timeout
+    ).update(status=Task.QUEUED)
+
+
+def run_task(task_id):
+    task = Task.objects.get(id=task_id)
+    task.attempts += 1
+    try:
+        registry[task.name](*task.args)
+    except Exception:
+        task.last_error = traceback.format_exc()
+        if task.attempts < task.max_attempts:
+            backoff = settings.TASK_RETRY_BACKOFF ** task.attempts
+            task.status = Task.QUEUED
+            task.run_after = timezone.now() + timedelta(seconds=backoff)
+        else:
+            task.status = Task.FAILED
+    else:
+        task.status = Task.DONE
+    task.save()
+    return task.status
+
+
+def downscale(image):
+    """`image` upright and within NEWS_IMAGE_MAX_SIZE, or `image` itself
+    when it already is."""
+    orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+    max_size = settings.NEWS_IMAGE_MAX_SIZE
+    if orientation == 1 and max(image.size) <= max_size:
+        return image
+    processed = ImageOps.exif_transpose(image)
+    processed.thumbnail((max_size, max_size))
+    return processed
+
+
+def image_metadata(image, size):
+    # Averaging to one pixel gives the placeholder colour shown while the
+    # image loads.
+    pixel = image.convert('RGB').resize((1, 1), Image.Resampling.BOX)
+    return {
+        'image_width': image.width,
+        'image_height': image.height,
+        'image_bytes': size,
+        'image_color': '#{:02x}{:02x}{:02x}'.format(*pixel.getpixel((0, 0))),
+    }
+
+
+@task
+def process_news_image(news_id):
+    news = News.objects.filter(id=news_id).first()
+    if news is None or not news.image:
+        return
+
+    with news.image.open('rb') as file:
+        image = Image.open(file)
+        image.load()
+    processed = downscale(image)
+    storage, old_name = news.image.storage, news.image.name
+    new_name = old_name
+    if processed is not image:
+        buffer = BytesIO()
+        processed.save(buffer, format=image.format)
+        new_name = storage.save(old_name, ContentFile(buffer.getvalue()))
+    # update() keeps post_save from queueing this task again, so the change
+    # feed and the cache version are fed here.
+    News.objects.filter(id=news_id).update(
+        image=new_name,
+        **image_metadata(processed, storage.size(new_name)),
+    )
+    if new_name != old_name:
+        Change.objects.create(
+            model='news', object_id=news_id, action=Change.UPDATE
+        )
+    refresh_feed([news_id])
+    # Pages embed the image size as well as its name.
+    bump_cache_version()
+    if new_name != old_name:
+        storage.delete(old_name)
+
+
+@task
+def refresh_related_news():
+    refresh_from_changes()
+    # Edits made during the delay may still be inside the settle window;
+    # enqueue folded them into this run, so another one picks them up.
+    if has_pending_changes():
+        queue_related_refresh()
+
+
+def queue_related_refresh():
+    # One delayed task absorbs a burst of edits; it reads the change feed.
+    return enqueue(
+        'refresh_related_news',
+        dedup_key='related-news',
+        delay=settings.RELATED_NEWS_REFRESH_DELAY,
+    )
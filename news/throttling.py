@@ -0,0 +1,97 @@
+import threading
+from time import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import BaseThrottle
+
+# Refill and spend in one server-side step, so concurrent requests from
+# every worker see each other's spending. Lua numbers come back as
+# integers, hence the token count is returned as a string.
+TAKE_TOKEN = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {allowed, tostring(tokens)}
+"""
+
+# Per-process caches are only shared by this process's threads.
+local_lock = threading.Lock()
+
+
+def take_token(key, capacity, rate, now):
+    """Refill the bucket at `key` and spend one token from it; returns
+    (allowed, tokens left). The update is atomic for every worker sharing
+    the cache."""
+    cache = caches['default']
+    # Keep the bucket only as long as it takes to refill completely.
+    timeout = int(capacity / rate) + 1
+    if isinstance(cache, RedisCache):
+        client = cache._cache.get_client(key, write=True)
+        allowed, tokens = client.register_script(TAKE_TOKEN)(
+            keys=[cache.make_and_validate_key(key)],
+            args=[capacity, rate, repr(now), timeout],
+        )
+        return bool(allowed), float(tokens)
+    with local_lock:
+        tokens, updated_at = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + max(0, now - updated_at) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        cache.set(key, (tokens, now), timeout)
+    return allowed, tokens
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Token bucket kept in the shared cache: `rate` tokens per second are
+    added up to `capacity`, and each request spends one."""
+
+    scope = None
+
+    def get_bucket_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        config = settings.API_THROTTLE_BUCKETS.get(self.scope)
+        if config is None:
+            return True
+
+        self.rate = config['rate']
+        key = f'throttle:{self.scope}:{self.get_bucket_key(request, view)}'
+        allowed, tokens = take_token(
+            key, config['capacity'], self.rate, time()
+        )
+        self.tokens = tokens
+        return allowed
+
+    def wait(self):
+        return (1 - self.tokens) / self.rate
+
+
+class ClientTokenBucketThrottle(TokenBucketThrottle):
+    scope = 'client'
+
+    def get_bucket_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+
+class GlobalTokenBucketThrottle(TokenBucketThrottle):
+    scope = 'global'
+
+    def get_bucket_key(self, request, view):
+        return 'all'
@@ -0,0 +1,130 @@
+import traceback
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+current_timing = ContextVar('current_timing', default=None)
+
+
+class RequestTiming:
+    def __init__(self):
+        self.started = perf_counter()
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.phases = {}
+        self.slow_queries = []
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        self.slow_threshold = None if threshold is None else threshold / 1000
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - started
+            self.db_time += duration
+            self.db_queries += 1
+            if (
+                self.slow_threshold is not None
+                and duration >= self.slow_threshold
+            ):
+                self.slow_queries.append(
+                    capture_query(sql, params, many, context, duration)
+                )
+
+    def add(self, phase, duration):
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+
+    def metrics(self):
+        total = perf_counter() - self.started
+        metrics = {'db': self.db_time, **self.phases, 'total': total}
+        return {
+            name: round(value * 1000, 2) for name, value in metrics.items()
+        }
+
+    def header(self):
+        entries = [
+            f'{name};dur={duration}'
+            for name, duration in self.metrics().items()
+        ]
+        entries.insert(1, f'db_queries;desc="{self.db_queries} queries"')
+        return ', '.join(entries)
+
+
+def project_stack():
+    base_dir = str(settings.BASE_DIR)
+    return [
+        f'{frame.filename}:{frame.lineno} in {frame.name}'
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(base_dir)
+        and 'site-packages' not in frame.filename
+        and frame.filename != __file__
+    ]
+
+
+def capture_query(sql, params, many, context, duration):
+    return {
+        'database': context['connection'].alias,
+        'sql': sql,
+        'params': None if many else params,
+        'duration': duration,
+        'stack': project_stack(),
+    }
+
+
+@contextmanager
+def timing_scope():
+    # Nested middlewares share the outermost request's timing.
+    timing = current_timing.get()
+    if timing is not None:
+        yield timing
+        return
+
+    timing = RequestTiming()
+    token = current_timing.set(timing)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(timing.execute_wrapper)
+                )
+            yield timing
+    finally:
+        current_timing.reset(token)
+
+
+@contextmanager
+def timed(phase):
+    timing = current_timing.get()
+    if timing is None:
+        yield
+        return
+
+    # Queries triggered inside the phase (lazy querysets) are reported
+    # under "db", so they are not counted twice.
+    db_time = timing.db_time
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - started
+        timing.add(phase, elapsed - (timing.db_time - db_time))
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        with timed('template'):
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
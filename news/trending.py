@@ -0,0 +1,46 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from news.models import ViewCount
+
+# Scores are stored as log(sum(views * exp(rate * (t - EPOCH)))). Growing
+# the new terms instead of decaying the old ones keeps the ranking of the
+# stored values equal to the ranking of the decayed scores at any instant,
+# so an update touches only the articles that were viewed.
+EPOCH = datetime(2023, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def decay_rate():
+    return math.log(2) / settings.TRENDING_HALF_LIFE
+
+
+def log_weight(now):
+    return decay_rate() * (now - EPOCH).total_seconds()
+
+
+def add_views(stored, views, now):
+    """Return `stored` (a log score or None) plus `views` seen at `now`."""
+    term = math.log(views) + log_weight(now)
+    if stored is None:
+        return term
+    high, low = max(stored, term), min(stored, term)
+    return high + math.log1p(math.exp(low - high))
+
+
+def decayed(stored, now=None):
+    """The score as of `now`: every view is worth 1 when fresh and half
+    as much after each TRENDING_HALF_LIFE seconds."""
+    if stored is None:
+        return 0.0
+    return math.exp(stored - log_weight(now or timezone.now()))
+
+
+def top(limit):
+    # Served by the index on `trending`: a descending scan of `limit` rows.
+    return list(
+        ViewCount.objects.filter(trending__isnull=False)
+        .select_related('news')
+        .order_by('-trending')[:limit]
+    )
@@ -0,0 +1,166 @@
+import os
+import shutil
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+from news.models import Upload
+
+BLOCK_SIZE = 64 * 1024
+# Leading bytes of the accepted formats; WebP also carries 'WEBP' at 8.
+SIGNATURES = [b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'GIF87a', b'GIF89a']
+HEADER_SIZE = 12
+EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+
+
+class UploadError(ValueError):
+    pass
+
+
+class OffsetMismatch(UploadError):
+    """The chunk does not start where the stored data ends; the client
+    resumes from `offset`."""
+
+    def __init__(self, offset):
+        super().__init__(f'O envio continua a partir do byte {offset}.')
+        self.offset = offset
+
+
+def part_path(upload):
+    return Path(settings.UPLOAD_DIR) / f'{upload.id}.part'
+
+
+def is_image_header(header):
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return True
+    return any(header.startswith(signature) for signature in SIGNATURES)
+
+
+def copy_stream(stream, file, limit):
+    """Copy `stream` to `file` a block at a time, refusing more than
+    `limit` bytes; returns how many were written."""
+    written = 0
+    while True:
+        block = stream.read(BLOCK_SIZE)
+        if not block:
+            return written
+        written += len(block)
+        if written > limit:
+            raise UploadError('O envio excede o tamanho declarado.')
+        file.write(block)
+
+
+def check_offset(upload, offset):
+    if upload.completed_at is not None or offset != upload.received:
+        raise OffsetMismatch(upload.received)
+
+
+def receive_chunk(upload, stream, offset):
+    """Spool the request body to a file of its own, outside any
+    transaction, so a slow client holds no row lock or connection."""
+    name = f'{upload.id}.{uuid.uuid4().hex}.chunk'
+    path = Path(settings.UPLOAD_DIR) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with path.open('wb') as file:
+            copy_stream(stream, file, upload.size - offset)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def write_chunk(upload, chunk, offset):
+    size = chunk.stat().st_size
+    path = part_path(upload)
+    if offset == 0:
+        os.replace(chunk, path)
+        return size
+    with path.open('ab') as file, chunk.open('rb') as source:
+        # Drops whatever a failed attempt left past the last offset.
+        file.truncate(offset)
+        shutil.copyfileobj(source, file, BLOCK_SIZE)
+    return offset + size
+
+
+def append(upload_id, stream, offset):
+    """Append the chunk in `stream` at `offset` and return the upload.
+    The body is received first; the row is then locked only to recheck
+    the offset and move the chunk into place, so concurrent retries of the
+    same chunk cannot interleave."""
+    upload = Upload.objects.get(id=upload_id)
+    check_offset(upload, offset)
+    chunk = receive_chunk(upload, stream, offset)
+    try:
+        with transaction.atomic():
+            upload = Upload.objects.select_for_update().get(id=upload_id)
+            check_offset(upload, offset)
+            upload.received = write_chunk(upload, chunk, offset)
+            upload.save(update_fields=['received'])
+    finally:
+        chunk.unlink(missing_ok=True)
+    if offset < HEADER_SIZE and not header_ok(upload):
+        discard(upload)
+        raise UploadError('O arquivo enviado não é uma imagem.')
+    if upload.received == upload.size:
+        complete(upload)
+    return upload
+
+
+def header_ok(upload):
+    """Checked as soon as the first bytes arrive, so a wrong file is
+    refused before the rest of it is sent."""
+    with part_path(upload).open('rb') as file:
+        header = file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE and upload.received < upload.size:
+        return True
+    return is_image_header(header)
+
+
+def complete(upload):
+    """Check the whole image, decoding from disk, and mark it attachable;
+    an invalid file is discarded."""
+    path = part_path(upload)
+    try:
+        with Image.open(path) as image:
+            image.verify()
+    except Exception:
+        discard(upload)
+        raise UploadError('O arquivo enviado não é uma imagem válida.')
+    upload.completed_at = timezone.now()
+    upload.save(update_fields=['completed_at'])
+
+
+def attach(upload, news):
+    """Move the finished upload into `news.image`; storage copies it in
+    chunks and News signals then process the image as usual."""
+    if upload.completed_at is None:
+        raise UploadError('O envio ainda não foi concluído.')
+    with part_path(upload).open('rb') as file:
+        news.image.save(upload.filename, File(file), save=True)
+    discard(upload)
+    return news
+
+
+def discard(upload):
+    part_path(upload).unlink(missing_ok=True)
+    # Chunks left behind by a worker that died while receiving them.
+    for chunk in Path(settings.UPLOAD_DIR).glob(f'{upload.id}.*.chunk'):
+        chunk.unlink(missing_ok=True)
+    upload.delete()
+
+
+def prune_uploads(max_age=None):
+    """Drop uploads started more than `max_age` seconds ago and never
+    attached."""
+    max_age = settings.UPLOAD_MAX_AGE if max_age is None else max_age
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    stale = list(Upload.objects.filter(created_at__lt=cutoff))
+    for upload in stale:
+        discard(upload)
+    return len(stale)
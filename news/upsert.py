@@ -0,0 +1,15 @@
+from django.db import connection
+
+
+def upsert(model, objects, update_fields, unique_fields):
+    """Insert `objects`, updating `update_fields` of rows that already
+    exist under `unique_fields`."""
+    # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target.
+    target = (
+        {'unique_fields': unique_fields}
+        if connection.features.supports_update_conflicts_with_target
+        else {}
+    )
+    return model.objects.bulk_create(
+        objects, update_conflicts=True, update_fields=update_fields, **target
+    )
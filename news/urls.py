@@ -1,12 +1,17 @@
 from django.urls import path, include
-from .views import index, new_category, new_news, news
+from .views import index, metrics, new_category, new_news, news
+from .views import memory_diagnostics, profile_download, profiles
 from rest_framework import routers
-from .views import CategoryViewSet, UserViewSet, NewsViewSet
+from .views import CategoryViewSet, ChangeViewSet, UserViewSet, NewsViewSet
+from .views import UploadViewSet, ViewCountViewSet
 
 router = routers.DefaultRouter()
 router.register(r'categories', CategoryViewSet)
 router.register(r'users', UserViewSet)
 router.register(r'news', NewsViewSet)
+router.register(r'changes', ChangeViewSet)
+router.register(r'view-counts', ViewCountViewSet)
+router.register(r'uploads', UploadViewSet)
 
 urlpatterns = [
   path('', index, name='home-page'),
@@ -14,4 +19,10 @@ urlpatterns = [
   path('categories/', new_category, name='categories-form'),
   path('news/', new_news, name='news-form'),
   path('api/', include(router.urls)),
+  path('metrics', metrics, name='metrics'),
+  path('profiles/', profiles, name='profiles'),
+  path('profiles/<str:name>', profile_download, name='profile-download'),
+  path(
+    'diagnostics/memory/', memory_diagnostics, name='memory-diagnostics'
+  ),
 ]
@@ -1,31 +1,337 @@
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db.models import Max
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.views.decorators.http import require_http_methods
 from django.shortcuts import render, redirect
-from news.models import Category, CategoryForm, News, NewsForm, User
-from rest_framework import viewsets
-from news.serializers import CategorySerializer, NewsSerializer, UserSerializer
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from news.archive import find_news
+from news.caching import cached_page
+from news.counters import count_views
+from news.maintenance import PRUNED_CHECKPOINT
+from news.memory import (
+    get_reports,
+    get_state,
+    set_state,
+    state_changes,
+    tracker,
+)
+from news.metrics import exposition
+from news.profiling import list_profiles, make_token, profiles_dir
+from news.suggest import index as suggestions
+from news.trending import top
+from news.uploads import OffsetMismatch, UploadError, append, attach
+from news.models import (
+    ArchivedNews,
+    Category,
+    CategoryForm,
+    Change,
+    Checkpoint,
+    FeedEntry,
+    News,
+    NewsForm,
+    RelatedNews,
+    Upload,
+    User,
+    ViewCount,
+)
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from rest_framework.status import HTTP_409_CONFLICT, HTTP_410_GONE
+from news.parsers import api_parser_classes
+from news.renderers import api_renderer_classes
+from news.serializers import (
+    AttachUploadSerializer,
+    CategorySerializer,
+    ChangeSerializer,
+    NewsSerializer,
+    RelatedNewsSerializer,
+    TrendingNewsSerializer,
+    UploadSerializer,
+    UserSerializer,
+    ViewCountSerializer,
+)
+
+
+class AutocompleteMixin:
+    """`autocomplete/?q=` route returning the first AUTOCOMPLETE_LIMIT
+    `{id, name}` pairs whose name starts with `q`."""
 
+    @action(detail=False)
+    def autocomplete(self, request):
+        query = request.query_params.get('q', '').strip()
+        queryset = self.get_queryset().order_by('name', 'id')
+        if query:
+            # Case-insensitive collations turn this into LIKE 'q%', which
+            # is served by the index on `name`.
+            queryset = queryset.filter(name__istartswith=query)
+        return Response(
+            queryset.values('id', 'name')[:settings.AUTOCOMPLETE_LIMIT]
+        )
 
-class CategoryViewSet(viewsets.ModelViewSet):
+
+@method_decorator(cached_page(key_prefix='api'), name='dispatch')
+class CategoryViewSet(AutocompleteMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    renderer_classes = api_renderer_classes()
+    parser_classes = api_parser_classes()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+@method_decorator(cached_page(key_prefix='api'), name='dispatch')
+class UserViewSet(AutocompleteMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    renderer_classes = api_renderer_classes()
+    parser_classes = api_parser_classes()
 
 
+@method_decorator(cached_page(key_prefix='api'), name='dispatch')
 class NewsViewSet(viewsets.ModelViewSet):
+    """Current news. Archived articles are left out of the list and of
+    `related`; they are only served by id, read-only."""
+
     queryset = News.objects.all()
     serializer_class = NewsSerializer
+    renderer_classes = api_renderer_classes()
+    parser_classes = api_parser_classes()
+
+    def get_object(self):
+        # Reads fall back to the archive; archived articles are read-only.
+        try:
+            return super().get_object()
+        except Http404:
+            if self.action != 'retrieve':
+                raise
+            return get_object_or_404(
+                ArchivedNews.objects.prefetch_related('categories'),
+                pk=self.kwargs['pk'],
+            )
+
+    @action(detail=False)
+    def trending(self, request):
+        try:
+            limit = int(request.query_params.get(
+                'limit', settings.TRENDING_SIZE
+            ))
+        except ValueError:
+            raise ValidationError({'limit': 'Informe um número inteiro.'})
+        limit = max(1, min(limit, settings.TRENDING_MAX_SIZE))
+        serializer = TrendingNewsSerializer(
+            top(limit), many=True, context={'now': timezone.now()}
+        )
+        return Response(serializer.data)
+
+    @action(detail=False)
+    def suggest(self, request):
+        matches = suggestions.search(
+            request.query_params.get('q', ''), settings.SUGGEST_LIMIT
+        )
+        return Response([
+            {'id': news_id, 'title': title} for news_id, title in matches
+        ])
+
+    @action(detail=True)
+    def related(self, request, pk=None):
+        links = related_links(pk)
+        if not links and not News.objects.filter(pk=pk).exists():
+            raise NotFound()
+        return Response(RelatedNewsSerializer(links, many=True).data)
+
+
+class ViewCountViewSet(viewsets.ReadOnlyModelViewSet):
+    """Flushed view counts; `?ids=1,2,3` restricts the list."""
+
+    queryset = ViewCount.objects.order_by('news_id')
+    serializer_class = ViewCountSerializer
+    renderer_classes = api_renderer_classes()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        ids = self.request.query_params.get('ids')
+        if ids is None:
+            return queryset
+        try:
+            ids = [int(value) for value in ids.split(',') if value]
+        except ValueError:
+            raise ValidationError({'ids': 'Informe ids inteiros.'})
+        return queryset.filter(news_id__in=ids)
+
+
+class UploadViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """Resumable image uploads: POST {filename, size} starts one, each
+    PATCH appends its raw body at the `Upload-Offset` header, GET tells
+    where to resume and `attach/` moves the finished file into a News."""
+
+    queryset = Upload.objects.all()
+    serializer_class = UploadSerializer
+    renderer_classes = api_renderer_classes()
+
+    def partial_update(self, request, pk=None):
+        upload = self.get_object()
+        offset = self._offset()
+        try:
+            # The body is streamed to disk; request.data is never read.
+            upload = append(upload.pk, request.stream or BytesIO(), offset)
+        except OffsetMismatch as error:
+            return Response(
+                {'detail': str(error), 'offset': error.offset},
+                status=HTTP_409_CONFLICT,
+            )
+        except UploadError as error:
+            raise ValidationError({'detail': str(error)})
+        return Response(self.get_serializer(upload).data)
+
+    def _offset(self):
+        try:
+            return int(self.request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            raise ValidationError(
+                {'Upload-Offset': 'Informe um número inteiro.'}
+            )
+
+    @action(detail=True, methods=['post'])
+    def attach(self, request, pk=None):
+        upload = self.get_object()
+        serializer = AttachUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            news = attach(upload, serializer.validated_data['news'])
+        except UploadError as error:
+            raise ValidationError({'detail': str(error)})
+        return Response(NewsSerializer(news).data)
+
 
+class ChangeViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Change.objects.all()
+    serializer_class = ChangeSerializer
+    renderer_classes = api_renderer_classes()
+    tracked = {
+        'category': (Category.objects.all(), CategorySerializer),
+        'user': (User.objects.all(), UserSerializer),
+        'news': (News.objects.prefetch_related('categories'), NewsSerializer),
+    }
+    # Archive entries carry the archived copy, unlike delete tombstones.
+    archived = {'news': ArchivedNews.objects.prefetch_related('categories')}
 
+    def _int_param(self, name, default):
+        value = self.request.query_params.get(name, default)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise ValidationError({name: 'Informe um número inteiro.'})
+        if value < 0:
+            raise ValidationError({name: 'Informe um número não negativo.'})
+        return value
+
+    def list(self, request, *args, **kwargs):
+        since = self._int_param('since', 0)
+        limit = min(
+            self._int_param('limit', settings.CHANGES_PAGE_SIZE) or 1,
+            settings.CHANGES_MAX_PAGE_SIZE,
+        )
+        pruned = Checkpoint.objects.filter(name=PRUNED_CHECKPOINT).first()
+        if pruned is not None and since < pruned.seq:
+            return self._resync_required(since, pruned.seq)
+        page = list(
+            Change.settled().filter(seq__gt=since)[:limit + 1]
+        )
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        # Only the newest entry per object matters to a mirror.
+        latest = {}
+        for change in page:
+            latest.pop((change.model, change.object_id), None)
+            latest[(change.model, change.object_id)] = change
+
+        results = [self.get_serializer(c).data for c in latest.values()]
+        self._attach_objects(results)
+        return Response({
+            'since': since,
+            'next': page[-1].seq if page else since,
+            'has_more': has_more,
+            'results': results,
+        })
+
+    def _resync_required(self, since, pruned):
+        # Entries up to `pruned` are gone, so the mirror must reload
+        # everything and then follow the feed from `next`.
+        latest = Change.settled().aggregate(last=Max('seq'))['last']
+        return Response(
+            {
+                'detail': (
+                    f'Alterações até {pruned} foram apagadas; '
+                    'sincronize novamente.'
+                ),
+                'resync_required': True,
+                'since': since,
+                'next': latest or pruned,
+            },
+            status=HTTP_410_GONE,
+        )
+
+    def _load(self, queryset, items, actions):
+        ids = [
+            item['object_id'] for item in items
+            if item['action'] in actions
+        ]
+        return queryset.in_bulk(ids) if ids else {}
+
+    def _attach_objects(self, results):
+        context = self.get_serializer_context()
+        for model_name, (queryset, serializer_class) in self.tracked.items():
+            items = [
+                item for item in results
+                if item['model'] == model_name
+            ]
+            objects = self._load(
+                queryset, items, (Change.INSERT, Change.UPDATE)
+            )
+            if model_name in self.archived:
+                objects.update(self._load(
+                    self.archived[model_name], items, (Change.ARCHIVE,)
+                ))
+            for item in items:
+                obj = objects.get(item['object_id'])
+                item['data'] = (
+                    serializer_class(obj, context=context).data
+                    if obj is not None else None
+                )
+
+
+def related_links(news_id):
+    return list(
+        RelatedNews.objects.filter(news_id=news_id).select_related('related')
+    )
+
+
+@cached_page(key_prefix='pages')
 def index(request):
-    context = {"news_list": News.objects.all()}
+    context = {
+        "news_list": FeedEntry.objects.all(),
+        "trending": top(settings.TRENDING_SIZE),
+    }
     return render(request, 'home.html', context)
 
 
+@count_views
+@cached_page(key_prefix='pages')
 def news(request, id):
-    context = {"news_details": News.objects.get(id=id)}
+    context = {
+        "news_details": find_news(id),
+        "related_news": related_links(id),
+    }
     return render(request, 'news_details.html', context)
 
 
@@ -49,7 +355,41 @@ def new_news(request):
             return redirect('home-page')
     else:
         form = NewsForm()
-        users = User.objects.all()
-        categories = Category.objects.all()
-        return render(request, 'news_form.html',
-                      {'form': form, 'users': users, 'categories': categories})
+    # The rest of the categories are fetched by the page as the user types.
+    categories = Category.objects.order_by('name')[
+        :settings.AUTOCOMPLETE_LIMIT
+    ]
+    return render(request, 'news_form.html',
+                  {'form': form, 'categories': categories})
+
+
+def metrics(request):
+    return HttpResponse(
+        exposition(), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+@staff_member_required
+def profiles(request):
+    return JsonResponse({
+        'token': make_token(),
+        'profiles': [path.name for path in list_profiles()],
+    })
+
+
+@staff_member_required
+def profile_download(request, name):
+    path = profiles_dir() / name
+    if path.suffix != '.folded' or path.name != name or not path.is_file():
+        raise Http404
+    return FileResponse(path.open('rb'), as_attachment=True)
+
+
+@staff_member_required
+@require_http_methods(['GET', 'POST'])
+def memory_diagnostics(request):
+    if request.method == 'POST':
+        set_state(**state_changes(request.POST))
+        if request.POST.get('snapshot') == '1' and tracker.baseline:
+            tracker.report(get_state()['top'])
+    return JsonResponse({'state': get_state(), 'reports': get_reports()})
@@ -0,0 +1,46 @@
+from django import forms
+from django.conf import settings
+from django.urls import reverse
+
+
+class AutocompleteMixin:
+    """Render only the first AUTOCOMPLETE_LIMIT choices (plus the selected
+    ones) and let the page fetch the rest from `url_name` as the user
+    types, so the form costs the same whatever the table size."""
+
+    def __init__(self, url_name, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def get_context(self, name, value, attrs):
+        attrs = {**(attrs or {}), 'data-autocomplete': reverse(self.url_name)}
+        return super().get_context(name, value, attrs)
+
+    def limited_choices(self, iterator, value):
+        queryset = iterator.queryset
+        objects = list(queryset[:settings.AUTOCOMPLETE_LIMIT])
+        shown = {obj.pk for obj in objects}
+        selected = [
+            v for v in value if str(v).isdigit() and int(v) not in shown
+        ]
+        objects += queryset.filter(pk__in=selected)
+        choices = [iterator.choice(obj) for obj in objects]
+        if iterator.field.empty_label is not None:
+            choices.insert(0, ('', iterator.field.empty_label))
+        return choices
+
+    def optgroups(self, name, value, attrs=None):
+        iterator = self.choices
+        self.choices = self.limited_choices(iterator, value)
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = iterator
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass
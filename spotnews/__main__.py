@@ -0,0 +1,199 @@
+import io
+import os
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+from rich.progress import Progress
+
+typer_app = typer.Typer(
+    help='Ferramentas de linha de comando do Spotnews.',
+    no_args_is_help=True,
+)
+console = Console(stderr=True)
+
+
+def setup_django():
+    # Django is imported per command so `spotnews --help` stays fast.
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'spotnews.settings')
+    import django
+
+    django.setup()
+
+
+def detect_format(path, fmt):
+    if fmt != 'auto':
+        return fmt
+    return 'csv' if Path(path).suffix.lower() == '.csv' else 'jsonl'
+
+
+@typer_app.command('import-news')
+def import_news(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False),
+    fmt: str = typer.Option('auto', '--format', help='auto, jsonl ou csv.'),
+    batch_size: int = typer.Option(1000, help='Linhas por transação.'),
+    processes: Optional[int] = typer.Option(
+        None, help='Processos de validação (0 valida no próprio processo).'
+    ),
+    rejects: Optional[Path] = typer.Option(
+        None, dir_okay=False, help='Grava as linhas rejeitadas em JSONL.'
+    ),
+):
+    """Importa ou atualiza notícias de um arquivo JSONL ou CSV em lotes."""
+    setup_django()
+    from django.conf import settings
+    from news.bulk import import_news, read_rows, write_reject
+
+    fmt = detect_format(path, fmt)
+    if processes is None:
+        processes = settings.BULK_IMPORT_PROCESSES
+
+    def print_reject(line, row, errors):
+        message = '; '.join(errors)
+        console.print(f'[yellow]Linha {line} rejeitada:[/] {message}')
+
+    on_reject = print_reject
+    with ExitStack() as stack:
+        if rejects:
+            on_reject = write_reject(
+                stack.enter_context(open(rejects, 'w', encoding='utf-8'))
+            )
+        progress = stack.enter_context(Progress(console=console))
+        raw = stack.enter_context(
+            progress.open(path, 'rb', description='Importando')
+        )
+        text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        created, updated, rejected = import_news(
+            read_rows(text, fmt), batch_size, on_reject, processes
+        )
+    console.print(
+        f'[green]{created} notícias criadas[/], {updated} atualizadas, '
+        f'{rejected} rejeitadas.'
+    )
+
+
+@typer_app.command('export-news')
+def export_news(
+    path: Optional[Path] = typer.Argument(
+        None, dir_okay=False, help='Arquivo de saída (padrão: stdout).'
+    ),
+    fmt: str = typer.Option('auto', '--format', help='auto, jsonl ou csv.'),
+    chunk_size: int = typer.Option(1000, help='Linhas lidas por consulta.'),
+):
+    """Exporta todas as notícias em blocos, sem carregar a tabela inteira."""
+    setup_django()
+    from news.bulk import export_rows, write_rows
+    from news.models import News
+
+    fmt = detect_format(path or 'stdout.jsonl', fmt)
+    total = News.objects.count()
+    output = (
+        open(path, 'w', encoding='utf-8', newline='') if path else sys.stdout
+    )
+    try:
+        with Progress(console=console) as progress:
+            task = progress.add_task('Exportando', total=total)
+            for _ in write_rows(export_rows(chunk_size), output, fmt):
+                progress.advance(task)
+    finally:
+        if path:
+            output.close()
+
+
+@typer_app.command()
+def rebuild(target: str = typer.Argument(..., help='O que reconstruir.')):
+    """Reconstrói índices, contadores e dados derivados."""
+    setup_django()
+    from news.maintenance import rebuilders
+
+    if target not in rebuilders:
+        options = ', '.join(rebuilders)
+        console.print(f'[red]Alvo inválido.[/] Opções: {options}')
+        raise typer.Exit(1)
+    with console.status(f'Reconstruindo {target}...'):
+        count = rebuilders[target]()
+    console.print(f'[green]{target}:[/] {count} itens processados.')
+
+
+@typer_app.command('prune-changes')
+def prune_changes(
+    days: int = typer.Option(30, help='Mantém os últimos N dias.'),
+):
+    """Apaga entradas antigas do feed de alterações."""
+    setup_django()
+    from news.maintenance import prune_changes
+
+    console.print(f'{prune_changes(days)} alterações apagadas.')
+
+
+@typer_app.command()
+def archive(
+    days: Optional[int] = typer.Option(
+        None, help='Arquiva notícias com mais de N dias (padrão: '
+        'ARCHIVE_AFTER_DAYS).'
+    ),
+    batch_size: Optional[int] = typer.Option(None),
+):
+    """Move notícias antigas para a tabela de arquivo, em lotes."""
+    setup_django()
+    from news.archive import archive_old_news
+
+    console.print(f'{archive_old_news(days, batch_size)} notícias arquivadas.')
+
+
+@typer_app.command('prune-uploads')
+def prune_uploads(
+    hours: Optional[int] = typer.Option(
+        None, help='Idade máxima em horas (padrão: UPLOAD_MAX_AGE).'
+    ),
+):
+    """Apaga envios de imagem abandonados."""
+    setup_django()
+    from news.uploads import prune_uploads
+
+    max_age = None if hours is None else hours * 60 * 60
+    console.print(f'{prune_uploads(max_age)} envios apagados.')
+
+
+@typer_app.command()
+def dedupe(
+    delete: bool = typer.Option(False, help='Apaga as cópias encontradas.'),
+):
+    """Lista (ou apaga) notícias quase idênticas a outras mais antigas."""
+    setup_django()
+    from django.core.management import call_command
+
+    call_command('dedupe_news', delete=delete)
+
+
+@typer_app.command('backfill-images')
+def backfill_images(batch: int = typer.Option(500)):
+    """Preenche dimensões, tamanho e cor das imagens das notícias."""
+    setup_django()
+    from django.core.management import call_command
+
+    call_command('backfill_image_metadata', batch=batch)
+
+
+@typer_app.command('warm-cache')
+def warm_cache(
+    base_url: str = typer.Option('http://127.0.0.1:8000'),
+    newest: int = typer.Option(50),
+    workers: int = typer.Option(4),
+    access_log: Optional[Path] = typer.Option(None, exists=True),
+):
+    """Pré-aquece o cache de páginas e da API."""
+    setup_django()
+    from django.core.management import call_command
+
+    options = {'base_url': base_url, 'newest': newest, 'workers': workers}
+    if access_log:
+        options['access_log'] = str(access_log)
+    call_command('warm_cache', **options)
+
+
+if __name__ == '__main__':
+    typer_app()
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 import os
 import sys
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -47,7 +48,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so persisting slow queries runs after the timing scope the
+    # metrics and Server-Timing middlewares share has been closed.
+    "news.middleware.SlowQueryMiddleware",
+    "news.middleware.MetricsMiddleware",
+    "news.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "news.middleware.CompressionMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -55,13 +62,16 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "news.middleware.ProfilingMiddleware",
+    "news.middleware.MemoryDiagnosticsMiddleware",
+    "news.middleware.AdmissionControlMiddleware",
 ]
 
 ROOT_URLCONF = "spotnews.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "news.timing.TimedDjangoTemplates",
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -92,6 +102,19 @@ DATABASES = {
     }
 }
 
+# Cache
+# The page cache version, compressed variants, API throttles, admission
+# control and diagnostics flags must be seen by every web and task worker,
+# so the cache is a shared Redis instance, never per-process memory.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0"),
+        "KEY_PREFIX": "spotnews",
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -156,6 +179,138 @@ STATIC_TEST_DIR = os.path.join(BASE_DIR, "tests")
 
 REST_FRAMEWORK = {
     "DEFAULT_DATETIME_FORMAT": "%Y-%m-%d",
+    "DEFAULT_RENDERER_CLASSES": [
+        "news.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_THROTTLE_CLASSES": [
+        "news.throttling.ClientTokenBucketThrottle",
+        "news.throttling.GlobalTokenBucketThrottle",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "news.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 WHITE_NOISE_AUTOREFRESH = True
+
+CHANGES_PAGE_SIZE = 100
+CHANGES_MAX_PAGE_SIZE = 1000
+# Readers of the change feed only see entries at least this old, so a lower
+# seq committed after a higher one (bulk imports, archiving, dedupe) is not
+# skipped. It must exceed the longest transaction that writes changes.
+CHANGES_SETTLE_SECONDS = 30
+
+COMPRESSION_MIN_SIZE = 200
+# Prefixes of the media types worth compressing; images, video and fonts
+# such as woff2 are compressed already.
+COMPRESSION_CONTENT_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/msgpack',
+    'image/svg+xml',
+)
+COMPRESSION_CACHE_TIMEOUT = 300
+
+SERVER_TIMING_ENABLED = True
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "news.timing": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
+METRICS_DIR = os.getenv(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "spotnews-metrics")
+)
+METRICS_FLUSH_INTERVAL = 1.0
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+SLOW_QUERY_THRESHOLD_MS = 200
+SLOW_QUERY_EXPLAIN = True
+SLOW_QUERY_LOG_SIZE = 500
+
+PROFILING_DIR = os.getenv(
+    "PROFILING_DIR", os.path.join(tempfile.gettempdir(), "spotnews-profiles")
+)
+PROFILING_INTERVAL = 0.005
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_SAMPLE_VIEWS = [
+    "home-page",
+    "news-details-page",
+    "news-list",
+    "news-detail",
+]
+PROFILING_TOKEN_MAX_AGE = 3600
+PROFILING_MAX_FILES = 200
+
+MEMORY_DIAGNOSTICS_POLL_INTERVAL = 5.0
+MEMORY_DIAGNOSTICS_FRAMES = 10
+
+API_THROTTLE_BUCKETS = {
+    "client": {"rate": 10, "capacity": 50},
+    "global": {"rate": 200, "capacity": 400},
+}
+
+ADMISSION_CONTROL_VIEWS = [
+    "home-page",
+    "news-details-page",
+    "news-list",
+    "news-detail",
+    "user-list",
+    "user-detail",
+    "category-list",
+    "category-detail",
+    "change-list",
+]
+ADMISSION_CONTROL_LIMIT = 32
+ADMISSION_CONTROL_TIMEOUT = 60
+ADMISSION_CONTROL_RETRY_AFTER = 1
+
+TASK_MAX_ATTEMPTS = 3
+TASK_RETRY_BACKOFF = 2
+TASK_RUNNING_TIMEOUT = 600
+TASK_WORKER_PROCESSES = 2
+TASK_WORKER_POLL_INTERVAL = 1.0
+
+NEWS_IMAGE_MAX_SIZE = 1600
+
+UPLOAD_DIR = BASE_DIR / "uploads"
+UPLOAD_MAX_SIZE = 20 * 1024 * 1024
+UPLOAD_MAX_AGE = 24 * 60 * 60
+
+BULK_IMPORT_PROCESSES = 2
+
+RELATED_NEWS_COUNT = 5
+RELATED_NEWS_FEATURES = 4096
+RELATED_NEWS_CATEGORY_WEIGHT = 0.3
+RELATED_NEWS_REFRESH_DELAY = 30
+
+VIEW_COUNTER_FLUSH_INTERVAL = 10.0
+VIEW_COUNTER_MAX_PENDING = 1000
+
+TRENDING_HALF_LIFE = 6 * 60 * 60
+TRENDING_SIZE = 10
+TRENDING_MAX_SIZE = 50
+
+NEAR_DUPLICATE_THRESHOLD = 0.8
+NEAR_DUPLICATE_MIN_WORDS = 20
+
+AUTOCOMPLETE_LIMIT = 20
+
+SUGGEST_LIMIT = 10
+SUGGEST_SYNC_INTERVAL = 5.0
+
+ARCHIVE_AFTER_DAYS = 365
+ARCHIVE_BATCH_SIZE = 500
+
+PAGE_CACHE_TIMEOUT = 60
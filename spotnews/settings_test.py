@@ -3,3 +3,12 @@ from .settings import *
 MEDIA_URL = ''
 MEDIA_ROOT = BASE_DIR / 'tests'
 STORAGE = {"default":'django.core.files.storage.FileSystemStorage'}
+API_THROTTLE_BUCKETS = {}
+PAGE_CACHE_TIMEOUT = 0
+CHANGES_SETTLE_SECONDS = 0
+# Tests run in one process, so per-process memory stands in for Redis.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "spotnews.settings")
 
 application = get_wsgi_application()
+
+from news.suggest import warm  # noqa: E402
+
+warm()
@@ -0,0 +1,142 @@
+from django.db import connection
+from django.test import TestCase
+from io import StringIO
+from news.bulk import import_news, read_rows, write_reject
+from news.models import Category, Change, News, User
+from unittest import mock
+import json
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+class BulkImportTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        self.tech = Category.objects.create(name="Tecnologia")
+        self.sports = Category.objects.create(name="Esportes")
+
+    def row(self, title, **extra):
+        return {
+            "title": title,
+            "content": "Conteúdo",
+            "author": "Marcos Farias",
+            "categories": ["Tecnologia"],
+            "created_at": "2023-08-01",
+            **extra,
+        }
+
+    def test_rows_with_known_ids_are_updated_in_place(self):
+        news = News.objects.create(
+            title="Título antigo",
+            content="Conteúdo",
+            author=self.author,
+            created_at="2023-08-01",
+        )
+        news.categories.set([self.tech])
+        Change.objects.all().delete()
+
+        created, updated, rejected = import_news(
+            [
+                self.row("Título novo", id=news.id, categories=["Esportes"]),
+                self.row("Outra notícia"),
+            ]
+        )
+
+        self.assertEqual((created, updated, rejected), (1, 1, 0))
+        news.refresh_from_db()
+        self.assertEqual(news.title, "Título novo")
+        self.assertEqual(list(news.categories.all()), [self.sports])
+        self.assertEqual(
+            sorted(Change.objects.values_list("action", flat=True)),
+            [Change.INSERT, Change.UPDATE],
+        )
+
+    def test_ids_read_back_without_returning_insert(self):
+        features = mock.patch.object(
+            type(connection.features),
+            "can_return_rows_from_bulk_insert",
+            new_callable=mock.PropertyMock,
+            return_value=False,
+        )
+        with features, mock.patch.object(
+            News, "save_base", side_effect=AssertionError
+        ):
+            created, _, _ = import_news(
+                [self.row(f"Notícia número {i}") for i in range(5)]
+            )
+
+        self.assertEqual(created, 5)
+        inserted = set(News.objects.values_list("id", flat=True))
+        self.assertEqual(
+            set(
+                Change.objects.filter(action=Change.INSERT, model="news")
+                .values_list("object_id", flat=True)
+            ),
+            inserted,
+        )
+        self.assertEqual(
+            set(
+                News.categories.through.objects.values_list(
+                    "news_id", flat=True
+                )
+            ),
+            inserted,
+        )
+
+    def test_malformed_lines_are_rejected_one_by_one(self):
+        file = StringIO(
+            json.dumps(self.row("Primeira notícia")) + "\n"
+            + '{"title": "Quebrada"\n'
+            + "[1, 2]\n"
+            + json.dumps(self.row("Segunda notícia")) + "\n"
+        )
+        rejects = []
+
+        created, _, rejected = import_news(
+            read_rows(file, "jsonl"),
+            on_reject=lambda line, row, errors: rejects.append(
+                (line, row, errors)
+            ),
+        )
+
+        self.assertEqual((created, rejected), (2, 2))
+        self.assertEqual([line for line, _, _ in rejects], [2, 3])
+        self.assertEqual(rejects[0][1], '{"title": "Quebrada"')
+        self.assertTrue(rejects[0][2][0].startswith("JSON inválido"))
+        self.assertEqual(rejects[1][2], ["A linha não é um objeto JSON."])
+
+    def test_pool_validation_matches_inline_validation(self):
+        rows = [self.row(f"Notícia número {i}") for i in range(10)]
+        rows[3]["title"] = "Inválido"
+        rows[7]["author"] = "Ninguém"
+        rejects = []
+
+        created, updated, rejected = import_news(
+            rows,
+            batch_size=3,
+            on_reject=lambda line, row, errors: rejects.append(line),
+            processes=2,
+        )
+
+        self.assertEqual((created, updated, rejected), (8, 0, 2))
+        self.assertEqual(rejects, [4, 8])
+        self.assertEqual(News.objects.count(), 8)
+
+    def test_rejects_are_written_as_json_lines(self):
+        output = StringIO()
+
+        import_news(
+            [self.row("Inválido"), self.row("Notícia válida", id="x")],
+            on_reject=write_reject(output),
+        )
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([record["line"] for record in records], [1, 2])
+        self.assertIn("title", records[0]["errors"][0])
+        self.assertEqual(records[1]["errors"], ["id inválido: x"])
+        self.assertFalse(News.objects.exists())
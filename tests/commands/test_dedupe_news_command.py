@@ -0,0 +1,132 @@
+from django.core.management import call_command
+from django.test import TestCase
+from io import StringIO
+from news.bulk import import_news
+from news.duplicates import decode, minhash
+from news.models import Category, News, NewsSignature, NewsForm, User
+from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
+import pytest
+
+STORY = (
+    "A prefeitura anunciou nesta segunda-feira um plano de expansão do "
+    "metrô que prevê doze novas estações, integração com os corredores de "
+    "ônibus e investimento de bilhões ao longo da próxima década, segundo "
+    "o secretário de mobilidade urbana em entrevista coletiva. As obras "
+    "devem começar no segundo semestre pela linha que liga o centro à zona "
+    "norte, onde a demanda de passageiros cresceu mais nos últimos anos. "
+    "O financiamento virá de bancos públicos e de parcerias com empresas "
+    "privadas, que poderão explorar o comércio dentro das estações. "
+    "Associações de moradores pedem audiências públicas antes do início "
+    "das desapropriações previstas para os bairros atingidos pelo traçado."
+)
+OTHER_STORY = (
+    "O time da casa venceu a final do campeonato estadual por três gols a "
+    "um, diante de um estádio lotado, e garantiu vaga na próxima edição da "
+    "copa nacional depois de uma campanha invicta durante toda a temporada."
+)
+
+
+@pytest.mark.dependency(scope="class")
+class NearDuplicateTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        self.category = Category.objects.create(name="Cidades")
+        self.original = self.create("Metrô terá novas estações", STORY)
+
+    def create(self, title, content):
+        return News.objects.create(
+            title=title,
+            content=content,
+            author=self.author,
+            created_at="2023-08-08",
+        )
+
+    def data(self, title, content):
+        return {
+            "title": title,
+            "content": content,
+            "author": self.author.id,
+            "categories": [self.category.id],
+            "created_at": "2023-08-09",
+        }
+
+    def test_signature_is_indexed_on_save(self):
+        stored = NewsSignature.objects.get(news=self.original).minhash
+        signature = minhash(self.original.title, self.original.content)
+        self.assertEqual(list(decode(stored)), list(signature))
+        self.assertEqual(self.original.bands.count(), 16)
+
+    def test_short_texts_are_not_fingerprinted(self):
+        news = self.create("Notícia curta", "Conteúdo 1")
+        self.assertFalse(NewsSignature.objects.filter(news=news).exists())
+
+    def test_api_rejects_near_duplicate(self):
+        copy = STORY.replace("nesta segunda-feira", "na segunda")
+
+        response = self.client.post(
+            "/api/news/", self.data("Metrô ganha novas estações", copy)
+        )
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertIn(f"#{self.original.id}", str(response.json()))
+        response = self.client.post(
+            "/api/news/", self.data("Campeão estadual", OTHER_STORY)
+        )
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+
+    def test_editing_a_news_does_not_flag_itself(self):
+        form = NewsForm(
+            self.data("Metrô terá doze novas estações", STORY),
+            instance=self.original,
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_form_rejects_near_duplicate(self):
+        form = NewsForm(self.data("Metrô terá novas estações", STORY))
+        self.assertFalse(form.is_valid())
+        self.assertIn(f"#{self.original.id}", str(form.non_field_errors()))
+
+    def test_import_rejects_stored_and_in_batch_duplicates(self):
+        row = {
+            "title": "Campeão estadual",
+            "content": OTHER_STORY,
+            "author": "Marcos Farias",
+            "categories": ["Cidades"],
+            "created_at": "2023-08-09",
+        }
+        rejects = []
+
+        created, _, rejected = import_news(
+            [row, row, {**row, "content": STORY}],
+            on_reject=lambda line, row, errors: rejects.append(
+                (line, errors)
+            ),
+        )
+
+        self.assertEqual((created, rejected), (1, 2))
+        self.assertEqual(
+            sorted(rejects),
+            [
+                (2, ["Duplicata de linha 1"]),
+                (3, [f"Duplicata de notícia #{self.original.id}"]),
+            ],
+        )
+
+    def test_command_lists_and_deletes_copies(self):
+        copy = self.create("Cópia", STORY)
+        NewsSignature.objects.all().delete()
+        output = StringIO()
+
+        call_command("dedupe_news", stdout=output)
+        self.assertIn(
+            f"#{copy.id} duplica #{self.original.id}", output.getvalue()
+        )
+        self.assertTrue(News.objects.filter(id=copy.id).exists())
+
+        call_command("dedupe_news", delete=True, stdout=StringIO())
+        self.assertEqual(list(News.objects.all()), [self.original])
@@ -0,0 +1,123 @@
+from django.test import TestCase
+from news.models import Category, Change, News, Task, User
+from spotnews.__main__ import typer_app
+from typer.testing import CliRunner
+import json
+import os
+import pytest
+import tempfile
+
+
+@pytest.mark.dependency(scope="class")
+class SpotnewsCliTest(TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        Category.objects.create(name="Tecnologia")
+        Category.objects.create(name="Esportes")
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.dir.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def test_import_jsonl_creates_news_and_reports_rejects(self):
+        rows = [
+            {
+                "title": "Notícia válida",
+                "content": "Conteúdo",
+                "author": "Marcos Farias",
+                "categories": ["Tecnologia", "Esportes"],
+                "created_at": "2023-08-01",
+            },
+            {
+                "title": "Autor sem cadastro",
+                "content": "Conteúdo",
+                "author": "Ninguém",
+                "categories": ["Tecnologia"],
+                "created_at": "2023-08-01",
+            },
+        ]
+        path = self.write(
+            "news.jsonl", "\n".join(json.dumps(row) for row in rows)
+        )
+
+        result = self.runner.invoke(typer_app, ["import-news", path])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Linha 2 rejeitada", result.output)
+        news = News.objects.get()
+        self.assertEqual(news.title, "Notícia válida")
+        self.assertEqual(news.author, self.author)
+        self.assertEqual(news.categories.count(), 2)
+        self.assertTrue(
+            Change.objects.filter(
+                model="news", object_id=news.id, action=Change.INSERT
+            ).exists()
+        )
+
+    def test_import_csv_splits_categories(self):
+        path = self.write(
+            "news.csv",
+            "title,content,author,categories,created_at,image\n"
+            "Título da notícia,Texto,Marcos Farias,"
+            "Tecnologia;Esportes,2023-08-02,\n",
+        )
+
+        result = self.runner.invoke(typer_app, ["import-news", path])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(News.objects.get().categories.count(), 2)
+
+    def test_export_round_trips_through_import(self):
+        news = News.objects.create(
+            title="Notícia exportada",
+            content="Conteúdo",
+            author=self.author,
+            created_at="2023-08-03",
+        )
+        news.categories.set(Category.objects.all())
+        path = os.path.join(self.dir.name, "out.csv")
+
+        result = self.runner.invoke(typer_app, ["export-news", path])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        News.objects.all().delete()
+        result = self.runner.invoke(typer_app, ["import-news", path])
+        self.assertEqual(result.exit_code, 0, result.output)
+        imported = News.objects.get()
+        self.assertEqual(imported.title, "Notícia exportada")
+        self.assertEqual(imported.categories.count(), 2)
+
+    def test_rebuild_images_queues_tasks(self):
+        News.objects.create(
+            title="Notícia com imagem",
+            content="Conteúdo",
+            author=self.author,
+            created_at="2023-08-04",
+            image="img/foto.jpg",
+        )
+        Task.objects.all().delete()
+
+        result = self.runner.invoke(typer_app, ["rebuild", "images"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(
+            Task.objects.filter(name="process_news_image").count(), 1
+        )
+
+    def test_rebuild_unknown_target_fails(self):
+        result = self.runner.invoke(typer_app, ["rebuild", "nada"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Alvo inválido", result.output)
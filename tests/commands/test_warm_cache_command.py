@@ -0,0 +1,91 @@
+from django.core.management import call_command
+from django.test import TestCase
+from io import StringIO
+from news.models import Category, News, User
+from unittest import mock
+import os
+import pytest
+import tempfile
+
+
+class FakeResponse:
+    status = 200
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def read(self):
+        return b""
+
+
+@pytest.mark.dependency(scope="class")
+class WarmCacheCommandTest(TestCase):
+    def setUp(self):
+        author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        self.category = Category.objects.create(name="Tecnologia")
+        self.news = [
+            News.objects.create(
+                title=f"Noticia {day}",
+                content="Conteúdo",
+                author=author,
+                created_at=f"2023-08-0{day}",
+            )
+            for day in (1, 2, 3)
+        ]
+
+    def warm(self, *args):
+        out = StringIO()
+        with mock.patch(
+            "news.management.commands.warm_cache.urlopen",
+            return_value=FakeResponse(),
+        ) as urlopen:
+            call_command(
+                "warm_cache", "--base-url", "http://site", *args, stdout=out
+            )
+        urls = {call.args[0].full_url for call in urlopen.call_args_list}
+        return urls, out.getvalue()
+
+    def test_warms_newest_news_listings_and_categories(self):
+        urls, out = self.warm("--newest", "2")
+
+        newest = self.news[2].id  # type: ignore
+        oldest = self.news[0].id  # type: ignore
+        self.assertIn("http://site/", urls)
+        self.assertIn("http://site/api/news/", urls)
+        self.assertIn(f"http://site/news/{newest}/", urls)
+        self.assertIn(f"http://site/api/news/{newest}/", urls)
+        self.assertNotIn(f"http://site/news/{oldest}/", urls)
+        self.assertIn(
+            f"http://site/api/categories/{self.category.id}/",  # type: ignore
+            urls,
+        )
+        self.assertIn("URLs aquecidas", out)
+
+    def test_replays_top_urls_from_access_log(self):
+        lines = [
+            '1.1.1.1 - - [x] "GET /popular/ HTTP/1.1" 200 10\n',
+            '1.1.1.1 - - [x] "GET /popular/ HTTP/1.1" 200 10\n',
+            '1.1.1.1 - - [x] "GET /rara/ HTTP/1.1" 200 10\n',
+            '1.1.1.1 - - [x] "GET /erro/ HTTP/1.1" 500 10\n',
+        ]
+        with tempfile.NamedTemporaryFile("w", delete=False) as log:
+            log.writelines(lines)
+
+        try:
+            urls, _ = self.warm(
+                "--newest", "0", "--access-log", log.name, "--top", "1"
+            )
+        finally:
+            os.remove(log.name)
+
+        self.assertIn("http://site/popular/", urls)
+        self.assertNotIn("http://site/rara/", urls)
+        self.assertNotIn("http://site/erro/", urls)
@@ -0,0 +1,66 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from news.models import Category, NewsForm, User
+from rest_framework.status import HTTP_200_OK
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+@override_settings(AUTOCOMPLETE_LIMIT=3)
+class AutocompleteTest(TestCase):
+    def setUp(self):
+        for name in ["Árvores", "Arte", "Artesanato", "Astronomia", "Ciência"]:
+            Category.objects.create(name=name)
+        for name in ["Ana Souza", "André Lima", "Bruno Alves"]:
+            User.objects.create(
+                name=name,
+                email="autor@exemplo.com",
+                password="senhasupersegura",
+                role="user",
+            )
+
+    def test_categories_are_matched_by_prefix(self):
+        response = self.client.get(
+            reverse("category-autocomplete"), {"q": "art"}
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        names = [item["name"] for item in response.json()]
+        self.assertEqual(names, ["Arte", "Artesanato"])
+
+    def test_results_are_limited(self):
+        response = self.client.get(reverse("category-autocomplete"))
+
+        self.assertEqual(len(response.json()), 3)
+
+    def test_users_return_id_and_name_only(self):
+        response = self.client.get(reverse("user-autocomplete"), {"q": "an"})
+
+        self.assertEqual(
+            response.json(),
+            [
+                {"id": user.id, "name": user.name}
+                for user in User.objects.filter(name__startswith="An")
+                .order_by("name")
+            ],
+        )
+
+    def test_form_renders_limited_choices_plus_selection(self):
+        selected = Category.objects.get(name="Ciência")
+        form = NewsForm(initial={"categories": [selected.id]})
+        html = str(form["categories"])
+
+        self.assertEqual(html.count("<option"), 4)
+        self.assertIn("Ciência</option>", html)
+        self.assertIn(
+            f'data-autocomplete="{reverse("category-autocomplete")}"', html
+        )
+        self.assertEqual(form.fields["categories"].queryset.count(), 5)
+
+    def test_form_page_queries_do_not_grow_with_tables(self):
+        for index in range(10):
+            Category.objects.create(name=f"Extra {index}")
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("news-form"))
+        self.assertContains(response, 'type="checkbox"', count=3)
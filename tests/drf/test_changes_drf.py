@@ -0,0 +1,141 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from news.maintenance import prune_changes
+from news.models import Category, Change, News, User
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_400_BAD_REQUEST,
+    HTTP_410_GONE,
+)
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+class ChangeViewSetTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        self.category = Category.objects.create(name="Tecnologia")
+        self.news = News.objects.create(
+            title="Noticia 1",
+            content="Conteúdo 1",
+            author=self.user,
+            created_at="2023-08-08",
+            image="img/image.jpg",
+        )
+        self.news.categories.add(self.category)
+
+    def test_changes_recorded_on_save_and_m2m(self):
+        changes = list(Change.objects.values_list("model", "action"))
+        self.assertEqual(
+            changes,
+            [
+                ("user", "insert"),
+                ("category", "insert"),
+                ("news", "insert"),
+                ("news", "update"),
+            ],
+        )
+
+    def test_changes_list_since_checkpoint(self):
+        checkpoint = Change.objects.last().seq  # type: ignore
+        self.news.title = "Noticia editada"
+        self.news.save()
+
+        response = self.client.get(f"/api/changes/?since={checkpoint}")
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)  # type: ignore
+        change = response.data["results"][0]  # type: ignore
+        self.assertEqual(change["action"], "update")
+        self.assertEqual(change["data"]["title"], "Noticia editada")
+        self.assertFalse(response.data["has_more"])  # type: ignore
+
+    def test_changes_list_collapses_to_latest_change(self):
+        response = self.client.get("/api/changes/?since=0")
+
+        news_changes = [
+            change
+            for change in response.data["results"]  # type: ignore
+            if change["model"] == "news"
+        ]
+        self.assertEqual(len(news_changes), 1)
+        self.assertEqual(news_changes[0]["action"], "update")
+        self.assertEqual(
+            news_changes[0]["data"]["categories"], [self.category.id]
+        )
+
+    def test_changes_list_tombstone_on_delete(self):
+        checkpoint = Change.objects.last().seq  # type: ignore
+        news_id = self.news.id  # type: ignore
+        self.news.delete()
+
+        response = self.client.get(f"/api/changes/?since={checkpoint}")
+
+        change = response.data["results"][-1]  # type: ignore
+        self.assertEqual(change["model"], "news")
+        self.assertEqual(change["object_id"], news_id)
+        self.assertEqual(change["action"], "delete")
+        self.assertIsNone(change["data"])
+
+    def test_changes_list_pagination(self):
+        response = self.client.get("/api/changes/?since=0&limit=2")
+
+        self.assertEqual(len(response.data["results"]), 2)  # type: ignore
+        self.assertTrue(response.data["has_more"])  # type: ignore
+
+        response = self.client.get(
+            f"/api/changes/?since={response.data['next']}"  # type: ignore
+        )
+        self.assertEqual(len(response.data["results"]), 1)  # type: ignore
+        self.assertFalse(response.data["has_more"])  # type: ignore
+
+    def test_changes_list_invalid_since(self):
+        response = self.client.get("/api/changes/?since=abc")
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    @override_settings(CHANGES_SETTLE_SECONDS=30)
+    def test_changes_list_holds_back_unsettled_entries(self):
+        response = self.client.get("/api/changes/?since=0")
+        self.assertEqual(response.data["results"], [])  # type: ignore
+        self.assertEqual(response.data["next"], 0)  # type: ignore
+
+        Change.objects.update(
+            changed_at=timezone.now() - timedelta(seconds=31)
+        )
+        response = self.client.get("/api/changes/?since=0")
+        self.assertEqual(len(response.data["results"]), 3)  # type: ignore
+
+    def test_changes_recorded_for_news_of_deleted_category(self):
+        checkpoint = Change.objects.last().seq  # type: ignore
+        category_id = self.category.id  # type: ignore
+        self.category.delete()
+
+        changes = list(
+            Change.objects.filter(seq__gt=checkpoint).values_list(
+                "model", "object_id", "action"
+            )
+        )
+        self.assertIn(("news", self.news.id, "update"), changes)
+        self.assertIn(("category", category_id, "delete"), changes)
+
+    def test_changes_list_requires_resync_behind_pruned_entries(self):
+        first, *_, last = Change.objects.values_list("seq", flat=True)
+        Change.objects.filter(seq__lt=last).update(
+            changed_at=timezone.now() - timedelta(days=60)
+        )
+        self.assertEqual(prune_changes(30), 3)
+
+        response = self.client.get(f"/api/changes/?since={first}")
+        self.assertEqual(response.status_code, HTTP_410_GONE)
+        self.assertTrue(response.data["resync_required"])  # type: ignore
+        self.assertEqual(response.data["next"], last)  # type: ignore
+
+        response = self.client.get(f"/api/changes/?since={last - 1}")
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)  # type: ignore
@@ -0,0 +1,81 @@
+from django.test import TestCase
+from news.models import Category, News, User
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED
+import os
+import pytest
+
+msgpack = pytest.importorskip("msgpack")
+
+
+@pytest.mark.dependency(scope="class")
+class MessagePackNewsViewSetTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        self.category = Category.objects.create(name="Tecnologia")
+        news = News.objects.create(
+            title="Noticia 1",
+            content="Conteúdo 1",
+            author=self.author,
+            created_at="2023-08-08",
+            image="img/image.jpg",
+        )
+        news.categories.add(self.category)
+
+    def test_news_list_negotiates_msgpack(self):
+        json_response = self.client.get("/api/news/")
+        response = self.client.get(
+            "/api/news/", HTTP_ACCEPT="application/msgpack"
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(
+            msgpack.unpackb(response.content), json_response.json()
+        )
+
+    def test_news_list_defaults_to_json(self):
+        response = self.client.get("/api/news/")
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_news_create_from_msgpack(self):
+        project_dir = os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))
+        )
+        image_path = os.path.join(project_dir, "img/avanco-tecnologico.jpg")
+        with open(image_path, "rb") as image_file:
+            body = msgpack.packb(
+                {
+                    "title": "Notícia 2",
+                    "content": "Conteúdo 2",
+                    "author": self.author.id,  # type: ignore
+                    "created_at": "2023-08-09",
+                    "categories": [self.category.id],  # type: ignore
+                    "image": image_file.read(),
+                }
+            )
+
+        response = self.client.post(
+            "/api/news/",
+            body,
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+        data = msgpack.unpackb(response.content)
+        self.assertEqual(data["title"], "Notícia 2")
+        self.assertEqual(data["created_at"], "2023-08-09")
+        self.assertEqual(data["categories"], [self.category.id])
+
+        image_to_remove_path = os.path.join(
+            project_dir, str(News.objects.last().image)  # type: ignore
+        )
+        self.assertTrue(
+            data["image"].startswith("http://testserver/img/image")
+        )
+        os.remove(image_to_remove_path)
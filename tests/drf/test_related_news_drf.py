@@ -0,0 +1,156 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.urls import reverse
+from news.models import (
+    Category,
+    Change,
+    News,
+    NewsVector,
+    RelatedNews,
+    Task,
+    User,
+)
+from news.related import build_related, refresh_from_changes, term_vector
+from news.tasks import refresh_related_news
+from unittest import mock
+from rest_framework.test import APIClient
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+class RelatedNewsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        author = User.objects.create(
+            name="Yarpen Zigrin",
+            email="yarpen.zigrin@gmail.com",
+            password="123456",
+            role="user",
+        )
+        tech = Category.objects.create(name="Tecnologia")
+        sports = Category.objects.create(name="Esportes")
+        self.author = author
+        self.sports = sports
+
+        def create(title, content, category):
+            news = News.objects.create(
+                title=title,
+                content=content,
+                author=author,
+                created_at="2023-08-08",
+                image="img/foto.jpg",
+            )
+            news.categories.add(category)
+            return news
+
+        self.chip = create(
+            "Nova geração de processadores",
+            "Fabricante anuncia processadores mais eficientes para notebooks.",
+            tech,
+        )
+        self.laptop = create(
+            "Notebooks ficam mais leves",
+            "Processadores eficientes permitem notebooks mais finos.",
+            tech,
+        )
+        self.match = create(
+            "Final do campeonato emociona",
+            "Torcida lota o estádio na final do campeonato de futebol.",
+            sports,
+        )
+        build_related()
+
+    def test_most_similar_article_ranks_first(self):
+        first = RelatedNews.objects.filter(news=self.chip).first()
+        self.assertEqual(first.related, self.laptop)
+        self.assertEqual(first.rank, 0)
+
+    def test_related_endpoint_lists_neighbours_by_score(self):
+        response = self.client.get(
+            reverse("news-related", args=[self.chip.id])
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]["id"], self.laptop.id)
+        self.assertEqual(response.data[0]["title"], self.laptop.title)
+        scores = [item["score"] for item in response.data]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_related_endpoint_returns_404_for_unknown_news(self):
+        response = self.client.get(reverse("news-related", args=[9999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_details_page_links_related_news(self):
+        response = self.client.get(
+            reverse("news-details-page", args=[self.chip.id])
+        )
+        self.assertContains(
+            response,
+            reverse("news-details-page", args=[self.laptop.id]),
+        )
+
+    def test_refresh_from_changes_picks_up_new_articles(self):
+        refresh_from_changes()
+        news = News.objects.create(
+            title="Campeonato tem nova final",
+            content="A final do campeonato de futebol lota o estádio.",
+            author=self.author,
+            created_at="2023-08-09",
+        )
+        news.categories.add(self.sports)
+
+        refresh_from_changes()
+
+        self.assertEqual(
+            RelatedNews.objects.filter(news=news).first().related, self.match
+        )
+        self.assertEqual(
+            RelatedNews.objects.filter(news=self.match).first().related, news
+        )
+
+    def test_refresh_only_vectorizes_changed_articles(self):
+        refresh_from_changes()
+        self.laptop.content = "Processadores eficientes e baterias maiores."
+        self.laptop.save()
+
+        with mock.patch(
+            "news.related.term_vector", wraps=term_vector
+        ) as vectorized:
+            refresh_from_changes()
+
+        self.assertEqual(
+            [call.args[0].id for call in vectorized.call_args_list],
+            [self.laptop.id],
+        )
+        self.assertEqual(NewsVector.objects.count(), 3)
+        self.assertEqual(
+            RelatedNews.objects.filter(news=self.chip).first().related,
+            self.laptop,
+        )
+
+    @override_settings(CHANGES_SETTLE_SECONDS=30)
+    def test_unsettled_edits_queue_another_refresh(self):
+        Change.objects.update(
+            changed_at=timezone.now() - timedelta(seconds=60)
+        )
+        refresh_from_changes()
+        self.laptop.title = "Notebook com bateria nova"
+        self.laptop.save()
+        Task.objects.all().delete()
+
+        refresh_related_news()
+
+        self.assertTrue(
+            Task.objects.filter(
+                name="refresh_related_news", status=Task.QUEUED
+            ).exists()
+        )
+        Change.objects.update(
+            changed_at=timezone.now() - timedelta(seconds=60)
+        )
+        Task.objects.all().delete()
+
+        refresh_related_news()
+
+        self.assertFalse(Task.objects.exists())
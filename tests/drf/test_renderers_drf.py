@@ -0,0 +1,99 @@
+from django.test import TestCase
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+from news.models import Category, News, User
+from news.parsers import FastJSONParser
+from news.renderers import FastJSONRenderer
+from news.serializers import NewsSerializer
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+class FastJSONRendererTest(TestCase):
+    def setUp(self):
+        author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        category = Category.objects.create(name="Tecnologia")
+        self.news = News.objects.create(
+            title="Notícia 1",
+            content="Conteúdo com separador \u2028 de linha",
+            author=author,
+            created_at="2023-08-08",
+            image="img/image.jpg",
+        )
+        self.news.categories.add(category)
+
+    def assertSameOutput(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_fast_renderer_matches_serializer_output(self):
+        self.assertSameOutput(NewsSerializer([self.news], many=True).data)
+
+    def test_fast_renderer_matches_native_types(self):
+        self.assertSameOutput(
+            {
+                "date": date(2023, 8, 8),
+                "datetime": datetime(2023, 8, 8, 10, 30, tzinfo=timezone.utc),
+                "decimal": Decimal("1.50"),
+                1: "chave numérica",
+            }
+        )
+
+    def test_fast_renderer_matches_serializer_floats(self):
+        class ScoreSerializer(serializers.Serializer):
+            score = serializers.FloatField()
+
+        scores = [0.1, 1.0, 1e-05, 2.5e-07, 1e16, 1.5e22]
+        self.assertSameOutput(
+            ScoreSerializer(
+                [{"score": score} for score in scores], many=True
+            ).data
+        )
+
+    def test_fast_renderer_keeps_orjson_floats_in_plain_data(self):
+        rendered = FastJSONRenderer().render(
+            {"small": 1e-05, "large": 1e16, "nan": float("nan")}
+        )
+        self.assertEqual(
+            rendered, b'{"small":0.00001,"large":1e16,"nan":null}'
+        )
+
+    def test_fast_renderer_matches_indented_output(self):
+        self.assertSameOutput(
+            {"title": "Notícia"}, "application/json; indent=4"
+        )
+
+    def test_end_to_end_news_endpoint_uses_fast_renderer(self):
+        response = self.client.get("/api/news/")
+        self.assertIsInstance(
+            response.accepted_renderer, FastJSONRenderer  # type: ignore
+        )
+        self.assertEqual(
+            response.content,
+            JSONRenderer().render(response.data),  # type: ignore
+        )
+
+
+@pytest.mark.dependency(scope="class")
+class FastJSONParserTest(TestCase):
+    def test_fast_parser_parses_utf8(self):
+        stream = BytesIO('{"title": "Notícia", "ids": [1, 2]}'.encode())
+        self.assertEqual(
+            FastJSONParser().parse(stream),
+            {"title": "Notícia", "ids": [1, 2]},
+        )
+
+    def test_fast_parser_rejects_invalid_json(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"title": '))
@@ -0,0 +1,76 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from news.models import Change, News, User
+from news.suggest import index
+from rest_framework.status import HTTP_200_OK
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+class SuggestTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        self.copa = self.create("Seleção vence a Copa")
+        self.chuva = self.create("Chuva forte em São Paulo")
+        index.load()
+
+    def create(self, title):
+        return News.objects.create(
+            title=title,
+            content="Conteúdo",
+            author=self.author,
+            created_at="2023-08-08",
+            image="img/image.jpg",
+        )
+
+    def suggest(self, query):
+        response = self.client.get(reverse("news-suggest"), {"q": query})
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        return [item["title"] for item in response.json()]
+
+    def test_matches_word_prefixes_ignoring_accents(self):
+        self.assertEqual(self.suggest("SELE"), ["Seleção vence a Copa"])
+        self.assertEqual(self.suggest("sao pa"), ["Chuva forte em São Paulo"])
+        self.assertEqual(self.suggest("copa"), ["Seleção vence a Copa"])
+        self.assertEqual(self.suggest("paulo x"), [])
+        self.assertEqual(self.suggest(""), [])
+
+    def test_long_queries_are_checked_against_the_title(self):
+        self.create("Economia brasileira cresce acima do esperado")
+
+        self.assertEqual(
+            index.search("economia brasileira cresce acima", 10),
+            [(News.objects.latest("id").id,
+              "Economia brasileira cresce acima do esperado")],
+        )
+        self.assertEqual(
+            index.search("economia brasileira cresce abaixo", 10), []
+        )
+
+    def test_signals_keep_the_index_current(self):
+        self.copa.title = "Seleção perde a final"
+        self.copa.save()
+        self.chuva.delete()
+        created = self.create("Copa do Mundo começa")
+
+        self.assertEqual(index.search("copa", 10),
+                         [(created.id, "Copa do Mundo começa")])
+        self.assertEqual(index.search("sele", 10),
+                         [(self.copa.id, "Seleção perde a final")])
+        self.assertEqual(index.search("chuva", 10), [])
+
+    @override_settings(SUGGEST_SYNC_INTERVAL=0)
+    def test_changes_from_other_processes_are_synced(self):
+        News.objects.filter(id=self.chuva.id).update(title="Sol forte hoje")
+        Change.objects.create(
+            model="news", object_id=self.chuva.id, action=Change.UPDATE
+        )
+
+        self.assertEqual(index.search("sol", 10),
+                         [(self.chuva.id, "Sol forte hoje")])
+        self.assertEqual(index.search("chuva", 10), [])
@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from concurrent.futures import ThreadPoolExecutor
+from django.test import TestCase, override_settings
+from news.throttling import take_token
+from rest_framework.status import HTTP_200_OK, HTTP_429_TOO_MANY_REQUESTS
+from unittest import mock
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+class TokenBucketThrottleTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    @override_settings(
+        API_THROTTLE_BUCKETS={"client": {"rate": 1, "capacity": 2}}
+    )
+    def test_client_bucket_limits_burst(self):
+        with mock.patch("news.throttling.time", return_value=1000.0):
+            statuses = [
+                self.client.get("/api/news/").status_code for _ in range(3)
+            ]
+            response = self.client.get("/api/news/")
+
+        self.assertEqual(statuses[:2], [HTTP_200_OK, HTTP_200_OK])
+        self.assertEqual(statuses[2], HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "1")
+
+    @override_settings(
+        API_THROTTLE_BUCKETS={"client": {"rate": 1, "capacity": 1}}
+    )
+    def test_client_bucket_refills_over_time(self):
+        with mock.patch("news.throttling.time", return_value=1000.0):
+            self.client.get("/api/news/")
+        with mock.patch("news.throttling.time", return_value=1001.0):
+            response = self.client.get("/api/news/")
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    @override_settings(
+        API_THROTTLE_BUCKETS={"global": {"rate": 1, "capacity": 1}}
+    )
+    def test_global_bucket_is_shared_between_clients(self):
+        with mock.patch("news.throttling.time", return_value=1000.0):
+            self.client.get("/api/news/", REMOTE_ADDR="10.0.0.1")
+            response = self.client.get("/api/users/", REMOTE_ADDR="10.0.0.2")
+
+        self.assertEqual(response.status_code, HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_concurrent_spending_never_over_admits(self):
+        def spend(_):
+            return take_token("throttle:test", 10, 0.001, 1000.0)[0]
+
+        with ThreadPoolExecutor(8) as pool:
+            allowed = list(pool.map(spend, range(100)))
+
+        self.assertEqual(sum(allowed), 10)
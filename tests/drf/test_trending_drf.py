@@ -0,0 +1,79 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from news.counters import write_counts
+from news.models import News, User, ViewCount
+from news.trending import add_views, decayed
+from rest_framework.status import HTTP_200_OK
+from unittest import mock
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+@override_settings(TRENDING_HALF_LIFE=3600)
+class TrendingTest(TestCase):
+    def setUp(self):
+        author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        self.news = [
+            News.objects.create(
+                title=f"Noticia {i}",
+                content="Conteúdo",
+                author=author,
+                created_at="2023-08-08",
+                image="img/image.jpg",
+            )
+            for i in range(3)
+        ]
+
+    def write_at(self, when, counts):
+        with mock.patch("news.counters.timezone.now", return_value=when):
+            write_counts(counts)
+
+    def test_score_halves_every_half_life(self):
+        now = timezone.now()
+        stored = add_views(None, 8, now)
+
+        self.assertAlmostEqual(decayed(stored, now), 8)
+        self.assertAlmostEqual(decayed(stored, now + timedelta(hours=1)), 4)
+        stored = add_views(stored, 4, now + timedelta(hours=1))
+        self.assertAlmostEqual(decayed(stored, now + timedelta(hours=1)), 8)
+
+    def test_recent_views_outrank_older_bursts(self):
+        now = timezone.now()
+        old, fresh, _ = self.news
+        self.write_at(now - timedelta(hours=3), {old.id: 10})
+        self.write_at(now, {fresh.id: 2})
+
+        ranking = ViewCount.objects.order_by("-trending")
+        self.assertEqual([item.news for item in ranking], [fresh, old])
+        self.assertEqual(ranking[1].count, 10)
+
+    def test_trending_endpoint_lists_top_news(self):
+        now = timezone.now()
+        self.write_at(now, {self.news[0].id: 1, self.news[1].id: 5})
+
+        response = self.client.get(
+            reverse("news-trending"), {"limit": 1}
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["id"], self.news[1].id)
+        self.assertAlmostEqual(data[0]["score"], 5, places=2)
+
+    def test_home_page_shows_trending_section(self):
+        write_counts({self.news[2].id: 3})
+
+        response = self.client.get(reverse("home-page"))
+
+        self.assertContains(response, '<section class="trending">')
+        self.assertContains(
+            response, reverse("news-details-page", args=[self.news[2].id])
+        )
@@ -0,0 +1,179 @@
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from io import BytesIO
+from news.models import News, Upload, User
+from news.uploads import append, part_path, prune_uploads
+from PIL import Image
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_409_CONFLICT,
+)
+from unittest import mock
+import os
+import pytest
+import tempfile
+
+
+@pytest.mark.dependency(scope="class")
+class UploadTest(TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.TemporaryDirectory()
+        settings = override_settings(UPLOAD_DIR=self.upload_dir.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(self.upload_dir.cleanup)
+
+        buffer = BytesIO()
+        Image.new("RGB", (40, 20), "red").save(buffer, format="PNG")
+        self.image = buffer.getvalue()
+        author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        self.news = News.objects.create(
+            title="Noticia 1",
+            content="Conteúdo 1",
+            author=author,
+            created_at="2023-08-08",
+        )
+
+    def start(self, size=None, filename="envio.png"):
+        response = self.client.post(
+            reverse("upload-list"),
+            {"filename": filename, "size": size or len(self.image)},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+        return response.json()["id"]
+
+    def send(self, upload_id, offset, chunk):
+        return self.client.patch(
+            reverse("upload-detail", args=[upload_id]),
+            chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_chunks_resume_from_the_stored_offset(self):
+        upload_id = self.start()
+        first, rest = self.image[:30], self.image[30:]
+
+        self.assertEqual(self.send(upload_id, 0, first).json()["offset"], 30)
+        retry = self.send(upload_id, 0, first)
+        self.assertEqual(retry.status_code, HTTP_409_CONFLICT)
+        self.assertEqual(retry.json()["offset"], 30)
+
+        status = self.client.get(reverse("upload-detail", args=[upload_id]))
+        self.assertEqual(status.json()["offset"], 30)
+        done = self.send(upload_id, 30, rest)
+        self.assertEqual(done.status_code, HTTP_200_OK)
+        self.assertIsNotNone(done.json()["completed_at"])
+
+    def test_finished_upload_is_attached_to_news(self):
+        upload_id = self.start()
+        self.send(upload_id, 0, self.image)
+
+        response = self.client.post(
+            reverse("upload-attach", args=[upload_id]),
+            {"news": self.news.id},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.news.refresh_from_db()
+        self.addCleanup(os.remove, self.news.image.path)
+        with self.news.image.open("rb") as file:
+            self.assertEqual(file.read(), self.image)
+        self.assertFalse(Upload.objects.exists())
+        self.assertEqual(os.listdir(self.upload_dir.name), [])
+
+    def test_unfinished_upload_cannot_be_attached(self):
+        upload_id = self.start()
+        self.send(upload_id, 0, self.image[:20])
+
+        response = self.client.post(
+            reverse("upload-attach", args=[upload_id]),
+            {"news": self.news.id},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_body_is_received_before_the_row_is_locked(self):
+        upload_id = self.start()
+        first = self.image[:30]
+        stream = BytesIO(first)
+        events = []
+        atomic = transaction.atomic
+
+        def read(size=-1):
+            events.append("read")
+            return BytesIO.read(stream, size)
+
+        def locking(*args, **kwargs):
+            events.append("atomic")
+            return atomic(*args, **kwargs)
+
+        stream.read = read
+        with mock.patch.object(transaction, "atomic", side_effect=locking):
+            upload = append(upload_id, stream, 0)
+
+        self.assertEqual(upload.received, 30)
+        self.assertEqual(events[-1], "atomic")
+        self.assertNotIn("atomic", events[:-1])
+        self.assertEqual(
+            os.listdir(self.upload_dir.name), [part_path(upload).name]
+        )
+
+    def test_non_image_is_refused_at_the_first_chunk(self):
+        upload_id = self.start(size=1000)
+
+        response = self.send(upload_id, 0, b"%PDF-1.7 nao e imagem")
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertFalse(Upload.objects.filter(id=upload_id).exists())
+
+    def test_corrupt_image_is_refused_when_complete(self):
+        corrupt = self.image[:40] + b"\0" * 20
+        upload_id = self.start(size=len(corrupt))
+
+        response = self.send(upload_id, 0, corrupt)
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertFalse(Upload.objects.exists())
+
+    def test_data_past_the_declared_size_is_refused(self):
+        upload_id = self.start(size=10)
+
+        response = self.send(upload_id, 0, self.image)
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        upload = Upload.objects.get(id=upload_id)
+        self.assertEqual(upload.received, 0)
+        self.assertFalse(os.path.exists(part_path(upload)))
+        self.assertEqual(os.listdir(self.upload_dir.name), [])
+
+    @override_settings(UPLOAD_MAX_SIZE=100)
+    def test_start_validates_name_and_size(self):
+        for data in [
+            {"filename": "envio.exe", "size": 10},
+            {"filename": "envio.png", "size": 101},
+        ]:
+            response = self.client.post(
+                reverse("upload-list"), data, content_type="application/json"
+            )
+            self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_prune_drops_abandoned_uploads(self):
+        upload_id = self.start()
+        self.send(upload_id, 0, self.image[:20])
+
+        self.assertEqual(prune_uploads(max_age=3600), 0)
+        self.assertEqual(prune_uploads(max_age=-1), 1)
+        self.assertFalse(Upload.objects.exists())
+        self.assertEqual(os.listdir(self.upload_dir.name), [])
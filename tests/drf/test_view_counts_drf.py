@@ -0,0 +1,80 @@
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from news.counters import buffer, write_counts
+from news.models import News, User, ViewCount
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+class ViewCountTest(TestCase):
+    def setUp(self):
+        buffer.reset()
+        author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        self.news = [
+            News.objects.create(
+                title=f"Noticia {i}",
+                content="Conteúdo",
+                author=author,
+                created_at="2023-08-08",
+                image="img/image.jpg",
+            )
+            for i in range(2)
+        ]
+
+    def visit(self, news, times=1):
+        for _ in range(times):
+            self.client.get(reverse("news-details-page", args=[news.id]))
+
+    def test_views_are_buffered_until_flush(self):
+        self.visit(self.news[0], 3)
+        self.assertFalse(ViewCount.objects.exists())
+
+        buffer.flush()
+
+        self.assertEqual(ViewCount.objects.get(news=self.news[0]).count, 3)
+
+    @override_settings(VIEW_COUNTER_MAX_PENDING=3)
+    def test_buffer_flushes_when_full(self):
+        self.visit(self.news[0], 2)
+        self.visit(self.news[1])
+
+        counts = dict(ViewCount.objects.values_list("news_id", "count"))
+        self.assertEqual(counts, {self.news[0].id: 2, self.news[1].id: 1})
+
+    def test_flushes_accumulate_and_skip_deleted_news(self):
+        write_counts({self.news[0].id: 2})
+        write_counts({self.news[0].id: 5, 9999: 1})
+
+        self.assertEqual(ViewCount.objects.get().count, 7)
+
+    def test_unknown_news_is_not_counted(self):
+        client = Client(raise_request_exception=False)
+        client.get(reverse("news-details-page", args=[9999]))
+        self.assertEqual(buffer.pending_views, 0)
+
+    def test_counts_api_lists_flushed_counts(self):
+        write_counts({self.news[0].id: 4, self.news[1].id: 1})
+
+        response = self.client.get(
+            reverse("viewcount-list"), {"ids": f"{self.news[1].id}"}
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            [(item["news"], item["count"]) for item in response.json()],
+            [(self.news[1].id, 1)],
+        )
+        response = self.client.get(
+            reverse("viewcount-detail", args=[self.news[0].id])
+        )
+        self.assertEqual(response.json()["count"], 4)
+
+    def test_counts_api_rejects_invalid_ids(self):
+        response = self.client.get(reverse("viewcount-list"), {"ids": "a"})
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from news.middleware import AdmissionControlMiddleware
+from unittest import mock
+import pytest
+
+NOW = 6000.0
+SLOT = int(NOW // 60)
+
+
+def slot_key(slot):
+    return AdmissionControlMiddleware.slot_key(slot)
+
+
+@pytest.mark.dependency(scope="class")
+@override_settings(ADMISSION_CONTROL_LIMIT=2, ADMISSION_CONTROL_TIMEOUT=60)
+class AdmissionControlMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch("news.middleware.time", return_value=NOW)
+        self.time = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_admits_and_releases_slot(self):
+        response = self.client.get("/api/news/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(cache.get(slot_key(SLOT)), 0)
+
+    def test_sheds_load_over_limit(self):
+        cache.set(slot_key(SLOT), 2)
+
+        response = self.client.get("/api/news/")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(cache.get(slot_key(SLOT)), 2)
+
+    def test_counts_requests_from_the_previous_slot(self):
+        cache.set(slot_key(SLOT - 1), 1)
+        cache.set(slot_key(SLOT), 1)
+
+        response = self.client.get("/api/news/")
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_release_uses_the_slot_the_request_started_in(self):
+        middleware = AdmissionControlMiddleware(lambda request: None)
+        request = mock.Mock(resolver_match=mock.Mock(url_name="news-list"))
+        self.assertIsNone(middleware.process_view(request, None, (), {}))
+
+        self.time.return_value = NOW + 60
+        cache.add(slot_key(SLOT + 1), 0)
+        middleware(request)
+
+        self.assertEqual(cache.get(slot_key(SLOT)), 0)
+        self.assertEqual(cache.get(slot_key(SLOT + 1)), 0)
+
+    def test_ignores_views_not_listed(self):
+        cache.set(slot_key(SLOT), 2)
+        response = self.client.get("/categories/")
+        self.assertEqual(response.status_code, 200)
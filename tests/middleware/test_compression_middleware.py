@@ -0,0 +1,108 @@
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from news import middleware
+from news.middleware import CompressionMiddleware, choose_encoding
+from unittest import mock
+import gzip
+import pytest
+
+CONTENT = "Notícia com conteúdo repetido. ".encode() * 50
+
+
+@pytest.mark.dependency(scope="class")
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class CompressionMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def process(self, response, accept_encoding="gzip"):
+        request = self.factory.get(
+            "/", HTTP_ACCEPT_ENCODING=accept_encoding
+        )
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_choose_encoding_respects_quality(self):
+        with mock.patch.object(middleware, "brotli", object()):
+            self.assertEqual(choose_encoding("gzip, br"), "br")
+            self.assertEqual(choose_encoding("gzip, br;q=0"), "gzip")
+            self.assertEqual(choose_encoding("br;q=0.5, gzip"), "gzip")
+        with mock.patch.object(middleware, "brotli", None):
+            self.assertEqual(choose_encoding("br"), None)
+            self.assertEqual(choose_encoding("*"), "gzip")
+        self.assertEqual(choose_encoding("identity"), None)
+
+    def test_compresses_large_response(self):
+        response = self.process(HttpResponse(CONTENT), "gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.content), CONTENT)
+
+    def test_skips_response_below_threshold(self):
+        response = self.process(HttpResponse(b"curto"), "gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_skips_when_client_does_not_accept(self):
+        response = self.process(HttpResponse(CONTENT), "")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, CONTENT)
+
+    def test_skips_partial_content(self):
+        response = HttpResponse(CONTENT, status=206)
+        response["Content-Range"] = f"bytes 0-{len(CONTENT) - 1}/5000"
+        response = self.process(response, "gzip")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, CONTENT)
+
+    def test_skips_compressed_media_types(self):
+        for content_type in ("image/jpeg", "video/mp4", "font/woff2"):
+            response = self.process(
+                HttpResponse(CONTENT, content_type=content_type), "gzip"
+            )
+            self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_compresses_text_types_with_parameters(self):
+        response = self.process(
+            HttpResponse(
+                CONTENT, content_type="application/javascript; charset=utf-8"
+            ),
+            "gzip",
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_compresses_streaming_response(self):
+        chunks = [CONTENT[:300], CONTENT[300:]]
+        response = self.process(StreamingHttpResponse(chunks), "gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)), CONTENT
+        )
+
+    def test_reuses_cached_compressed_body(self):
+        self.process(HttpResponse(CONTENT), "gzip")
+
+        with mock.patch.object(middleware, "compress_body") as compress:
+            response = self.process(HttpResponse(CONTENT), "gzip")
+
+        compress.assert_not_called()
+        self.assertEqual(gzip.decompress(response.content), CONTENT)
+
+    def test_does_not_cache_cookie_dependent_response(self):
+        response = HttpResponse(CONTENT)
+        response["Vary"] = "Cookie"
+
+        with mock.patch.object(middleware.cache, "set") as cache_set:
+            response = self.process(response, "gzip")
+
+        cache_set.assert_not_called()
+        self.assertEqual(gzip.decompress(response.content), CONTENT)
+
+    def test_compresses_api_response(self):
+        response = self.client.get(
+            "/api/", HTTP_ACCEPT_ENCODING="gzip", HTTP_ACCEPT="text/html"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from news.memory import module_for, tracker, worker_name
+from news.models import Category, MemoryReport, News, User
+import pytest
+import tracemalloc
+
+
+@pytest.mark.dependency(scope="class")
+@override_settings(MEMORY_DIAGNOSTICS_POLL_INTERVAL=0)
+class MemoryDiagnosticsMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        staff = get_user_model().objects.create_user(
+            username="editor", password="senha", is_staff=True
+        )
+        self.client.force_login(staff)
+        author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        news = News.objects.create(
+            title="Noticia 1",
+            content="Conteúdo 1",
+            author=author,
+            created_at="2023-08-08",
+            image="img/image.jpg",
+        )
+        news.categories.add(Category.objects.create(name="Tecnologia"))
+
+    def tearDown(self):
+        cache.clear()
+        tracker.stop()
+
+    def test_disabled_by_default(self):
+        self.client.get("/")
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_enable_at_runtime_and_report_after_n_requests(self):
+        self.client.post(
+            "/diagnostics/memory/", {"enabled": "1", "requests": "2"}
+        )
+        self.assertTrue(tracemalloc.is_tracing())
+
+        self.client.get("/")
+        self.client.get("/api/news/")
+        data = self.client.get("/diagnostics/memory/").json()
+
+        report = data["reports"][worker_name()]
+        self.assertTrue(data["state"]["enabled"])
+        self.assertEqual(report["requests"], 2)
+        self.assertTrue(report["top"])
+
+        self.client.post("/diagnostics/memory/", {"enabled": "0"})
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_lists_reports_from_every_worker(self):
+        MemoryReport.objects.create(
+            worker="outro-host:4242",
+            requests=100,
+            traced_memory=1024,
+            top=[{"module": "news.views", "size_diff": 10, "count_diff": 1}],
+        )
+        self.client.post(
+            "/diagnostics/memory/", {"enabled": "1", "requests": "1"}
+        )
+        self.client.get("/")
+        data = self.client.get("/diagnostics/memory/").json()
+
+        self.assertIn("outro-host:4242", data["reports"])
+        self.assertIn(worker_name(), data["reports"])
+
+    def test_requires_staff(self):
+        self.client.logout()
+        response = self.client.get("/diagnostics/memory/")
+        self.assertEqual(response.status_code, 302)
+
+    def test_module_for_groups_files(self):
+        import news.views
+        import django.template.base
+
+        self.assertEqual(module_for(news.views.__file__), "news.views")
+        self.assertEqual(
+            module_for(django.template.base.__file__), "templates"
+        )
@@ -0,0 +1,116 @@
+from django.test import Client, TestCase, override_settings
+from news.metrics import collector
+from news.models import Category, News, User
+import json
+import os
+import pytest
+import subprocess
+import sys
+import tempfile
+
+
+@pytest.mark.dependency(scope="class")
+class MetricsMiddlewareTest(TestCase):
+    def setUp(self):
+        self.metrics_dir = tempfile.TemporaryDirectory()
+        self.settings = override_settings(
+            METRICS_DIR=self.metrics_dir.name, METRICS_FLUSH_INTERVAL=60
+        )
+        self.settings.enable()
+        collector.reset()
+
+        author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        news = News.objects.create(
+            title="Noticia 1",
+            content="Conteúdo 1",
+            author=author,
+            created_at="2023-08-08",
+            image="img/image.jpg",
+        )
+        news.categories.add(Category.objects.create(name="Tecnologia"))
+
+    def tearDown(self):
+        collector.reset()
+        self.settings.disable()
+        self.metrics_dir.cleanup()
+
+    def write_worker(self, name, requests):
+        with open(os.path.join(self.metrics_dir.name, name), "w") as file:
+            json.dump(
+                [
+                    [
+                        "spotnews_requests_total",
+                        {"status": "200", "view": "home-page"},
+                        requests,
+                    ]
+                ],
+                file,
+            )
+
+    def test_metrics_endpoint_counts_errors(self):
+        Client(raise_request_exception=False).get("/news/999/")
+        body = self.client.get("/metrics").content.decode()
+        self.assertIn(
+            'spotnews_request_errors_total{view="news-details-page"} 1.0',
+            body,
+        )
+
+    def test_metrics_endpoint_exposes_request_metrics(self):
+        self.client.get("/api/news/")
+        self.client.get("/")
+
+        response = self.client.get("/metrics")
+        body = response.content.decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "# TYPE spotnews_request_duration_seconds histogram", body
+        )
+        self.assertIn(
+            'spotnews_request_duration_seconds_count{view="news-list"} 1.0',
+            body,
+        )
+        self.assertIn(
+            'spotnews_requests_total{status="200",view="home-page"} 1.0',
+            body,
+        )
+        self.assertIn(
+            'spotnews_db_queries_total{view="news-list"} 2.0', body
+        )
+
+    def test_metrics_endpoint_sums_worker_files(self):
+        self.client.get("/")
+        self.write_worker(f"{os.getppid()}-outro.json", 4.0)
+
+        body = self.client.get("/metrics").content.decode()
+
+        self.assertIn(
+            'spotnews_requests_total{status="200",view="home-page"} 5.0',
+            body,
+        )
+
+    def test_dead_worker_files_are_folded_once(self):
+        worker = subprocess.Popen([sys.executable, "-c", "pass"])
+        worker.wait()
+        self.client.get("/")
+        self.write_worker(f"{worker.pid}-morto.json", 4.0)
+
+        for _ in range(2):
+            body = self.client.get("/metrics").content.decode()
+            self.assertIn(
+                'spotnews_requests_total{status="200",view="home-page"} 5.0',
+                body,
+            )
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(self.metrics_dir.name, f"{worker.pid}-morto.json")
+            )
+        )
+        self.assertTrue(
+            os.path.exists(os.path.join(self.metrics_dir.name, "dead.json"))
+        )
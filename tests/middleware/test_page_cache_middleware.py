@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from news.caching import bump_cache_version
+from news.models import Category, News, User
+from unittest import mock
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+@override_settings(PAGE_CACHE_TIMEOUT=60)
+class PageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        self.news = News.objects.create(
+            title="Noticia 1",
+            content="Conteúdo 1",
+            author=self.author,
+            created_at="2023-08-08",
+            image="img/image.jpg",
+        )
+        self.news.categories.add(Category.objects.create(name="Tecnologia"))
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_cached_api_response_skips_database(self):
+        first = self.client.get("/api/news/")
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get("/api/news/")
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(first.content, second.content)
+
+    def test_cached_page_skips_database(self):
+        self.client.get("/")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/")
+
+        self.assertEqual(len(queries), 0)
+        self.assertContains(response, "Noticia 1")
+
+    def test_changes_invalidate_cached_pages(self):
+        self.client.get("/")
+        self.news.title = "Noticia editada"
+        self.news.save()
+
+        response = self.client.get("/")
+
+        self.assertContains(response, "Noticia editada")
+
+    def test_write_during_request_is_not_cached_as_fresh(self):
+        def write_meanwhile(limit):
+            bump_cache_version()
+            return []
+
+        with mock.patch("news.views.top", side_effect=write_meanwhile):
+            self.client.get("/")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/")
+
+        self.assertTrue(queries)
+
+    @override_settings(PAGE_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.client.get("/api/news/")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/news/")
+        self.assertGreater(len(queries), 0)
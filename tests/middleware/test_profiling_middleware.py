@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from news.profiling import make_token
+import os
+import pytest
+import tempfile
+
+
+@pytest.mark.dependency(scope="class")
+class ProfilingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.profiles_dir = tempfile.TemporaryDirectory()
+        self.settings = override_settings(
+            PROFILING_DIR=self.profiles_dir.name, PROFILING_INTERVAL=0.0005
+        )
+        self.settings.enable()
+
+    def tearDown(self):
+        self.settings.disable()
+        self.profiles_dir.cleanup()
+
+    def login_staff(self):
+        staff = get_user_model().objects.create_user(
+            username="editor", password="senha", is_staff=True
+        )
+        self.client.force_login(staff)
+
+    def test_signed_query_param_profiles_request(self):
+        response = self.client.get(f"/api/news/?profile={make_token()}")
+
+        name = response["X-Profile-Id"]
+        self.assertTrue(name.endswith(".folded"))
+        self.assertIn("news-list", name)
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.profiles_dir.name, name))
+        )
+
+    def test_invalid_token_is_ignored(self):
+        response = self.client.get("/api/news/?profile=invalido")
+        self.assertFalse(response.has_header("X-Profile-Id"))
+
+    def test_header_requires_staff(self):
+        response = self.client.get("/", HTTP_X_PROFILE="1")
+        self.assertFalse(response.has_header("X-Profile-Id"))
+
+        self.login_staff()
+        response = self.client.get("/", HTTP_X_PROFILE="1")
+        self.assertTrue(response.has_header("X-Profile-Id"))
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0)
+    def test_random_sampling_of_selected_views(self):
+        self.assertTrue(self.client.get("/").has_header("X-Profile-Id"))
+        self.assertFalse(
+            self.client.get("/categories/").has_header("X-Profile-Id")
+        )
+
+    def test_staff_can_list_and_download_profiles(self):
+        name = self.client.get(f"/?profile={make_token()}")["X-Profile-Id"]
+        self.assertEqual(self.client.get("/profiles/").status_code, 302)
+
+        self.login_staff()
+        listing = self.client.get("/profiles/").json()
+        download = self.client.get(f"/profiles/{name}")
+
+        self.assertEqual(listing["profiles"], [name])
+        self.assertEqual(download.status_code, 200)
+        with open(os.path.join(self.profiles_dir.name, name), "rb") as file:
+            self.assertEqual(b"".join(download), file.read())
@@ -0,0 +1,56 @@
+from django.test import TestCase, override_settings
+from news.models import Category, News, User
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+class ServerTimingMiddlewareTest(TestCase):
+    def setUp(self):
+        author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        category = Category.objects.create(name="Tecnologia")
+        news = News.objects.create(
+            title="Noticia 1",
+            content="Conteúdo 1",
+            author=author,
+            created_at="2023-08-08",
+            image="img/image.jpg",
+        )
+        news.categories.add(category)
+
+    def metric_names(self, response):
+        return [
+            entry.strip().split(";")[0]
+            for entry in response["Server-Timing"].split(",")
+        ]
+
+    def test_api_response_reports_db_and_serializer(self):
+        response = self.client.get("/api/news/")
+
+        names = self.metric_names(response)
+        self.assertEqual(names[0], "db")
+        self.assertIn("serialize", names)
+        self.assertEqual(names[-1], "total")
+        self.assertIn('db_queries;desc="2 queries"', response["Server-Timing"])
+
+    def test_home_page_reports_template(self):
+        response = self.client.get("/")
+        self.assertIn("template", self.metric_names(response))
+
+    def test_logs_structured_line(self):
+        with self.assertLogs("news.timing", level="INFO") as logs:
+            self.client.get("/api/news/")
+
+        record = logs.records[0]
+        self.assertEqual(record.timing["path"], "/api/news/")  # type: ignore
+        self.assertEqual(record.timing["status"], 200)  # type: ignore
+        self.assertIn("db_queries=2", record.getMessage())
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get("/api/news/")
+        self.assertFalse(response.has_header("Server-Timing"))
@@ -0,0 +1,67 @@
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from io import StringIO
+from news.models import Category, News, SlowQuery, User
+import json
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG_SIZE=3)
+class SlowQueryMiddlewareTest(TestCase):
+    def setUp(self):
+        author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        news = News.objects.create(
+            title="Noticia 1",
+            content="Conteúdo 1",
+            author=author,
+            created_at="2023-08-08",
+            image="img/image.jpg",
+        )
+        news.categories.add(Category.objects.create(name="Tecnologia"))
+
+    def test_records_slow_queries_with_plan(self):
+        self.client.get("/api/news/")
+
+        query = SlowQuery.objects.filter(sql__contains="news_news").last()
+        self.assertEqual(query.view, "news-list")  # type: ignore
+        self.assertTrue(query.plan)  # type: ignore
+        self.assertIn("news/serializers.py", query.stack)  # type: ignore
+
+    def test_keeps_only_newest_entries(self):
+        self.client.get("/api/news/")
+        self.client.get("/")
+
+        self.assertEqual(SlowQuery.objects.count(), 3)
+
+    def test_persisting_is_not_timed(self):
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=None):
+            expected = self.client.get("/api/news/")["Server-Timing"]
+        response = self.client.get("/api/news/")
+
+        self.assertTrue(SlowQuery.objects.exists())
+        self.assertEqual(
+            response["Server-Timing"].split(", ")[1],
+            expected.split(", ")[1],
+        )
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=None)
+    def test_disabled(self):
+        self.client.get("/api/news/")
+        self.assertEqual(SlowQuery.objects.count(), 0)
+
+    def test_dump_slow_queries_command(self):
+        self.client.get("/api/news/")
+        out = StringIO()
+
+        call_command("dump_slow_queries", "--clear", stdout=out)
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertTrue(lines)
+        self.assertEqual(lines[0]["view"], "news-list")
+        self.assertEqual(SlowQuery.objects.count(), 0)
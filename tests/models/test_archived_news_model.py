@@ -0,0 +1,147 @@
+from django.test import TestCase
+from django.urls import reverse
+from news.archive import archive_old_news
+from news.counters import buffer
+from news.models import (
+    ArchivedNews,
+    Category,
+    Change,
+    FeedEntry,
+    News,
+    User,
+    ViewCount,
+)
+from news.suggest import index
+from rest_framework.status import HTTP_200_OK, HTTP_404_NOT_FOUND
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+class ArchivedNewsTestCase(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(
+            name="Yarpen Zigrin",
+            email="yarpen.zigrin@gmail.com",
+            password="123456",
+            role="user",
+        )
+        self.category = Category.objects.create(name="História")
+        self.old = [
+            self.create(f"Notícia antiga {i}", "2001-01-0%d" % (i + 1))
+            for i in range(3)
+        ]
+        self.recent = self.create("Notícia recente", "2099-01-01")
+        index.load()
+
+    def create(self, title, created_at):
+        news = News.objects.create(
+            title=title,
+            content="Conteúdo **arquivado**",
+            author=self.author,
+            created_at=created_at,
+            image="img/foto.jpg",
+        )
+        news.categories.add(self.category)
+        return news
+
+    def test_old_news_move_in_batches(self):
+        self.assertEqual(archive_old_news(days=30, batch_size=2), 3)
+
+        self.assertEqual(list(News.objects.all()), [self.recent])
+        archived = ArchivedNews.objects.get(id=self.old[0].id)
+        self.assertEqual(archived.title, "Notícia antiga 0")
+        self.assertEqual(list(archived.categories.all()), [self.category])
+        self.assertIn("<strong>arquivado</strong>", archived.content_html)
+        self.assertEqual(
+            list(FeedEntry.objects.values_list("news_id", flat=True)),
+            [self.recent.id],
+        )
+        self.assertEqual(
+            Change.objects.filter(action=Change.ARCHIVE).count(), 3
+        )
+        self.assertFalse(Change.objects.filter(action=Change.DELETE))
+        self.assertEqual(archive_old_news(days=30), 0)
+
+    def test_archived_news_are_still_found(self):
+        archive_old_news(days=30)
+        news_id = self.old[1].id
+
+        page = self.client.get(reverse("news-details-page", args=[news_id]))
+        self.assertEqual(page.status_code, HTTP_200_OK)
+        self.assertContains(page, "Notícia antiga 1")
+        self.assertContains(page, "História")
+
+        api = self.client.get(reverse("news-detail", args=[news_id]))
+        self.assertEqual(api.status_code, HTTP_200_OK)
+        self.assertEqual(api.json()["title"], "Notícia antiga 1")
+        self.assertEqual(api.json()["categories"], [self.category.id])
+
+        self.assertEqual(len(index.search("antiga", 10)), 3)
+        index.load()
+        self.assertEqual(len(index.search("antiga", 10)), 3)
+
+    def test_change_feed_carries_archived_copy(self):
+        checkpoint = Change.objects.last().seq  # type: ignore
+        archive_old_news(days=30)
+
+        response = self.client.get(f"/api/changes/?since={checkpoint}")
+
+        results = {
+            item["object_id"]: item for item in response.json()["results"]
+        }
+        self.assertEqual(sorted(results), [news.id for news in self.old])
+        self.assertEqual(
+            {item["action"] for item in results.values()}, {"archive"}
+        )
+        self.assertEqual(
+            results[self.old[0].id]["data"]["title"], "Notícia antiga 0"
+        )
+
+    def test_list_and_related_leave_archived_news_out(self):
+        archive_old_news(days=30)
+
+        listed = self.client.get(reverse("news-list")).json()
+        self.assertEqual(
+            [news["id"] for news in listed], [self.recent.id]
+        )
+        related = self.client.get(
+            reverse("news-related", args=[self.old[0].id])
+        )
+        self.assertEqual(related.status_code, HTTP_404_NOT_FOUND)
+
+    def test_view_counts_survive_archiving(self):
+        buffer.reset()
+        news_id = self.old[0].id
+        ViewCount.objects.create(news_id=news_id, count=7)
+        ViewCount.objects.create(news_id=self.recent.id, count=2)
+        archive_old_news(days=30)
+
+        self.client.get(reverse("news-details-page", args=[news_id]))
+        buffer.flush()
+
+        counts = {
+            item["news"]: item["count"]
+            for item in self.client.get("/api/view-counts/").json()
+        }
+        self.assertEqual(counts, {news_id: 8, self.recent.id: 2})
+
+        self.recent.delete()
+        ArchivedNews.objects.get(id=news_id).delete()
+        self.assertFalse(ViewCount.objects.exists())
+
+    def test_unknown_ids_are_not_found(self):
+        response = self.client.get(reverse("news-detail", args=[999999]))
+
+        self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
+
+    def test_archived_news_cannot_be_changed_through_the_api(self):
+        archive_old_news(days=30)
+
+        response = self.client.delete(
+            reverse("news-detail", args=[self.old[0].id])
+        )
+
+        self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
+        self.assertTrue(
+            ArchivedNews.objects.filter(id=self.old[0].id).exists()
+        )
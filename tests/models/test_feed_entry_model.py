@@ -0,0 +1,95 @@
+from django.test import TestCase
+from django.urls import reverse
+from news.bulk import import_news
+from news.feed import rebuild_feed
+from news.models import Category, FeedEntry, News, User
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+class FeedEntryModelTestCase(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(
+            name="Yarpen Zigrin",
+            email="yarpen.zigrin@gmail.com",
+            password="123456",
+            role="user",
+        )
+        self.tech = Category.objects.create(name="Tecnologia")
+        self.sports = Category.objects.create(name="Esportes")
+        self.news = News.objects.create(
+            title="Notícia de teste",
+            content="Conteúdo",
+            author=self.author,
+            created_at="2023-08-08",
+            image="img/foto.jpg",
+        )
+        self.news.categories.add(self.tech, self.sports)
+
+    def entry(self):
+        return FeedEntry.objects.get(news=self.news)
+
+    def test_feed_entry_mirrors_news(self):
+        entry = self.entry()
+        self.assertEqual(entry.title, "Notícia de teste")
+        self.assertEqual(str(entry.created_at), "2023-08-08")
+        self.assertEqual(entry.image.name, "img/foto.jpg")
+        self.assertEqual(entry.author_name, "Yarpen Zigrin")
+        self.assertEqual(entry.category_names, ["Tecnologia", "Esportes"])
+
+    def test_feed_follows_news_updates(self):
+        self.news.title = "Título alterado"
+        self.news.save()
+        self.news.categories.remove(self.sports)
+
+        entry = self.entry()
+        self.assertEqual(entry.title, "Título alterado")
+        self.assertEqual(entry.category_names, ["Tecnologia"])
+
+    def test_feed_follows_author_and_category_renames(self):
+        self.author.name = "Camila Silva"
+        self.author.save()
+        self.tech.name = "Ciência"
+        self.tech.save()
+
+        entry = self.entry()
+        self.assertEqual(entry.author_name, "Camila Silva")
+        self.assertEqual(entry.category_names, ["Ciência", "Esportes"])
+
+    def test_feed_follows_category_side_changes(self):
+        self.sports.news_set.clear()
+        self.assertEqual(self.entry().category_names, ["Tecnologia"])
+
+        self.tech.delete()
+        self.assertEqual(self.entry().category_names, [])
+
+    def test_deleted_news_leaves_the_feed(self):
+        self.news.delete()
+        self.assertFalse(FeedEntry.objects.exists())
+
+    def test_bulk_import_feeds_the_table(self):
+        import_news(
+            [
+                {
+                    "title": "Notícia importada",
+                    "content": "Conteúdo",
+                    "author": "Yarpen Zigrin",
+                    "categories": ["Esportes"],
+                    "created_at": "2023-08-09",
+                }
+            ]
+        )
+        entry = FeedEntry.objects.get(title="Notícia importada")
+        self.assertEqual(entry.category_names, ["Esportes"])
+
+    def test_rebuild_restores_missing_rows(self):
+        FeedEntry.objects.all().delete()
+        self.assertEqual(rebuild_feed(), 1)
+        self.assertEqual(self.entry().author_name, "Yarpen Zigrin")
+
+    def test_home_page_reads_the_feed_in_one_query(self):
+        # One query for the feed and one for the trending section.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("home-page"))
+        self.assertContains(response, "Yarpen Zigrin")
+        self.assertContains(response, "Tecnologia, Esportes")
@@ -0,0 +1,100 @@
+from django.test import TestCase
+from django.urls import reverse
+from news import markup
+from news.bulk import import_news
+from news.maintenance import rebuilders
+from news.models import ArchivedNews, News, User
+from unittest import mock
+import pytest
+
+
+@pytest.mark.dependency(scope="class")
+class NewsContentHtmlTestCase(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(
+            name="Yarpen Zigrin",
+            email="yarpen.zigrin@gmail.com",
+            password="123456",
+            role="user",
+        )
+        self.news = News.objects.create(
+            title="Notícia de teste",
+            content="Um **destaque** e [um link](https://exemplo.com).",
+            author=self.author,
+            created_at="2023-08-08",
+            image="img/foto.jpg",
+        )
+
+    def test_content_is_rendered_on_save(self):
+        self.assertEqual(
+            self.news.content_html,
+            '<p>Um <strong>destaque</strong> e '
+            '<a href="https://exemplo.com">um link</a>.</p>\n',
+        )
+        self.news.content = "# Título"
+        self.news.save()
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.content_html, "<h1>Título</h1>\n")
+        self.assertEqual(self.news.content_version, markup.RENDERER_VERSION)
+
+    def test_rendered_html_is_sanitized(self):
+        html = markup.render(
+            '<script>alert(1)</script> [x](javascript:alert(1)) '
+            '<img src=x onerror="alert(1)">'
+        )
+
+        self.assertNotIn("<script", html)
+        self.assertNotIn("<img", html)
+        self.assertNotIn('href="javascript', html)
+
+    def test_detail_page_does_not_parse_markdown(self):
+        with mock.patch.object(markup.renderer, "render") as render:
+            response = self.client.get(
+                reverse("news-details-page", args=[self.news.id])
+            )
+
+        render.assert_not_called()
+        self.assertContains(response, "<strong>destaque</strong>")
+
+    def test_bulk_import_renders_content(self):
+        import_news(
+            [
+                {
+                    "title": "Notícia importada",
+                    "content": "*itálico*",
+                    "author": "Yarpen Zigrin",
+                    "created_at": "2023-08-09",
+                }
+            ]
+        )
+
+        news = News.objects.get(title="Notícia importada")
+        self.assertEqual(news.content_html, "<p><em>itálico</em></p>\n")
+
+    def test_rebuild_rerenders_stale_rows_only(self):
+        News.objects.filter(id=self.news.id).update(
+            content_html="", content_version=0
+        )
+
+        self.assertEqual(rebuilders["content"](), 1)
+        self.assertEqual(rebuilders["content"](), 0)
+        self.news.refresh_from_db()
+        self.assertIn("<strong>destaque</strong>", self.news.content_html)
+
+    def test_rebuild_rerenders_archived_rows(self):
+        archived = ArchivedNews.objects.create(
+            id=self.news.id + 1,
+            title="Notícia arquivada",
+            content="Texto *antigo*",
+            content_html="",
+            content_version=0,
+            author=self.author,
+            created_at="2001-01-01",
+        )
+
+        self.assertEqual(rebuilders["content"](), 1)
+        archived.refresh_from_db()
+        self.assertEqual(
+            archived.content_html, "<p>Texto <em>antigo</em></p>\n"
+        )
+        self.assertEqual(archived.content_version, markup.RENDERER_VERSION)
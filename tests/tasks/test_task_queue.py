@@ -0,0 +1,181 @@
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from io import BytesIO, StringIO
+from news import tasks
+from news.caching import cache_version
+from news.models import Change, FeedEntry, News, Task, User
+from news.tasks import claim, enqueue, run_task
+from PIL import Image
+import os
+import pytest
+
+
+@tasks.task
+def failing_task():
+    raise RuntimeError("falhou")
+
+
+@tasks.task
+def noop_task(*args):
+    pass
+
+
+@pytest.mark.dependency(scope="class")
+@override_settings(TASK_MAX_ATTEMPTS=2)
+class TaskQueueTest(TestCase):
+    def test_enqueue_deduplicates_pending_tasks(self):
+        first = enqueue("noop_task", 1, dedup_key="chave")
+        second = enqueue("noop_task", 2, dedup_key="chave")
+
+        self.assertEqual(first.id, second.id)  # type: ignore
+        self.assertEqual(
+            Task.objects.filter(name="noop_task").count(), 1
+        )
+
+    def test_enqueue_rejects_unknown_task(self):
+        with self.assertRaises(KeyError):
+            enqueue("nao_existe")
+
+    def test_claim_orders_by_priority(self):
+        low = enqueue("noop_task", priority=0)
+        high = enqueue("noop_task", priority=10)
+        enqueue("noop_task", delay=60)
+
+        ids = claim(10)
+
+        self.assertEqual(ids, [high.id, low.id])  # type: ignore
+        self.assertEqual(
+            Task.objects.get(id=high.id).status,  # type: ignore
+            Task.RUNNING,
+        )
+
+    def test_run_task_retries_then_fails(self):
+        task = enqueue("failing_task")
+
+        self.assertEqual(run_task(task.id), Task.QUEUED)  # type: ignore
+        self.assertEqual(run_task(task.id), Task.FAILED)  # type: ignore
+
+        task.refresh_from_db()
+        self.assertEqual(task.attempts, 2)
+        self.assertIn("RuntimeError", task.last_error)
+
+    def test_run_tasks_command_inline(self):
+        enqueue("noop_task", 1)
+        out = StringIO()
+
+        call_command("run_tasks", "--processes", "0", "--once", stdout=out)
+
+        self.assertIn(Task.DONE, out.getvalue())
+        self.assertFalse(Task.objects.filter(status=Task.QUEUED).exists())
+
+
+@pytest.mark.dependency(scope="class")
+@override_settings(NEWS_IMAGE_MAX_SIZE=50)
+class ProcessNewsImageTaskTest(TestCase):
+    def setUp(self):
+        buffer = BytesIO()
+        Image.new("RGB", (200, 100), "#204060").save(buffer, format="PNG")
+        self.project_dir = os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))
+        )
+        self.image_path = os.path.join(self.project_dir, "img/tarefa.png")
+        with open(self.image_path, "wb") as file:
+            file.write(buffer.getvalue())
+
+        author = User.objects.create(
+            name="Marcos Farias",
+            email="marcosf@exemplo.com",
+            password="senhasupersegura",
+            role="user",
+        )
+        self.news = News.objects.create(
+            title="Noticia 1",
+            content="Conteúdo 1",
+            author=author,
+            created_at="2023-08-08",
+            image="img/tarefa.png",
+        )
+
+    def tearDown(self):
+        self.news.refresh_from_db()
+        for name in {"img/tarefa.png", self.news.image.name}:
+            path = os.path.join(self.project_dir, name)
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def test_saving_news_queues_image_processing(self):
+        task = Task.objects.get(name="process_news_image")
+        self.assertEqual(task.args, [self.news.id])  # type: ignore
+
+    def test_image_processing_queued_only_for_new_images(self):
+        Task.objects.all().delete()
+        self.news.image_width = 50
+        self.news.save()
+        self.news.title = "Outro título"
+        self.news.save()
+        self.assertFalse(
+            Task.objects.filter(name="process_news_image").exists()
+        )
+
+        self.news.image = "img/outra.png"
+        self.news.save()
+        self.assertEqual(
+            Task.objects.filter(name="process_news_image").count(), 1
+        )
+
+    def test_process_news_image_downscales(self):
+        task = Task.objects.get(name="process_news_image")
+
+        self.assertEqual(run_task(task.id), Task.DONE)  # type: ignore
+
+        self.news.refresh_from_db()
+        with self.news.image.open("rb") as file:
+            self.assertEqual(Image.open(file).size, (50, 25))
+
+    def test_renaming_the_image_is_fed_to_mirrors_and_caches(self):
+        checkpoint = Change.objects.last().seq  # type: ignore
+        version = cache_version()
+
+        run_task(Task.objects.get(name="process_news_image").id)
+
+        self.news.refresh_from_db()
+        self.assertNotEqual(self.news.image.name, "img/tarefa.png")
+        self.assertEqual(
+            list(
+                Change.objects.filter(seq__gt=checkpoint).values_list(
+                    "object_id", "action"
+                )
+            ),
+            [(self.news.id, Change.UPDATE)],
+        )
+        self.assertGreater(cache_version(), version)
+        self.assertFalse(
+            Task.objects.filter(
+                name="process_news_image", status=Task.QUEUED
+            ).exists()
+        )
+
+    def test_process_news_image_stores_metadata(self):
+        run_task(Task.objects.get(name="process_news_image").id)
+
+        self.news.refresh_from_db()
+        self.assertEqual(
+            (self.news.image_width, self.news.image_height), (50, 25)
+        )
+        self.assertEqual(self.news.image_bytes, self.news.image.size)
+        self.assertEqual(self.news.image_color, "#204060")
+        entry = FeedEntry.objects.get(news=self.news)
+        self.assertEqual((entry.image_width, entry.image_height), (50, 25))
+
+        response = self.client.get("/")
+        self.assertContains(response, 'width="50" height="25"')
+        self.assertContains(response, 'loading="lazy"')
+
+    def test_backfill_image_metadata_command(self):
+        out = StringIO()
+
+        call_command("backfill_image_metadata", stdout=out)
+
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.image_width, 50)
+        self.assertIn("1 imagens atualizadas, 0 com erro.", out.getvalue())
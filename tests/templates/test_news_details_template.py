@@ -60,14 +60,10 @@ class NewsDetailTemplateTest(TestCase):
         self.assertTrue("Test title" in title.text)  # type: ignore
 
     def test_news_detail_content(self):
-        content = self.soup.find("p")
+        content = self.soup.find("div", {"class": "news-content"})
 
         self.assertTrue(content)
-        self.assertEqual(
-            content.get("class")[0],  # type: ignore
-            "news-content",
-        )
-        self.assertTrue("Test content" in content.text)  # type: ignore
+        self.assertEqual(content.p.text, "Test content")  # type: ignore
 
     def test_news_detail_categories(self):
         categories = self.soup.find_all("span", {"class": "news-categories"})